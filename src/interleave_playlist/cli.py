@@ -0,0 +1,160 @@
+#    Interleave Playlist
+#    Copyright (C) 2026 Thomas Sweeney
+#    This file is part of Interleave Playlist.
+#    Interleave Playlist is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#    Interleave Playlist is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+import argparse
+import socket
+import sys
+from collections.abc import Callable, Sequence
+from pathlib import Path
+from typing import Any, Optional
+
+from interleave_playlist import CriticalUserError
+from interleave_playlist.core import PlaylistEntry
+from interleave_playlist.core.export import from_dicts, to_json, to_m3u, to_text
+from interleave_playlist.persistence import input_, settings, state
+from interleave_playlist.service import build_playlist, get_input_file, get_sort_name
+
+# Nothing in here may import PySide6, directly or otherwise. Scripts and cron jobs need to be able
+# to get a playlist without paying for Qt or having a display
+
+_PROG = 'interleave-playlist'
+_FORMATS: dict[str, Callable[[list[PlaylistEntry]], str]] = {
+    'text': to_text,
+    'json': to_json,
+    'm3u': to_m3u,
+}
+
+
+def _get_sort_name(value: str) -> str:
+    try:
+        return get_sort_name(value)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
+
+
+def _get_http_address(value: str) -> tuple[str, int]:
+    host, _, port = value.rpartition(':')
+    try:
+        return host or '127.0.0.1', int(port)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f'invalid address: {value}')
+
+
+def _get_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog=_PROG,
+        description='Print the playlist for an input file without starting the GUI')
+    parser.add_argument('-i', '--input', type=Path,
+                        help='input yml file. Defaults to the one last opened in the GUI')
+    parser.add_argument('-f', '--filter', default='',
+                        help='only include files matching this search')
+    parser.add_argument('-s', '--sort', type=_get_sort_name,
+                        help='interleave, alphabetical or last-modified. '
+                             'Defaults to the default sort in the settings')
+    parser.add_argument('-r', '--reverse', action=argparse.BooleanOptionalAction,
+                        help='reverse the sort. Defaults to the setting for it')
+    parser.add_argument('-n', '--limit', type=int,
+                        help='stop after this many files')
+    parser.add_argument('-F', '--format', choices=list(_FORMATS), default='text')
+    parser.add_argument('-o', '--output', type=Path,
+                        help='file to write the playlist to instead of standard output')
+    parser.add_argument('--socket', type=Path,
+                        help='Unix socket of the daemon. '
+                             'Defaults to one in the user data directory')
+    parser.add_argument('--no-daemon', action='store_true',
+                        help='build the playlist in this process even if a daemon is running')
+    subparsers = parser.add_subparsers(dest='command', metavar='command')
+    serve_parser = subparsers.add_parser(
+        'serve', help='keep everything needed for playlists in memory and answer other '
+                      'processes over a Unix socket until interrupted')
+    serve_parser.add_argument('--poll', type=float, default=2.0,
+                              help='seconds between checks for changes to tell subscribers about')
+    serve_parser.add_argument('--http', type=_get_http_address, metavar='[HOST:]PORT',
+                              help='also serve the playlist over HTTP. HOST defaults to 127.0.0.1')
+    return parser
+
+
+# Unix sockets aren't available everywhere, so neither is the daemon
+def _has_unix_sockets() -> bool:
+    return hasattr(socket, 'AF_UNIX')
+
+
+def _serve(args: argparse.Namespace) -> int:
+    if not _has_unix_sockets():
+        if args.http is None:
+            print(f'{_PROG}: serve needs Unix domain sockets, or --http', file=sys.stderr)
+            return 1
+        from interleave_playlist import http_api
+        try:
+            http_api.serve(args.http)
+        except OSError as e:
+            print(f'{_PROG}: {e}', file=sys.stderr)
+            return 1
+        return 0
+    from interleave_playlist import daemon
+    try:
+        daemon.serve(args.socket or daemon.SOCKET_FILE, args.poll, args.http)
+    except (OSError, daemon.DaemonRunning) as e:
+        print(f'{_PROG}: {e}', file=sys.stderr)
+        return 1
+    return 0
+
+
+# None if there's no daemon to ask, in which case the playlist is built here instead
+def _get_playlist_from_daemon(args: argparse.Namespace) -> Optional[list[PlaylistEntry]]:
+    if args.no_daemon or not _has_unix_sockets():
+        return None
+    from interleave_playlist import daemon
+    params: dict[str, Any] = {'filter': args.filter}
+    if args.input:
+        params['input'] = str(args.input.resolve())
+    for name in ['sort', 'reverse', 'limit']:
+        if getattr(args, name) is not None:
+            params[name] = getattr(args, name)
+    try:
+        with daemon.Client(args.socket or daemon.SOCKET_FILE) as client:
+            return from_dicts(client.call('get_playlist', **params))
+    except daemon.RpcError as e:
+        raise CriticalUserError(e.message)
+    except OSError:
+        return None
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = _get_parser().parse_args(argv)
+    try:
+        state.create_state_file()
+        settings.create_settings_file()
+        if args.command == 'serve':
+            return _serve(args)
+        playlist = _get_playlist_from_daemon(args)
+        if playlist is None:
+            playlist = build_playlist(get_input_file(args.input), args.filter, args.sort,
+                                      args.reverse, args.limit)
+    except (OSError, input_.InvalidInputFile, input_.LocationNotFound) as e:
+        print(f'{_PROG}: {e}', file=sys.stderr)
+        return 1
+    except CriticalUserError as e:
+        print(f'{_PROG}: {e.message}', file=sys.stderr)
+        return 1
+    output = _FORMATS[args.format](playlist)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output)
+    else:
+        sys.stdout.write(output)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -12,12 +12,25 @@
 #    You should have received a copy of the GNU General Public License
 #    along with this program.  If not, see <http://www.gnu.org/licenses/>.
 from dataclasses import dataclass, field
+from os import path
+from typing import Any
+
+from natsort import natsort_keygen, ns
 
 from interleave_playlist.model import Group, Location
 
+# Natural sort key of a file's basename. Scanning works these out once per name so that the
+# scan order and the alphabetical sort can share them instead of keying everything again
+natsort_key = natsort_keygen(alg=ns.IGNORECASE)
+
 
 @dataclass(unsafe_hash=True)
 class PlaylistEntry:
     filename: str = field(hash=True)
     location: Location = field(hash=False)
     group: Group = field(hash=False)
+    natsort_key: Any = field(default=None, hash=False, compare=False, repr=False)
+
+    def __post_init__(self) -> None:
+        if self.natsort_key is None:
+            self.natsort_key = natsort_key(path.basename(self.filename))
@@ -1,5 +1,5 @@
 #    Interleave Playlist
-#    Copyright (C) 2021-2022 Thomas Sweeney
+#    Copyright (C) 2026 Thomas Sweeney
 #    This file is part of Interleave Playlist.
 #    Interleave Playlist is free software: you can redistribute it and/or modify
 #    it under the terms of the GNU General Public License as published by
@@ -11,25 +11,27 @@
 #    GNU General Public License for more details.
 #    You should have received a copy of the GNU General Public License
 #    along with this program.  If not, see <http://www.gnu.org/licenses/>.
-from os import path
-from typing import Any
+from threading import Event
 
-from PySide6.QtWidgets import QListWidgetItem
 
-from interleave_playlist.core.playlist import PlaylistEntry
+class Cancelled(Exception):
+    pass
 
-_USER_TYPE: int = 1001
 
+# Long running work checks this between its stages and bails out by raising Cancelled,
+# so whoever started it can throw away the result of a job that's no longer wanted
+class CancellationToken:
 
-class PlaylistWindowItem(QListWidgetItem):
+    def __init__(self) -> None:
+        self._event = Event()
 
-    def __init__(self, *args: list[Any], value: PlaylistEntry, **kwargs: dict[Any, Any]):
-        super().__init__(*args, type=_USER_TYPE, **kwargs)  # type: ignore
-        self.value: PlaylistEntry = value
-        self.setText(path.basename(value.filename))
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
 
-    def setValue(self, value: PlaylistEntry) -> None:
-        self.value = value
+    def cancel(self) -> None:
+        self._event.set()
 
-    def getValue(self) -> PlaylistEntry:
-        return self.value
+    def raise_if_cancelled(self) -> None:
+        if self._event.is_set():
+            raise Cancelled()
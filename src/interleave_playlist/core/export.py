@@ -0,0 +1,64 @@
+#    Interleave Playlist
+#    Copyright (C) 2026 Thomas Sweeney
+#    This file is part of Interleave Playlist.
+#    Interleave Playlist is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#    Interleave Playlist is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+import json
+from collections.abc import Iterable, Iterator
+from os import path
+from typing import TextIO
+
+from interleave_playlist.core import PlaylistEntry
+from interleave_playlist.model import Group, Location
+
+M3U_HEADER = '#EXTM3U'
+
+
+def to_text(playlist: list[PlaylistEntry]) -> str:
+    return ''.join(entry.filename + '\n' for entry in playlist)
+
+
+def to_dicts(playlist: list[PlaylistEntry]) -> list[dict[str, str]]:
+    return [{
+        'filename': entry.filename,
+        'location': entry.location.name,
+        'group': entry.group.name,
+    } for entry in playlist]
+
+
+# Only what to_dicts kept comes back, so these are only good for exporting again
+def from_dicts(dicts: list[dict[str, str]]) -> list[PlaylistEntry]:
+    return [PlaylistEntry(d['filename'],
+                          Location(d['location'], Group(d['location'], d['location'])),
+                          Group(d['group'], d['location']))
+            for d in dicts]
+
+
+def to_json(playlist: list[PlaylistEntry]) -> str:
+    return json.dumps(to_dicts(playlist), indent=2) + '\n'
+
+
+# Extended M3U. Runtimes aren't known without probing every file, so every entry is given the
+# unknown duration of -1 and players work it out themselves
+def iter_m3u(playlist: Iterable[PlaylistEntry]) -> Iterator[str]:
+    yield M3U_HEADER + '\n'
+    for entry in playlist:
+        yield f'#EXTINF:-1,{path.basename(entry.filename)}\n'
+        yield entry.filename + '\n'
+
+
+def to_m3u(playlist: list[PlaylistEntry]) -> str:
+    return ''.join(iter_m3u(playlist))
+
+
+# Written a line at a time, so a long playlist never has to be held as one string
+def write_m3u(playlist: Iterable[PlaylistEntry], f: TextIO) -> None:
+    f.writelines(iter_m3u(playlist))
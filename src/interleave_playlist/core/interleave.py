@@ -11,76 +11,111 @@
 #    GNU General Public License for more details.
 #    You should have received a copy of the GNU General Public License
 #    along with this program.  If not, see <http://www.gnu.org/licenses/>.
-import sys
+from collections.abc import Callable, Iterable, Iterator, Sequence
 from dataclasses import dataclass, field
-from typing import TypeVar, Iterator, cast, Generic
+from typing import TypeVar, cast, Generic, Protocol
 
 T = TypeVar('T')
+T_co = TypeVar('T_co', covariant=True)
 _MARGIN = 10e-6
 
 
+class _SizedIterable(Protocol[T_co]):
+    def __len__(self) -> int: ...
+
+    def __iter__(self) -> Iterator[T_co]: ...
+
+
 def interleave(a: list[T], b: list[T]) -> list[T]:
+    return list(_iter_interleave(a, b))
+
+
+# Where everything goes only depends on how long the two sides are, so the result can be produced
+# one item at a time without either side having been worked out in full
+def _iter_interleave(a: _SizedIterable[T], b: _SizedIterable[T]) -> Iterator[T]:
     smaller, larger = sorted([a, b], key=lambda ab: len(ab))
-    if not smaller:
-        return larger
+    if not len(smaller):
+        yield from larger
+        return
     group_count = len(smaller) + 1
     group_size = len(larger) // group_count + 1
     surplus = len(larger) - group_count * (group_size - 1)
     surplus_per_group = surplus / group_count
-    result = []
-    larger_idx = 0
-
-    def _append_larger() -> None:
-        nonlocal larger_idx
+    smaller_iter = iter(smaller)
+    larger_iter = iter(larger)
+    for group_idx in range(group_count):
         use_surplus = surplus_per_group and (group_idx+1+_MARGIN) % (1/surplus_per_group) < 1
         surplus_offset = 1 if use_surplus else 0
-        for i in range(group_size - 1 + surplus_offset):
-            result.append(larger[larger_idx])
-            larger_idx += 1
+        for _ in range(group_size - 1 + surplus_offset):
+            yield next(larger_iter)
+        if group_idx < len(smaller):
+            yield next(smaller_iter)
 
-    group_idx = 0
-    for smaller_idx in range(len(smaller)):
-        _append_larger()
-        result.append(smaller[smaller_idx])
-        group_idx += 1
-    _append_larger()
-    return result
+
+class _Interleaved(Generic[T]):
+
+    def __init__(self, a: _SizedIterable[T], b: _SizedIterable[T]):
+        self._a = a
+        self._b = b
+        self._len = len(a) + len(b)
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __iter__(self) -> Iterator[T]:
+        return _iter_interleave(self._a, self._b)
 
 
 # Sort by minimum group size difference
 def interleave_all(groups: list[list[T]]) -> list[T]:
-    groups = [group for group in groups if group]  # just make debugging easier
-    sorted_groups = sorted(groups, key=lambda group: len(group))
+    return list(_interleave_all(groups, lambda a, b: list(_iter_interleave(a, b))))
+
+
+# Same order as interleave_all but nothing is worked out until it's asked for, so taking the
+# first few items only costs as much as those items
+def iter_interleave_all(groups: list[list[T]]) -> Iterator[T]:
+    return iter(_interleave_all(groups, _Interleaved))
+
+
+def _interleave_all(groups: list[list[T]],
+                    interleave_: Callable[[_SizedIterable[T], _SizedIterable[T]],
+                                          _SizedIterable[T]]) -> _SizedIterable[T]:
+    sorted_groups: list[_SizedIterable[T]] = sorted(
+        (group for group in groups if group),  # just make debugging easier
+        key=lambda group: len(group))
+    # lengths are kept alongside the groups since only they decide what gets interleaved with what
+    lengths: list[int] = [len(group) for group in sorted_groups]
     while len(sorted_groups) > 1:
-        min_diff: int = sys.maxsize
-        min_i: int = -1
-        for i, (left, right) in enumerate(zip(sorted_groups, sorted_groups[1:])):
-            diff: int = abs(len(left) - len(right))
-            if min_diff > diff:
-                min_diff = diff
-                min_i = i
-        a: list[T] = sorted_groups.pop(min_i)  # smaller or equal
-        b: list[T] = sorted_groups.pop(min_i)
+        diffs = [abs(left - right) for left, right in zip(lengths, lengths[1:])]
+        min_i: int = diffs.index(min(diffs))
+        a: _SizedIterable[T] = sorted_groups.pop(min_i)  # smaller or equal
+        b: _SizedIterable[T] = sorted_groups.pop(min_i)
+        a_len = lengths.pop(min_i)
+        b_len = lengths.pop(min_i)
         i = 0
         while i < len(sorted_groups):  # interleave smaller groups to reduce size diff
-            if abs(len(sorted_groups[i]) + len(a) - len(b)) <= abs(len(a) - len(b)):
-                a = interleave(a, sorted_groups.pop(i))
+            if abs(lengths[i] + a_len - b_len) <= abs(a_len - b_len):
+                a = interleave_(a, sorted_groups.pop(i))
+                a_len += lengths.pop(i)
             else:
                 i += 1
-        interleaved = interleave(a, b)
+        interleaved = interleave_(a, b)
+        interleaved_len = a_len + b_len
         len_before_insert = len(sorted_groups)
-        for i, elem in enumerate(sorted_groups):
-            if len(elem) > len(interleaved):
+        for i, length in enumerate(lengths):
+            if length > interleaved_len:
                 sorted_groups.insert(i, interleaved)
+                lengths.insert(i, interleaved_len)
                 break
         if len_before_insert == len(sorted_groups):
             sorted_groups.append(interleaved)
+            lengths.append(interleaved_len)
     return sorted_groups[0] if len(sorted_groups) > 0 else []
 
 
 @dataclass(order=True)
 class _Weighted(Generic[T]):
-    group: list[T] = field(compare=False)
+    group: Iterable[T] = field(compare=False)
     weight: int = field(compare=True)
     iter: Iterator[T] = cast(Iterator[T], field(default=None, compare=False))
 
@@ -88,37 +123,34 @@ class _Weighted(Generic[T]):
         self.iter = iter(self.group)
 
 
-def _weighted_weave(larger: _Weighted[T], smaller: _Weighted[T]) -> list[T]:
-    result = []
+def _weighted_weave(larger: _Weighted[T], smaller: _Weighted[T]) -> Iterator[T]:
     total_weight = larger.weight + smaller.weight
     larger_weight_share = larger.weight / total_weight
     smaller_weight_share = smaller.weight / total_weight
-
-    def append(a: Iterator, b: Iterator) -> bool:
-        try:
-            result.append(next(a))
-            return True
-        except StopIteration:
-            result.extend(b)
-            return False
-
     i = 1
-    continue_processing = True
-    while continue_processing:
+    while True:
         if i % (larger_weight_share/smaller_weight_share + 1) >= 1:
-            continue_processing = append(larger.iter, smaller.iter)
+            a, b = larger.iter, smaller.iter
         else:
-            continue_processing = append(smaller.iter, larger.iter)
+            a, b = smaller.iter, larger.iter
+        try:
+            item = next(a)
+        except StopIteration:
+            yield from b
+            return
+        yield item
         i += 1
-    return result
 
 
 def interleave_weighted(groups: list[tuple[list[T], int]]) -> list[T]:
+    return list(iter_interleave_weighted(groups))
+
+
+def iter_interleave_weighted(groups: Sequence[tuple[Iterable[T], int]]) -> Iterator[T]:
     weights: list[_Weighted[T]] = [_Weighted(*g) for g in groups if g[1] != 0]
-    zero_weight_groups: list[list[T]] = [g[0] for g in groups if g[1] == 0]
+    zero_weight_groups: list[Iterable[T]] = [g[0] for g in groups if g[1] == 0]
     weights.sort(reverse=True)
 
-    result = []
     while len(weights) > 1:
         smaller: _Weighted[T] = weights.pop()
         larger: _Weighted[T] = weights.pop()
@@ -126,8 +158,6 @@ def interleave_weighted(groups: list[tuple[list[T], int]]) -> list[T]:
         weights.append(_Weighted(new_group, larger.weight + smaller.weight))
 
     if weights:
-        result.extend(weights.pop().group)
+        yield from weights.pop().group
     for g in zero_weight_groups:
-        result.extend(g)
-
-    return result
+        yield from g
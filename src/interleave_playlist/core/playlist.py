@@ -1,5 +1,5 @@
 #    Interleave Playlist
-#    Copyright (C) 2021-2025 Thomas Sweeney
+#    Copyright (C) 2021-2026 Thomas Sweeney
 #    This file is part of Interleave Playlist.
 #    Interleave Playlist is free software: you can redistribute it and/or modify
 #    it under the terms of the GNU General Public License as published by
@@ -13,35 +13,163 @@
 #    along with this program.  If not, see <http://www.gnu.org/licenses/>.
 import os
 import re
+from collections.abc import Callable, Iterable, Iterator
 from copy import copy
-from itertools import groupby
+from itertools import groupby, islice
 from os import path
 from re import Pattern
-from typing import Any
+from typing import Any, Optional
 
-from natsort import natsorted, ns
-
-from interleave_playlist.core import PlaylistEntry
-from interleave_playlist.core.interleave import interleave_all, interleave_weighted
+from interleave_playlist.core import PlaylistEntry, natsort_key, search
+from interleave_playlist.core.cancellation import CancellationToken
+from interleave_playlist.core.interleave import interleave_all, interleave_weighted, \
+    iter_interleave_all, iter_interleave_weighted
 from interleave_playlist.model import Group, Location, Timed, Weight
-from interleave_playlist.persistence import settings
+from interleave_playlist.persistence.settings import Settings
 
 FilePathsByGroup = dict[Group, list[str]]
 FileGroup = tuple[str, str]
 PlaylistEntriesByGroup = dict[Group, list[PlaylistEntry]]
 PlaylistEntriesByGroupItem = tuple[Group, list[PlaylistEntry]]
 PlaylistEntriesByGroupItems = list[PlaylistEntriesByGroupItem]
-_FILE_CACHE: dict[str, list[str]] = {}
+ScannedPath = tuple[str, Any]
+# called with how many locations have been scanned so far out of how many there are
+ProgressCallback = Callable[[int, int], None]
+_FILE_CACHE: dict[str, list[ScannedPath]] = {}
+# Per group entries after every filter except the search, by priority then weight
+Candidates = list[list[tuple[Weight, list[list[PlaylistEntry]]]]]
+_CANDIDATES_CACHE: Optional[tuple[Optional[tuple[Any, ...]], Candidates]] = None
+# Where each filename sits in the candidates as (priority, weight, group, entry) indexes
+CandidatePosition = tuple[int, int, int, int]
+_POSITIONS_CACHE: Optional[tuple[Candidates, dict[str, list[CandidatePosition]]]] = None
+# (candidates searched, case folded query, whether it fell back to fuzzy, matched filenames)
+_SEARCH_CACHE: Optional[tuple[Candidates, str, bool, list[str]]] = None
+# every scanned file by its basename. Kept up to date as directories are scanned
+_SEARCH_INDEX = search.TrigramIndex()
+SortKey = Optional[Callable[[PlaylistEntry], Any]]
+# Every order a playlist can be shown in, by its name in the settings. Playlists are built in
+# interleave order so that one has no key
+SORT_KEYS: dict[str, SortKey] = {
+    'INTERLEAVE': None,
+    'ALPHABETICAL': lambda i: i.natsort_key,
+    'LAST MODIFIED': lambda i: os.path.getmtime(i.filename),
+}
+# natsort keys by name for every scanned directory. Names that are still there on the next scan
+# keep their keys so an unchanged directory never has to be keyed again
+_NATSORT_KEY_CACHE: dict[str, dict[str, Any]] = {}
+
+
+def sort_playlist(playlist: list[PlaylistEntry], sort_name: str,
+                  reverse: bool = False) -> list[PlaylistEntry]:
+    sort_key = SORT_KEYS[sort_name]
+    sorted_playlist = list(playlist) if sort_key is None else sorted(playlist, key=sort_key)
+    return sorted_playlist[::-1] if reverse else sorted_playlist
 
 
 def get_playlist(locations: list[Location],
                  watched_list: list[FileGroup],
+                 settings_: Settings,
                  search_filter: str = "",
-                 use_cache: bool = False) -> list[PlaylistEntry]:
+                 use_cache: bool = False,
+                 cancellation_token: Optional[CancellationToken] = None,
+                 on_progress: Optional[ProgressCallback] = None) -> list[PlaylistEntry]:
+    if cancellation_token is None:
+        cancellation_token = CancellationToken()
+    candidates = _get_candidates(
+        locations, watched_list, use_cache, settings_, cancellation_token, on_progress)
+    cancellation_token.raise_if_cancelled()
+    matches, scores = _search_candidates(candidates, search_filter)
+    result: list[PlaylistEntry] = []
+    for by_weight in matches:
+        interleaved: list[tuple[list[PlaylistEntry], int]] = []
+        for w, group_entries in by_weight:
+            cancellation_token.raise_if_cancelled()
+            interleaved.append((_interleave_groups(group_entries, watched_list), w.weight))
+        result.extend(interleave_weighted(interleaved))
+    if scores is not None:
+        # closest matches first. Equally close ones stay in the order they'd be watched in
+        result.sort(key=lambda entry: -scores[entry.filename])
+    return result
+
+
+# The first n entries of get_playlist. Priorities after the one that fills up n are never
+# interleaved and the interleaves that are only go as far as they need to. Fuzzy searches are
+# ranked by how close each match is, so those need every match interleaved first
+def next_up(locations: list[Location],
+            watched_list: list[FileGroup],
+            n: int,
+            settings_: Settings,
+            search_filter: str = "",
+            use_cache: bool = False,
+            cancellation_token: Optional[CancellationToken] = None,
+            on_progress: Optional[ProgressCallback] = None) -> list[PlaylistEntry]:
+    if cancellation_token is None:
+        cancellation_token = CancellationToken()
+    candidates = _get_candidates(
+        locations, watched_list, use_cache, settings_, cancellation_token, on_progress)
+    cancellation_token.raise_if_cancelled()
+    matches, scores = _search_candidates(candidates, search_filter)
+    if scores is not None:
+        return get_playlist(locations, watched_list, settings_, search_filter, True,
+                            cancellation_token)[:n]
+    result: list[PlaylistEntry] = []
+    for by_weight in matches:
+        if len(result) >= n:
+            break
+        cancellation_token.raise_if_cancelled()
+        interleaved = [(_iter_interleave_groups(group_entries, watched_list), w.weight)
+                       for w, group_entries in by_weight]
+        result.extend(islice(iter_interleave_weighted(interleaved), n - len(result)))
+    return result
+
+
+def remove_dropped_groups(playlist: list[PlaylistEntry],
+                          dropped: Iterable[PlaylistEntry]) -> list[PlaylistEntry]:
+    # Mirrors what input_.drop_groups does to the input file so that the playlist
+    # can be updated without being rebuilt. The names are added to the location's blacklist,
+    # which groups with a blacklist of their own don't use
+    disabled_locations: set[str] = set()
+    blacklists: dict[str, list[str]] = {}
+    for entry in dropped:
+        if entry.group.name == entry.location.name:
+            disabled_locations.add(entry.location.name)
+        else:
+            blacklists.setdefault(entry.location.name, []).append(entry.group.name)
+    return [
+        entry for entry in playlist
+        if entry.location.name not in disabled_locations
+        and not (entry.group.blacklist is entry.location.default_group.blacklist
+                 and _matches_blacklist(path.basename(entry.filename),
+                                        blacklists.get(entry.location.name, [])))
+    ]
+
+
+# Everything up to the search filter only depends on the input, the watched list and what's on
+# disk, so when the file listings are allowed to come from the cache, so are these candidates.
+# Scanning the locations is the slow part, so that's what on_progress hears about
+def _get_candidates(locations: list[Location],
+                    watched_list: list[FileGroup],
+                    use_cache: bool,
+                    settings_: Settings,
+                    cancellation_token: CancellationToken,
+                    on_progress: Optional[ProgressCallback] = None) -> Candidates:
+    global _CANDIDATES_CACHE
+    key: Optional[tuple[Any, ...]] = None
+    if locations:
+        key = (get_locations_fingerprint(locations),
+               tuple(watched_list),
+               settings_.exclude_directories)
+        cached = _CANDIDATES_CACHE
+        if use_cache and cached is not None and cached[0] == key:
+            return cached[1]
     location_groups: PlaylistEntriesByGroup = {}
-    for loc in locations:
-        paths: list[str] = _get_paths_from_location(loc, use_cache)
+    for scanned, loc in enumerate(locations, 1):
+        cancellation_token.raise_if_cancelled()
+        paths: list[ScannedPath] = _get_paths_from_location(loc, use_cache)
         location_groups.update(_group_items_by_regex(loc, paths))
+        if on_progress is not None:
+            on_progress(scanned, len(locations))
+    cancellation_token.raise_if_cancelled()
     location_group_items: PlaylistEntriesByGroupItems = [(k, v) for k, v in location_groups.items()]
     location_group_items.sort(key=lambda lgi: lgi[0].name)
     location_groups = dict(location_group_items)
@@ -57,41 +185,104 @@ def get_playlist(locations: list[Location],
         for k, v
         in groupby(sorted(location_groups.items(), key=_priority_key), _priority_key)
     }
-    result: list[PlaylistEntry] = []
-    for p, ew in entries_by_priority_and_weight.items():
-        interleaved: list[tuple[list[PlaylistEntry], int]] = []
+    if not entries_by_priority_and_weight:
+        return []
+    candidates: Candidates = []
+    for ew in entries_by_priority_and_weight.values():
+        by_weight: list[tuple[Weight, list[list[PlaylistEntry]]]] = []
         for w, e in ew.items():
-            interleaved.append((_get_playlist(e, watched_list, search_filter), w.weight))
-        result.extend(interleave_weighted(interleaved))
-    return result
+            cancellation_token.raise_if_cancelled()
+            by_weight.append((w, _filter_groups(e, watched_list, settings_)))
+        candidates.append(by_weight)
+    _CANDIDATES_CACHE = (key, candidates)
+    return candidates
 
 
-def _get_playlist(entries_by_group: PlaylistEntriesByGroup,
-                  watched_list: list[FileGroup],
-                  search_filter: str = "") -> list[PlaylistEntry]:
+def _filter_groups(entries_by_group: PlaylistEntriesByGroup,
+                   watched_list: list[FileGroup],
+                   settings_: Settings) -> list[list[PlaylistEntry]]:
     filtered_entries: list[list[PlaylistEntry]] = []
     watched_names = [i[0].upper() for i in watched_list]
+    exclude_directories = settings_.exclude_directories
     for group, entries in entries_by_group.items():
         # Ordering is important! Filter out invalid considerations first
         group_entries = [entry for entry in filter(
             lambda i: (_matches_whitelist(path.basename(i.filename), group.whitelist)
                        and not _matches_blacklist(path.basename(i.filename), group.blacklist)
-                       and (not settings.get_exclude_directories() or os.path.isfile(i.filename))),
+                       and (not exclude_directories or os.path.isfile(i.filename))),
             entries)]
         # Now that invalid considerations are gone, we can slice by timing considerations
         # or else invalid considerations will be part of the result, then removed anyway
         group_entries = _timed_slice(group.timed, group_entries) if group.timed else group_entries
         # Now that invalid and timed considerations are gone, we can finally remove things
-        # that we've already seen and match by the search filter
+        # that we've already seen. The search filter is applied later on top of this
         group_entries = [
             entry for entry in filter(
-                lambda i: path.basename(i.filename).upper() not in watched_names
-                and search_filter.upper() in path.basename(i.filename).upper(),
+                lambda i: path.basename(i.filename).upper() not in watched_names,
                 group_entries
             )
         ]
         if group_entries:
             filtered_entries.append(group_entries)
+    return filtered_entries
+
+
+# The candidates that match the search, and for fuzzy searches how closely each filename matched.
+# Search terms are whitespace separated and all of them have to be in a file's name. Starting
+# the search with search.FUZZY_PREFIX matches anything close enough to the terms instead.
+# A query that contains the previous query can only match a subset of what the previous one
+# did, so only the previous matches need to be looked at. Anything else goes to the index.
+# Either way the work scales with the number of matches rather than with the library
+def _search_candidates(candidates: Candidates, search_filter: str) \
+        -> tuple[Candidates, Optional[dict[str, float]]]:
+    global _SEARCH_CACHE
+    search_filter = search_filter.strip()
+    fuzzy = search_filter.startswith(search.FUZZY_PREFIX)
+    if fuzzy:
+        search_filter = search_filter[len(search.FUZZY_PREFIX):]
+    tokens = search.get_tokens(search_filter)
+    if not tokens:
+        return candidates, None
+    query = ' '.join(tokens)
+    positions = _get_positions(candidates)
+    cached = _SEARCH_CACHE
+    scores: Optional[dict[str, float]] = None
+    if fuzzy:
+        scores = {f: score for f, score in _SEARCH_INDEX.fuzzy_search(query) if f in positions}
+        filenames = list(scores)
+    elif cached is not None and cached[0] is candidates and not cached[2] and cached[1] in query:
+        filenames = [f for f in cached[3] if search.matches(tokens, path.basename(f))]
+    else:
+        filenames = [f for f in _SEARCH_INDEX.search(query) if f in positions]
+    _SEARCH_CACHE = (candidates, query, fuzzy, filenames)
+    matches: Candidates = [[(w, []) for w, _ in by_weight] for by_weight in candidates]
+    last_group: Optional[tuple[int, int, int]] = None
+    for p, w, g, i in sorted(pos for f in filenames for pos in positions[f]):
+        groups = matches[p][w][1]
+        if last_group != (p, w, g):
+            groups.append([])
+            last_group = (p, w, g)
+        groups[-1].append(candidates[p][w][1][g][i])
+    return matches, scores
+
+
+def _get_positions(candidates: Candidates) -> dict[str, list[CandidatePosition]]:
+    global _POSITIONS_CACHE
+    cached = _POSITIONS_CACHE
+    if cached is not None and cached[0] is candidates:
+        return cached[1]
+    positions: dict[str, list[CandidatePosition]] = {}
+    for p, by_weight in enumerate(candidates):
+        for w, (_, groups) in enumerate(by_weight):
+            for g, group_entries in enumerate(groups):
+                for i, entry in enumerate(group_entries):
+                    positions.setdefault(entry.filename, []).append((p, w, g, i))
+    _POSITIONS_CACHE = (candidates, positions)
+    return positions
+
+
+def _interleave_groups(filtered_entries: list[list[PlaylistEntry]],
+                       watched_list: list[FileGroup]) -> list[PlaylistEntry]:
     if not filtered_entries:
         return []
     # Need to do some convoluted nonsense to remove alphabetical biasing in the playlist.
@@ -101,28 +292,68 @@ def _get_playlist(entries_by_group: PlaylistEntriesByGroup,
     masked_playlist: list[tuple[int, int]] = interleave_all(masked)
     sorted_group: list[list[PlaylistEntry]] = \
         _sort_data_by_least_recently_watched(filtered_entries, watched_list)
-    return _unmask_playlist(masked_playlist, sorted_group)
+    return list(_unmask_playlist(masked_playlist, sorted_group))
 
 
-def _get_paths_from_location(loc: Location, use_cache: bool) -> list[str]:
+def _iter_interleave_groups(filtered_entries: list[list[PlaylistEntry]],
+                            watched_list: list[FileGroup]) -> Iterator[PlaylistEntry]:
+    if not filtered_entries:
+        return iter([])
+    return _unmask_playlist(
+        iter_interleave_all(_mask_data(filtered_entries)),
+        _sort_data_by_least_recently_watched(filtered_entries, watched_list))
+
+
+# Everything about the locations a playlist depends on apart from what's on disk and the watched
+# list. Timed groups make this change by themselves as time passes
+def get_locations_fingerprint(locations: list[Location]) -> tuple[Any, ...]:
+    return tuple(_get_location_fingerprint(loc) for loc in locations)
+
+
+def _get_location_fingerprint(loc: Location) -> tuple[Any, ...]:
+    return (loc.name, _get_group_fingerprint(loc.default_group), tuple(loc.additional),
+            loc.regex, tuple(_get_group_fingerprint(group) for group in loc.groups))
+
+
+def _get_group_fingerprint(group: Group) -> tuple[Any, ...]:
+    # only where a timed group is currently at can change what it contributes
+    timed = None if group.timed is None else (group.timed.first, group.timed.get_current())
+    return (group.name, group.location_name, group.priority, tuple(group.whitelist),
+            tuple(group.blacklist), timed, group.exact, group.weight)
+
+
+def _get_paths_from_location(loc: Location, use_cache: bool) -> list[ScannedPath]:
     if use_cache and loc.name in _FILE_CACHE:
         return _FILE_CACHE[loc.name]
-    path_parts = [(loc.name, i) for i in os.listdir(loc.name)]
+    path_parts = _scan_directory(loc.name)
     for a in loc.additional:
-        path_parts += [(a, i) for i in os.listdir(a)]
-    paths = list(map(lambda i: path.join(i[0], i[1]),
-                     natsorted(path_parts, key=lambda i: i[1], alg=ns.IGNORECASE)))
+        path_parts += _scan_directory(a)
+    path_parts.sort(key=lambda i: i[2])
+    paths = [(path.join(directory, name), key) for directory, name, key in path_parts]
     _FILE_CACHE[loc.name] = paths
     return paths
 
 
-def _group_items_by_regex(loc: Location, paths: list[str]) -> PlaylistEntriesByGroup:
+def _scan_directory(directory: str) -> list[tuple[str, str, Any]]:
+    names = os.listdir(directory)
+    cached_keys = _NATSORT_KEY_CACHE.get(directory, {})
+    keys = {name: cached_keys[name] if name in cached_keys else natsort_key(name)
+            for name in names}
+    _NATSORT_KEY_CACHE[directory] = keys
+    _SEARCH_INDEX.update(((path.join(directory, name), name)
+                          for name in keys if name not in cached_keys),
+                         (path.join(directory, name)
+                          for name in cached_keys if name not in keys))
+    return [(directory, name, keys[name]) for name in names]
+
+
+def _group_items_by_regex(loc: Location, paths: list[ScannedPath]) -> PlaylistEntriesByGroup:
     regex_str: str = loc.regex if loc.regex is not None else ''
     regex: Pattern = re.compile(regex_str)
     grouped_items: PlaylistEntriesByGroup = {}
     group_dict = {group.name.upper(): group for group in loc.groups}
 
-    for p in paths:
+    for p, key in paths:
         match = regex.match(path.basename(p))
         if not match:
             continue
@@ -139,7 +370,7 @@ def _group_items_by_regex(loc: Location, paths: list[str]) -> PlaylistEntriesByG
         else:
             group = loc.default_group
         group_members = grouped_items.setdefault(group, list())
-        group_members.append(PlaylistEntry(p, loc, group))
+        group_members.append(PlaylistEntry(p, loc, group, key))
     return grouped_items
 
 
@@ -188,11 +419,8 @@ def _mask_data(data: list[list[PlaylistEntry]]) -> list[list[tuple[int, int]]]:
     masked: list[list[tuple[int, int]]] = []
     group_idx: dict[int, int] = {}
     for group in data:
-        masked_group: list[tuple[int, int]] = []
-        masked.append(masked_group)
         idx = group_idx.setdefault(len(group), 0)
-        for _ in group:
-            masked_group.append((idx, len(group)))
+        masked.append([(idx, len(group))] * len(group))
         group_idx[len(group)] = idx + 1
     return masked
 
@@ -212,9 +440,8 @@ def _sort_data_by_least_recently_watched(
     return ideal_group_sorting
 
 
-def _unmask_playlist(masked_playlist: list[tuple[int, int]], data: list[list[PlaylistEntry]]) \
-        -> list[PlaylistEntry]:
-    playlist: list[PlaylistEntry] = []
+def _unmask_playlist(masked_playlist: Iterable[tuple[int, int]],
+                     data: list[list[PlaylistEntry]]) -> Iterator[PlaylistEntry]:
     data_size_dict: dict[int, list[list[PlaylistEntry]]] = {}
     group_len_group_idx_dict: dict[int, dict[int, int]] = {}
     group_file_idx_dict: dict[tuple[int, int], int] = {}
@@ -228,5 +455,4 @@ def _unmask_playlist(masked_playlist: list[tuple[int, int]], data: list[list[Pla
         group_file_idx = group_file_idx_dict.setdefault(masked_group, 0)
         group_file_idx_dict[masked_group] = group_file_idx + 1
 
-        playlist.append(data_size_dict[group_len][mapped_group_idx][group_file_idx])
-    return playlist
+        yield data_size_dict[group_len][mapped_group_idx][group_file_idx]
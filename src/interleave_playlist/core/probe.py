@@ -0,0 +1,171 @@
+#    Interleave Playlist
+#    Copyright (C) 2026 Thomas Sweeney
+#    This file is part of Interleave Playlist.
+#    Interleave Playlist is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#    Interleave Playlist is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+import mmap
+import struct
+from functools import lru_cache
+from typing import Optional
+
+_EBML_MAGIC = b'\x1a\x45\xdf\xa3'
+_MATROSKA_SEGMENT_ID = 0x18538067
+_MATROSKA_INFO_ID = 0x1549A966
+_MATROSKA_CLUSTER_ID = 0x1F43B675
+_MATROSKA_TIMESTAMP_SCALE_ID = 0x2AD7B1
+_MATROSKA_DURATION_ID = 0x4489
+_MATROSKA_DEFAULT_TIMESTAMP_SCALE = 1000 * 1000
+_MP4_TOP_LEVEL_BOXES = {b'ftyp', b'moov', b'mdat', b'free', b'skip', b'wide', b'pdin'}
+_UNKNOWN_SIZE = -1
+# Headers are only walked this far before giving up and letting MediaInfo figure it out.
+# Only the pages that are actually touched get read from disk
+_MAX_ELEMENTS = 64
+
+
+class _UnsupportedFile(Exception):
+    pass
+
+
+def get_duration(filename: str) -> int:
+    duration = get_native_duration(filename)
+    if duration is None:
+        duration = _get_media_info_duration(filename)
+    if duration is None:
+        print(f'Warning: {filename} has no duration info for video or audio')
+        return 0
+    return duration
+
+
+def get_native_duration(filename: str) -> Optional[int]:
+    try:
+        with open(filename, 'rb') as f, \
+                mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+            if m[0:4] == _EBML_MAGIC:
+                return _get_matroska_duration(m)
+            if m[4:8] in _MP4_TOP_LEVEL_BOXES:
+                return _get_mp4_duration(m)
+    except (OSError, ValueError, IndexError, struct.error, _UnsupportedFile):
+        pass
+    return None
+
+
+@lru_cache(maxsize=None)
+def media_info_available() -> bool:
+    # pymediainfo is slow to import, so it's left until the first time probing needs it
+    from pymediainfo import MediaInfo
+    return bool(MediaInfo.can_parse())
+
+
+def _get_media_info_duration(filename: str) -> Optional[int]:
+    if not media_info_available():
+        return None
+    from pymediainfo import MediaInfo
+    media_info = MediaInfo.parse(filename)
+    if len(media_info.video_tracks) > 0 and media_info.video_tracks[0].duration:
+        return int(float(media_info.video_tracks[0].duration))
+    elif len(media_info.audio_tracks) > 0 and media_info.audio_tracks[0].duration:
+        return int(float(media_info.audio_tracks[0].duration))
+    return None
+
+
+def _read_vint(m: mmap.mmap, pos: int, keep_marker: bool = False) -> tuple[int, int]:
+    first = m[pos]
+    length = 1
+    marker = 0x80
+    while not first & marker:
+        marker >>= 1
+        length += 1
+        if length > 8:
+            raise _UnsupportedFile()
+    value = first if keep_marker else first & (marker - 1)
+    for b in m[pos + 1:pos + length]:
+        value = (value << 8) | b
+    if not keep_marker and value == (1 << (7 * length)) - 1:
+        value = _UNKNOWN_SIZE
+    return value, pos + length
+
+
+def _read_element_header(m: mmap.mmap, pos: int) -> tuple[int, int, int]:
+    element_id, pos = _read_vint(m, pos, keep_marker=True)
+    size, pos = _read_vint(m, pos)
+    return element_id, size, pos
+
+
+def _get_matroska_duration(m: mmap.mmap) -> Optional[int]:
+    _, size, pos = _read_element_header(m, 0)
+    if size == _UNKNOWN_SIZE:
+        return None
+    element_id, _, pos = _read_element_header(m, pos + size)
+    if element_id != _MATROSKA_SEGMENT_ID:
+        return None
+    for _ in range(_MAX_ELEMENTS):
+        element_id, size, pos = _read_element_header(m, pos)
+        if element_id == _MATROSKA_INFO_ID and size != _UNKNOWN_SIZE:
+            return _get_matroska_info_duration(m, pos, pos + size)
+        if element_id == _MATROSKA_CLUSTER_ID or size == _UNKNOWN_SIZE:
+            return None
+        pos += size
+    return None
+
+
+def _get_matroska_info_duration(m: mmap.mmap, pos: int, end: int) -> Optional[int]:
+    timestamp_scale = _MATROSKA_DEFAULT_TIMESTAMP_SCALE
+    duration: Optional[float] = None
+    while pos < end:
+        element_id, size, pos = _read_element_header(m, pos)
+        if size == _UNKNOWN_SIZE:
+            return None
+        data = m[pos:pos + size]
+        if element_id == _MATROSKA_TIMESTAMP_SCALE_ID:
+            timestamp_scale = int.from_bytes(data, 'big')
+        elif element_id == _MATROSKA_DURATION_ID:
+            duration = struct.unpack('>f' if size == 4 else '>d', data)[0]
+        pos += size
+    if not duration:
+        return None
+    return int(duration * timestamp_scale / (1000 * 1000))
+
+
+def _find_mp4_box(m: mmap.mmap, pos: int, end: int, box_type: bytes) -> Optional[tuple[int, int]]:
+    for _ in range(_MAX_ELEMENTS):
+        if pos + 8 > end:
+            return None
+        size, found_type = struct.unpack('>I4s', m[pos:pos + 8])
+        header_size = 8
+        if size == 1:
+            size = struct.unpack('>Q', m[pos + 8:pos + 16])[0]
+            header_size = 16
+        elif size == 0:
+            size = end - pos
+        if size < header_size:
+            return None
+        if found_type == box_type:
+            return pos + header_size, pos + size
+        pos += size
+    return None
+
+
+def _get_mp4_duration(m: mmap.mmap) -> Optional[int]:
+    moov = _find_mp4_box(m, 0, len(m), b'moov')
+    if moov is None:
+        return None
+    mvhd = _find_mp4_box(m, *moov, b'mvhd')
+    if mvhd is None:
+        return None
+    pos = mvhd[0]
+    if m[pos] == 1:
+        timescale, duration = struct.unpack('>IQ', m[pos + 20:pos + 32])
+    else:
+        timescale, duration = struct.unpack('>II', m[pos + 12:pos + 20])
+    # fragmented files have the real duration spread out over the fragments
+    if not timescale or not duration or duration in (0xFFFFFFFF, 0xFFFFFFFFFFFFFFFF):
+        return None
+    return int(duration * 1000 // timescale)
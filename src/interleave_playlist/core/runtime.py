@@ -0,0 +1,203 @@
+#    Interleave Playlist
+#    Copyright (C) 2026 Thomas Sweeney
+#    This file is part of Interleave Playlist.
+#    Interleave Playlist is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#    Interleave Playlist is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+import heapq
+import itertools
+from collections import Counter
+from collections.abc import Callable, Container, Iterable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor, FIRST_COMPLETED, wait
+from threading import Lock
+from typing import Optional
+
+# (boost, insertion order). Lower values are probed first
+_Priority = tuple[int, int]
+
+
+# Files are probed in the order they're put unless they get prioritized. The most recent call
+# to prioritize always wins so that whatever the user is looking at right now is probed first.
+# Only files that are still queued can be prioritized, so nothing is kept once a file is popped
+class ProbeQueue:
+
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self._order = itertools.count()
+        self._boost = itertools.count(-1, -1)
+        self._queued: dict[str, tuple[_Priority, int]] = {}
+        self._heaps: dict[int, list[tuple[_Priority, str]]] = {}
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._queued)
+
+    def put(self, filename: str, device: int) -> None:
+        with self._lock:
+            if filename in self._queued:
+                return
+            priority = (0, next(self._order))
+            self._queued[filename] = (priority, device)
+            heapq.heappush(self._heaps.setdefault(device, []), (priority, filename))
+
+    def prioritize(self, filenames: Iterable[str]) -> None:
+        with self._lock:
+            boost = next(self._boost)
+            for filename in filenames:
+                if filename not in self._queued:
+                    continue
+                (_, order), device = self._queued[filename]
+                priority = (boost, order)
+                self._queued[filename] = (priority, device)
+                # the old heap entry is left behind and skipped over when it's reached
+                heapq.heappush(self._heaps[device], (priority, filename))
+
+    def pop(self, busy_devices: Container[int] = ()) -> Optional[tuple[str, int]]:
+        with self._lock:
+            best: Optional[tuple[_Priority, int]] = None
+            for device, heap in self._heaps.items():
+                while heap and self._is_stale(*heap[0]):
+                    heapq.heappop(heap)
+                if heap and device not in busy_devices and (best is None or heap[0][0] < best[0]):
+                    best = heap[0][0], device
+            if best is None:
+                return None
+            _, filename = heapq.heappop(self._heaps[best[1]])
+            del self._queued[filename]
+            return filename, best[1]
+
+    def _is_stale(self, priority: _Priority, filename: str) -> bool:
+        queued = self._queued.get(filename)
+        return queued is None or queued[0] != priority
+
+
+# Yields (filename, duration) in the order the probes complete. Limiting the probes per device
+# keeps slow network shares and spinning disks from being thrashed by the whole pool at once
+def probe_durations(queue: ProbeQueue,
+                    probe: Callable[[str], int],
+                    max_workers: int,
+                    max_workers_per_device: int,
+                    should_stop: Callable[[], bool] = lambda: False) \
+        -> Iterator[tuple[str, int]]:
+    running: dict[Future[int], tuple[str, int]] = {}
+    running_per_device: dict[int, int] = {}
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    try:
+        while True:
+            if should_stop():
+                return
+            while len(running) < max_workers:
+                busy = {device for device, count in running_per_device.items()
+                        if count >= max_workers_per_device}
+                popped = queue.pop(busy)
+                if popped is None:
+                    break
+                filename, device = popped
+                running[executor.submit(probe, filename)] = popped
+                running_per_device[device] = running_per_device.get(device, 0) + 1
+            if not running:
+                return
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                filename, device = running.pop(future)
+                running_per_device[device] -= 1
+                yield filename, future.result()
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+# Keeps the total and selected runtimes up to date by applying deltas as entries are added,
+# removed, selected or deselected and as durations come in, so nothing is ever re-summed.
+# Filenames are counted since the same file can show up in the playlist more than once
+class RuntimeAggregator:
+
+    def __init__(self) -> None:
+        self._durations: dict[str, int] = {}
+        self._entries: Counter[str] = Counter()
+        self._selected: Counter[str] = Counter()
+        self.total: int = 0
+        self.total_count: int = 0
+        self.total_missing: int = 0
+        self.selected: int = 0
+        self.selected_count: int = 0
+        self.selected_missing: int = 0
+
+    def __contains__(self, filename: object) -> bool:
+        return filename in self._durations
+
+    def get_missing(self) -> list[str]:
+        return [filename for filename in self._entries if filename not in self._durations]
+
+    # durations of the entries currently being totalled
+    def get_durations(self) -> dict[str, int]:
+        return {filename: self._durations[filename]
+                for filename in self._entries if filename in self._durations}
+
+    def set_durations(self, durations: dict[str, int]) -> None:
+        for filename, duration in durations.items():
+            old = self._durations.get(filename)
+            self._durations[filename] = duration
+            delta = duration - (0 if old is None else old)
+            entries = self._entries.get(filename, 0)
+            selected = self._selected.get(filename, 0)
+            self.total += delta * entries
+            self.selected += delta * selected
+            if old is None:
+                self.total_missing -= entries
+                self.selected_missing -= selected
+
+    def reset(self, filenames: Iterable[str]) -> None:
+        self._entries.clear()
+        self.total = self.total_count = self.total_missing = 0
+        self.clear_selection()
+        self.add(filenames)
+
+    def add(self, filenames: Iterable[str]) -> None:
+        self.total, self.total_count, self.total_missing = self._apply(
+            self._entries, filenames, 1, self.total, self.total_count, self.total_missing)
+
+    def remove(self, filenames: Iterable[str]) -> None:
+        self.total, self.total_count, self.total_missing = self._apply(
+            self._entries, filenames, -1, self.total, self.total_count, self.total_missing)
+
+    def select(self, filenames: Iterable[str]) -> None:
+        self.selected, self.selected_count, self.selected_missing = self._apply(
+            self._selected, filenames, 1,
+            self.selected, self.selected_count, self.selected_missing)
+
+    def deselect(self, filenames: Iterable[str]) -> None:
+        self.selected, self.selected_count, self.selected_missing = self._apply(
+            self._selected, filenames, -1,
+            self.selected, self.selected_count, self.selected_missing)
+
+    def clear_selection(self) -> None:
+        self._selected.clear()
+        self.selected = self.selected_count = self.selected_missing = 0
+
+    def _apply(self, counter: Counter[str], filenames: Iterable[str], sign: int,
+               duration: int, count: int, missing: int) -> tuple[int, int, int]:
+        for filename in filenames:
+            if sign < 0:
+                # removing something that isn't there is a no-op so callers don't need to
+                # worry about the same removal being reported twice
+                if counter.get(filename, 0) <= 0:
+                    continue
+                counter[filename] -= 1
+                if counter[filename] == 0:
+                    del counter[filename]
+            else:
+                counter[filename] += 1
+            count += sign
+            known = self._durations.get(filename)
+            if known is None:
+                missing += sign
+            else:
+                duration += sign * known
+        return duration, count, missing
@@ -0,0 +1,131 @@
+#    Interleave Playlist
+#    Copyright (C) 2026 Thomas Sweeney
+#    This file is part of Interleave Playlist.
+#    Interleave Playlist is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#    Interleave Playlist is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+from collections.abc import Iterable
+from threading import Lock
+from typing import Optional
+
+FUZZY_PREFIX = '~'
+_N = 3
+# fraction of a query's trigrams a name needs to share with it to count as a fuzzy match
+_FUZZY_THRESHOLD = 0.4
+
+
+def get_tokens(query: str) -> list[str]:
+    return query.casefold().split()
+
+
+def matches(tokens: list[str], name: str) -> bool:
+    folded = name.casefold()
+    return all(token in folded for token in tokens)
+
+
+def get_trigrams(s: str) -> set[str]:
+    return {s[i:i + _N] for i in range(len(s) - _N + 1)}
+
+
+# Inverted index from every trigram of a case folded name to the keys of the names that contain
+# it. A key matches a token of three or more characters only if it's in the posting list of every
+# one of the token's trigrams, so the smallest posting lists are intersected first and whatever
+# survives is checked with a real substring test. Shorter tokens have no trigrams and can only be
+# checked directly
+class TrigramIndex:
+
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self._names: dict[str, str] = {}
+        self._postings: dict[str, set[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def add(self, key: str, name: str) -> None:
+        with self._lock:
+            self._add(key, name)
+
+    def remove(self, key: str) -> None:
+        with self._lock:
+            self._remove(key)
+
+    def update(self, added: Iterable[tuple[str, str]], removed: Iterable[str] = ()) -> None:
+        with self._lock:
+            for key in removed:
+                self._remove(key)
+            for key, name in added:
+                self._add(key, name)
+
+    # Keys of the names containing every whitespace separated token of the query
+    def search(self, query: str) -> set[str]:
+        tokens = get_tokens(query)
+        with self._lock:
+            if not tokens:
+                return set(self._names)
+            postings = sorted((self._postings.get(trigram, set())
+                               for token in tokens
+                               for trigram in get_trigrams(token)),
+                              key=len)
+            if not postings:
+                return {key for key, name in self._names.items()
+                        if all(token in name for token in tokens)}
+            if not postings[0]:
+                return set()
+            candidates = postings[0].intersection(*postings[1:])
+            # a token that is exactly one trigram is matched by its posting list alone
+            unverified = [token for token in tokens if len(token) != _N]
+            if not unverified:
+                return candidates
+            names = self._names
+            return {key for key in candidates
+                    if all(token in names[key] for token in unverified)}
+
+    # Keys ranked by how many of the query's trigrams their names share, best first
+    def fuzzy_search(self, query: str, limit: Optional[int] = None) -> list[tuple[str, float]]:
+        # padding lets the start and end of words count, which is what keeps typos like
+        # swapped letters close enough
+        trigrams = set().union(*(get_trigrams(f' {token} ') for token in get_tokens(query)))
+        if not trigrams:
+            return []
+        counts: dict[str, int] = {}
+        with self._lock:
+            for trigram in trigrams:
+                for key in self._postings.get(trigram, ()):
+                    counts[key] = counts.get(key, 0) + 1
+            scored = [(key, count / len(trigrams)) for key, count in counts.items()
+                      if count / len(trigrams) >= _FUZZY_THRESHOLD]
+            scored.sort(key=lambda i: (-i[1], len(self._names[i[0]]), i[0]))
+        return scored if limit is None else scored[:limit]
+
+    def _add(self, key: str, name: str) -> None:
+        if key in self._names:
+            self._remove(key)
+        folded = name.casefold()
+        self._names[key] = folded
+        postings = self._postings
+        for trigram in get_trigrams(f' {folded} '):
+            posting = postings.get(trigram)
+            if posting is None:
+                postings[trigram] = {key}
+            else:
+                posting.add(key)
+
+    def _remove(self, key: str) -> None:
+        folded = self._names.pop(key, None)
+        if folded is None:
+            return
+        for trigram in get_trigrams(f' {folded} '):
+            posting = self._postings.get(trigram)
+            if posting is None:
+                continue
+            posting.discard(key)
+            if not posting:
+                del self._postings[trigram]
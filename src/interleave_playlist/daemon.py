@@ -0,0 +1,337 @@
+#    Interleave Playlist
+#    Copyright (C) 2026 Thomas Sweeney
+#    This file is part of Interleave Playlist.
+#    Interleave Playlist is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#    Interleave Playlist is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+import json
+import os
+import signal
+import socket
+import socketserver
+import threading
+from collections import deque
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any, Optional
+
+import appdirs
+
+import interleave_playlist
+from interleave_playlist import CriticalUserError
+from interleave_playlist.core.export import to_dicts
+from interleave_playlist.persistence import input_
+from interleave_playlist.service import get_sort_name, PlaylistService, UnknownFile
+
+# A process that keeps a PlaylistService warm and answers newline delimited JSON-RPC 2.0 over a
+# Unix socket. Clients that called subscribe are sent these notifications, with no id:
+#   playlist_changed {input}: an input, its watched list or one of its directories changed
+#   watched_changed {input, filenames, watched}: a client marked or unmarked files
+# Like cli, nothing in here may import PySide6
+
+SOCKET_FILE = Path(os.path.join(appdirs.user_data_dir(interleave_playlist.APP_NAME),
+                                'daemon.sock'))
+
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+SERVER_ERROR = -32000
+
+Params = dict[str, Any]
+
+
+class RpcError(Exception):
+    def __init__(self, code: int, message: str) -> None:
+        super().__init__(message)
+        self.code = code
+        self.message = message
+
+
+class DaemonRunning(Exception):
+    pass
+
+
+def is_running(socket_file: Path = SOCKET_FILE) -> bool:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as s:
+        try:
+            s.connect(str(socket_file))
+        except OSError:
+            return False
+    return True
+
+
+# With an http_address, the HTTP API is served from the same caches as well
+def serve(socket_file: Path = SOCKET_FILE,
+          poll_s: float = 2.0,
+          http_address: Optional[tuple[str, int]] = None) -> None:
+    with PlaylistServer(socket_file, poll_s=poll_s) as server:
+        http_server = None
+        if http_address is not None:
+            from interleave_playlist.http_api import PlaylistHttpServer
+            http_server = PlaylistHttpServer(http_address, server.service)
+            threading.Thread(target=http_server.serve_forever, daemon=True).start()
+        # so that being stopped by a service manager also cleans up the socket
+        signal.signal(signal.SIGTERM, signal.default_int_handler)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            if http_server is not None:
+                http_server.shutdown()
+                http_server.server_close()
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    server: 'PlaylistServer'
+
+    def setup(self) -> None:
+        super().setup()
+        # notifications are written from other threads
+        self._write_lock = threading.Lock()
+
+    def handle(self) -> None:
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            response = self.server.handle_line(line, self)
+            if response is not None:
+                self.send(response)
+
+    def finish(self) -> None:
+        self.server.unsubscribe(self)
+        super().finish()
+
+    def send(self, message: dict[str, Any]) -> None:
+        data = (json.dumps(message) + '\n').encode('utf-8')
+        with self._write_lock:
+            self.wfile.write(data)
+
+
+class PlaylistServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self,
+                 socket_file: Path = SOCKET_FILE,
+                 service: Optional[PlaylistService] = None,
+                 poll_s: float = 2.0) -> None:
+        if os.path.exists(socket_file):
+            if is_running(socket_file):
+                raise DaemonRunning(f'Already serving on {socket_file}')
+            # left behind by a daemon that was killed
+            os.unlink(socket_file)
+        os.makedirs(os.path.dirname(socket_file), exist_ok=True)
+        super().__init__(str(socket_file), _Handler)
+        os.chmod(socket_file, 0o600)
+        self.socket_file = socket_file
+        self.service = service if service is not None else PlaylistService()
+        self.poll_s = poll_s
+        self._subscribers: set[_Handler] = set()
+        self._subscribers_lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._methods: dict[str, Callable[[_Handler, Params], Any]] = {
+            'get_playlist': self._get_playlist,
+            'next_up': self._next_up,
+            'search': self._search,
+            'mark_watched': self._mark_watched,
+            'subscribe': self._subscribe,
+        }
+
+    def serve_forever(self, poll_interval: float = 0.5) -> None:
+        self._stopped.clear()
+        threading.Thread(target=self._poll, daemon=True).start()
+        try:
+            super().serve_forever(poll_interval)
+        finally:
+            self._stopped.set()
+
+    def server_close(self) -> None:
+        super().server_close()
+        try:
+            os.unlink(self.socket_file)
+        except OSError:
+            pass
+
+    def handle_line(self, line: bytes, handler: _Handler) -> Optional[dict[str, Any]]:
+        try:
+            request = json.loads(line)
+        except ValueError:
+            return _get_error(None, PARSE_ERROR, 'Parse error')
+        if not isinstance(request, dict) or not isinstance(request.get('method'), str):
+            return _get_error(request.get('id') if isinstance(request, dict) else None,
+                              INVALID_REQUEST, 'Invalid Request')
+        request_id = request.get('id')
+        try:
+            params = request.get('params', {})
+            if not isinstance(params, dict):
+                raise RpcError(INVALID_PARAMS, 'params must be an object')
+            method = self._methods.get(request['method'])
+            if method is None:
+                raise RpcError(METHOD_NOT_FOUND, f"Method not found: {request['method']}")
+            result = method(handler, params)
+        except RpcError as e:
+            response = _get_error(request_id, e.code, e.message)
+        except (UnknownFile, ValueError) as e:
+            response = _get_error(request_id, INVALID_PARAMS, str(e))
+        except (OSError, input_.InvalidInputFile, input_.LocationNotFound) as e:
+            response = _get_error(request_id, SERVER_ERROR, str(e))
+        except CriticalUserError as e:
+            response = _get_error(request_id, SERVER_ERROR, e.message)
+        else:
+            response = {'jsonrpc': '2.0', 'id': request_id, 'result': result}
+        # requests without an id are notifications and never get a response
+        return response if 'id' in request else None
+
+    def notify(self, method: str, params: Params) -> None:
+        message = {'jsonrpc': '2.0', 'method': method, 'params': params}
+        with self._subscribers_lock:
+            subscribers = list(self._subscribers)
+        for subscriber in subscribers:
+            try:
+                subscriber.send(message)
+            except OSError:
+                self.unsubscribe(subscriber)
+
+    def unsubscribe(self, handler: _Handler) -> None:
+        with self._subscribers_lock:
+            self._subscribers.discard(handler)
+
+    def _poll(self) -> None:
+        while not self._stopped.wait(self.poll_s):
+            with self._subscribers_lock:
+                if not self._subscribers:
+                    continue
+            for input_file in self.service.get_changed():
+                self.notify('playlist_changed', {'input': str(input_file)})
+
+    def _get_playlist(self, _: _Handler, params: Params) -> Any:
+        _check_params(params, {'input', 'filter', 'sort', 'reverse', 'limit'})
+        sort = _get_param(params, 'sort', str)
+        return to_dicts(self.service.get_playlist(
+            _get_input(params),
+            _get_param(params, 'filter', str, ''),
+            get_sort_name(sort) if sort is not None else None,
+            _get_param(params, 'reverse', bool),
+            _get_param(params, 'limit', int)))
+
+    def _next_up(self, _: _Handler, params: Params) -> Any:
+        _check_params(params, {'input', 'filter', 'n'})
+        return to_dicts(self.service.get_playlist(
+            _get_input(params),
+            _get_param(params, 'filter', str, ''),
+            'INTERLEAVE', False,
+            _get_param(params, 'n', int, 1)))
+
+    def _search(self, _: _Handler, params: Params) -> Any:
+        _check_params(params, {'input', 'query', 'limit'})
+        query = _get_param(params, 'query', str)
+        if query is None:
+            raise RpcError(INVALID_PARAMS, 'query is required')
+        return to_dicts(self.service.get_playlist(
+            _get_input(params), query, limit=_get_param(params, 'limit', int)))
+
+    def _mark_watched(self, _: _Handler, params: Params) -> Any:
+        _check_params(params, {'input', 'filenames', 'watched'})
+        filenames = _get_param(params, 'filenames', list)
+        if filenames is None or not all(isinstance(f, str) for f in filenames):
+            raise RpcError(INVALID_PARAMS, 'filenames must be a list of strings')
+        watched = _get_param(params, 'watched', bool, True)
+        input_file = self.service.mark_watched(filenames, watched, _get_input(params))
+        self.notify('watched_changed',
+                    {'input': str(input_file), 'filenames': filenames, 'watched': watched})
+        return None
+
+    def _subscribe(self, handler: _Handler, params: Params) -> Any:
+        _check_params(params, set())
+        with self._subscribers_lock:
+            self._subscribers.add(handler)
+        return True
+
+
+def _get_error(request_id: Any, code: int, message: str) -> dict[str, Any]:
+    return {'jsonrpc': '2.0', 'id': request_id, 'error': {'code': code, 'message': message}}
+
+
+def _check_params(params: Params, allowed: set[str]) -> None:
+    unknown = set(params) - allowed
+    if unknown:
+        raise RpcError(INVALID_PARAMS, f"Unknown params: {', '.join(sorted(unknown))}")
+
+
+def _get_param(params: Params, name: str, type_: type, default: Any = None) -> Any:
+    value = params.get(name)
+    if value is None:
+        return default
+    # bool is an int, but true isn't a limit
+    if not isinstance(value, type_) or (type_ is int and isinstance(value, bool)):
+        raise RpcError(INVALID_PARAMS, f'{name} must be a {type_.__name__}')
+    return value
+
+
+def _get_input(params: Params) -> Optional[Path]:
+    input_file = _get_param(params, 'input', str)
+    return Path(input_file) if input_file is not None else None
+
+
+# A connection to a running daemon. Notifications that arrive while waiting for a response are
+# kept in notifications until they're asked for
+class Client:
+    def __init__(self, socket_file: Path = SOCKET_FILE, timeout: Optional[float] = None) -> None:
+        self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._socket.settimeout(timeout)
+        try:
+            self._socket.connect(str(socket_file))
+        except OSError:
+            self._socket.close()
+            raise
+        self._file = self._socket.makefile('rb')
+        self._last_id = 0
+        self.notifications: deque[dict[str, Any]] = deque()
+
+    def __enter__(self) -> 'Client':
+        return self
+
+    def __exit__(self, *_: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._file.close()
+        self._socket.close()
+
+    def call(self, method: str, **params: Any) -> Any:
+        self._last_id += 1
+        request_id = self._last_id
+        self._socket.sendall((json.dumps({'jsonrpc': '2.0', 'id': request_id,
+                                          'method': method, 'params': params})
+                              + '\n').encode('utf-8'))
+        while True:
+            message = self._read()
+            if 'id' not in message:
+                self.notifications.append(message)
+            elif message['id'] == request_id:
+                if 'error' in message:
+                    raise RpcError(message['error']['code'], message['error']['message'])
+                return message.get('result')
+
+    # Blocks until the daemon sends a notification
+    def get_notification(self) -> dict[str, Any]:
+        while not self.notifications:
+            message = self._read()
+            if 'id' not in message:
+                self.notifications.append(message)
+        return self.notifications.popleft()
+
+    def _read(self) -> dict[str, Any]:
+        line = self._file.readline()
+        if not line:
+            raise ConnectionError('The daemon closed the connection')
+        message: dict[str, Any] = json.loads(line)
+        return message
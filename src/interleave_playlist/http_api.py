@@ -0,0 +1,217 @@
+#    Interleave Playlist
+#    Copyright (C) 2026 Thomas Sweeney
+#    This file is part of Interleave Playlist.
+#    Interleave Playlist is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#    Interleave Playlist is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+import hashlib
+import json
+from collections.abc import Callable
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Optional
+from urllib.parse import parse_qs, urlsplit
+
+from interleave_playlist import CriticalUserError
+from interleave_playlist.core import PlaylistEntry
+from interleave_playlist.core.export import to_json, to_m3u
+from interleave_playlist.core.playlist import FileGroup
+from interleave_playlist.persistence import input_
+from interleave_playlist.service import get_sort_name, PlaylistService, UnknownFile
+
+# Read only HTTP access to the same things as the daemon, for frontends and scripts that would
+# rather poll than hold a socket open:
+#   GET /playlist, /playlist.m3u  ?input=&filter=&sort=&reverse=&limit=
+#   GET /groups                   ?input=   remaining and watched per group
+#   GET /watched                  ?input=
+# Every response has an ETag that only changes when the input, its watched list, one of its
+# directories, a timed group or the settings do, so If-None-Match gets a 304 without a rebuild
+# Like cli, nothing in here may import PySide6
+
+DEFAULT_PORT = 8317
+
+_JSON = 'application/json'
+_M3U = 'audio/x-mpegurl; charset=utf-8'
+
+Params = dict[str, str]
+Route = Callable[[PlaylistService, Params], str]
+
+
+def serve(address: tuple[str, int] = ('127.0.0.1', DEFAULT_PORT),
+          service: Optional[PlaylistService] = None) -> None:
+    with PlaylistHttpServer(address, service) as server:
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+
+
+class PlaylistHttpServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self,
+                 address: tuple[str, int] = ('127.0.0.1', DEFAULT_PORT),
+                 service: Optional[PlaylistService] = None) -> None:
+        super().__init__(address, _Handler)
+        self.service = service if service is not None else PlaylistService()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: PlaylistHttpServer
+
+    def do_GET(self) -> None:
+        url = urlsplit(self.path)
+        route = _ROUTES.get(url.path)
+        if route is None:
+            self._send_error(HTTPStatus.NOT_FOUND, f'Not found: {url.path}')
+            return
+        allowed, content_type, get_body = route
+        try:
+            params = _get_params(url.query, allowed)
+            version = self.server.service.get_version(
+                _get_input(params), get_sort_name(params['sort']) if 'sort' in params else None)
+            etag = '"' + hashlib.sha1(
+                repr((version, url.path, sorted(params.items()))).encode('utf-8')
+            ).hexdigest() + '"'
+            if _matches(self.headers.get('If-None-Match'), etag):
+                self.send_response(HTTPStatus.NOT_MODIFIED)
+                self.send_header('ETag', etag)
+                self.end_headers()
+                return
+            body = get_body(self.server.service, params).encode('utf-8')
+        except (UnknownFile, ValueError) as e:
+            self._send_error(HTTPStatus.BAD_REQUEST, str(e))
+            return
+        except (OSError, input_.InvalidInputFile, input_.LocationNotFound) as e:
+            self._send_error(HTTPStatus.INTERNAL_SERVER_ERROR, str(e))
+            return
+        except CriticalUserError as e:
+            self._send_error(HTTPStatus.INTERNAL_SERVER_ERROR, e.message)
+            return
+        self._send(HTTPStatus.OK, content_type, body, etag)
+
+    # pollers would fill the terminal
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+    def _send_error(self, status: HTTPStatus, message: str) -> None:
+        self._send(status, _JSON, (json.dumps({'error': message}) + '\n').encode('utf-8'))
+
+    def _send(self, status: HTTPStatus, content_type: str, body: bytes,
+              etag: Optional[str] = None) -> None:
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        if etag is not None:
+            self.send_header('ETag', etag)
+            # always check back, the ETag makes that cheap
+            self.send_header('Cache-Control', 'no-cache')
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def _matches(if_none_match: Optional[str], etag: str) -> bool:
+    if if_none_match is None:
+        return False
+    tags = [tag.strip().removeprefix('W/') for tag in if_none_match.split(',')]
+    return '*' in tags or etag in tags
+
+
+def _get_params(query: str, allowed: set[str]) -> Params:
+    params = {name: values[-1] for name, values in parse_qs(query).items()}
+    unknown = set(params) - allowed
+    if unknown:
+        raise ValueError(f"Unknown parameters: {', '.join(sorted(unknown))}")
+    return params
+
+
+def _get_input(params: Params) -> Optional[Path]:
+    return Path(params['input']) if 'input' in params else None
+
+
+def _get_bool(params: Params, name: str) -> Optional[bool]:
+    if name not in params:
+        return None
+    value = params[name].lower()
+    if value not in ('true', 'false', '1', '0'):
+        raise ValueError(f'{name} must be true or false')
+    return value in ('true', '1')
+
+
+def _get_int(params: Params, name: str) -> Optional[int]:
+    if name not in params:
+        return None
+    try:
+        return int(params[name])
+    except ValueError:
+        raise ValueError(f'{name} must be a whole number')
+
+
+def _get_playlist(service: PlaylistService, params: Params) -> list[PlaylistEntry]:
+    return service.get_playlist(
+        _get_input(params),
+        params.get('filter', ''),
+        get_sort_name(params['sort']) if 'sort' in params else None,
+        _get_bool(params, 'reverse'),
+        _get_int(params, 'limit'))
+
+
+def _get_groups(service: PlaylistService, params: Params) -> str:
+    playlist = service.get_playlist(_get_input(params), sort_name='INTERLEAVE', reverse=False)
+    watched_list = service.get_watched(_get_input(params))
+    return json.dumps(get_group_stats(playlist, watched_list), indent=2) + '\n'
+
+
+def _get_watched(service: PlaylistService, params: Params) -> str:
+    return json.dumps([{'filename': filename, 'group': group}
+                       for filename, group in service.get_watched(_get_input(params))],
+                      indent=2) + '\n'
+
+
+# Groups are in the order their next file comes up. Groups with everything watched only have
+# their name from the watched list, so their location is None
+def get_group_stats(playlist: list[PlaylistEntry],
+                    watched_list: list[FileGroup]) -> list[dict[str, Any]]:
+    stats: dict[str, dict[str, Any]] = {}
+    for entry in playlist:
+        group = stats.get(entry.group.name)
+        if group is None:
+            group = stats[entry.group.name] = {
+                'group': entry.group.name,
+                'location': entry.location.name,
+                'remaining': 0,
+                'watched': 0,
+                'next': entry.filename,
+            }
+        group['remaining'] += 1
+    for _, group_name in watched_list:
+        group = stats.get(group_name)
+        if group is None:
+            group = stats[group_name] = {
+                'group': group_name,
+                'location': None,
+                'remaining': 0,
+                'watched': 0,
+                'next': None,
+            }
+        group['watched'] += 1
+    return list(stats.values())
+
+
+_PLAYLIST_PARAMS = {'input', 'filter', 'sort', 'reverse', 'limit'}
+_ROUTES: dict[str, tuple[set[str], str, Route]] = {
+    '/playlist': (_PLAYLIST_PARAMS, _JSON,
+                  lambda service, params: to_json(_get_playlist(service, params))),
+    '/playlist.m3u': (_PLAYLIST_PARAMS, _M3U,
+                      lambda service, params: to_m3u(_get_playlist(service, params))),
+    '/groups': ({'input'}, _JSON, _get_groups),
+    '/watched': ({'input'}, _JSON, _get_watched),
+}
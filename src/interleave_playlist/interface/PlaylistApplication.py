@@ -23,7 +23,7 @@ from PySide6.QtWidgets import QApplication, QMessageBox
 import interleave_playlist
 from interleave_playlist import SCRIPT_LOC, CriticalUserError
 from interleave_playlist.interface.PlaylistWindow import PlaylistWindow
-from interleave_playlist.persistence.settings import get_dark_mode, validate_settings_file, \
+from interleave_playlist.persistence.settings import get_settings, validate_settings_file, \
     create_settings_file
 from interleave_playlist.persistence.state import create_state_file
 
@@ -38,7 +38,7 @@ class PlaylistApplication(QApplication):
         playlist_window.setWindowTitle(interleave_playlist.APP_NAME_PRETTY)
         playlist_window.resize(800, 600)
         playlist_window.show()
-        if get_dark_mode():
+        if get_settings().dark_mode:
             with open(os.path.join(
                     SCRIPT_LOC,
                     'interface',
@@ -0,0 +1,85 @@
+#    Interleave Playlist
+#    Copyright (C) 2026 Thomas Sweeney
+#    This file is part of Interleave Playlist.
+#    Interleave Playlist is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#    Interleave Playlist is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+import typing
+from time import perf_counter_ns
+
+from PySide6.QtCore import QObject, QRunnable, Signal, SignalInstance
+
+from interleave_playlist.core.cancellation import CancellationToken, Cancelled
+from interleave_playlist.interface import _build_playlist, PLAYLIST_BUILD_ERRORS
+from interleave_playlist.interface.ProgressReporter import ProgressReporter
+from interleave_playlist.persistence.watched import WatchedWriteQueue
+
+
+class PlaylistBuildSignals(QObject):
+    # generation, playlist, how long the build took in ms
+    completed = typing.cast(SignalInstance, Signal(int, list, int))
+    # generation, locations scanned, total locations
+    progress = typing.cast(SignalInstance, Signal(int, int, int))
+    failed = typing.cast(SignalInstance, Signal(int, BaseException))
+    error = typing.cast(SignalInstance, Signal(BaseException))
+    done = typing.cast(SignalInstance, Signal())
+
+
+# Builds a playlist on a thread pool worker so that nothing needs to be spun up per build.
+# Each build is tagged with a generation so that the window can tell whether a result is still
+# the latest one it asked for
+class PlaylistBuildTask(QRunnable):
+
+    def __init__(self, generation: int, search_filter: str, use_cache: bool,
+                 watched_queue: WatchedWriteQueue):
+        super(PlaylistBuildTask, self).__init__()
+        self.generation = generation
+        self.search_filter = search_filter
+        self.use_cache = use_cache
+        self.watched_queue = watched_queue
+        self.cancellation_token = CancellationToken()
+        self.signals = PlaylistBuildSignals()
+        self.progress = ProgressReporter(self._emit_progress)
+
+    def cancel(self) -> None:
+        self.cancellation_token.cancel()
+
+    def run(self) -> None:
+        try:
+            self._run()
+        finally:
+            self.progress.close()
+            self.signals.done.emit()
+
+    def _run(self) -> None:
+        start = perf_counter_ns()
+        # the build reads the watched file, so anything still queued for it has to land first
+        self.watched_queue.flush()
+        try:
+            playlist = _build_playlist(self.search_filter, self.use_cache,
+                                       self.cancellation_token, self._report_progress)
+            self.progress.flush()
+        except Cancelled:
+            return
+        except PLAYLIST_BUILD_ERRORS as e:
+            self.signals.failed.emit(self.generation, e)
+            return
+        except BaseException as e:
+            self.signals.error.emit(e)
+            return
+        if not self.cancellation_token.cancelled:
+            elapsed_ms = (perf_counter_ns() - start) // 1000 // 1000
+            self.signals.completed.emit(self.generation, playlist, elapsed_ms)
+
+    def _report_progress(self, scanned: int, total: int) -> None:
+        self.progress.report((scanned, total))
+
+    def _emit_progress(self, progress: tuple[int, int]) -> None:
+        self.signals.progress.emit(self.generation, *progress)
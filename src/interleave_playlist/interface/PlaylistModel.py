@@ -0,0 +1,242 @@
+#    Interleave Playlist
+#    Copyright (C) 2026 Thomas Sweeney
+#    This file is part of Interleave Playlist.
+#    Interleave Playlist is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#    Interleave Playlist is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+from bisect import bisect_left
+from collections.abc import Callable, Iterable
+from os import path
+from typing import Any, Optional, Union
+
+from PySide6.QtCore import QAbstractListModel, QModelIndex, QPersistentModelIndex, Qt, QObject
+from PySide6.QtGui import QBrush
+
+from interleave_playlist.core.playlist import PlaylistEntry, SortKey
+
+FILENAME_ROLE: int = Qt.ItemDataRole.UserRole
+
+_Index = Union[QModelIndex, QPersistentModelIndex]
+
+# past this many changed stretches of rows a reset is cheaper than moving the rows one by one
+_MAX_UPDATE_CHANGES = 256
+
+
+# Serves the playlist straight out of the list it's given so that no per row objects need to
+# be created. Only the rows on screen ever get asked for their data.
+# Sorting never touches the entries themselves. Each sort is a permutation of the entries that's
+# worked out once per playlist and reversing just reads that permutation back to front
+class PlaylistModel(QAbstractListModel):
+
+    def __init__(self, watched_color: Callable[[], QBrush], parent: Optional[QObject] = None):
+        super().__init__(parent)
+        self._entries: list[PlaylistEntry] = []
+        self._orders: dict[str, list[int]] = {}
+        self._order: list[int] = []
+        self._reversed = False
+        self._watched: set[str] = set()
+        self._watched_color = watched_color
+
+    def rowCount(self, parent: _Index = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._order)
+
+    def data(self, index: _Index, role: int = Qt.ItemDataRole.DisplayRole) -> Any:
+        if not index.isValid() or index.row() >= len(self._order):
+            return None
+        filename = self.entry(index.row()).filename
+        if role == Qt.ItemDataRole.DisplayRole:
+            return path.basename(filename)
+        if role == Qt.ItemDataRole.BackgroundRole:
+            return self._watched_color() if filename in self._watched else None
+        if role == FILENAME_ROLE:
+            return filename
+        return None
+
+    @property
+    def entries(self) -> list[PlaylistEntry]:
+        return [self.entry(row) for row in range(len(self._order))]
+
+    @property
+    def watched(self) -> set[str]:
+        return set(self._watched)
+
+    def entry(self, row: int) -> PlaylistEntry:
+        return self._entries[self._get_entry_index(row)]
+
+    def set_entries(self, entries: list[PlaylistEntry],
+                    sort_name: str, sort_key: SortKey, reverse: bool) -> None:
+        self.beginResetModel()
+        self._entries = entries
+        self._orders = {}
+        self._order = self._get_order(sort_name, sort_key)
+        self._reversed = reverse
+        self._watched.clear()
+        self.endResetModel()
+
+    # Moves over to a rebuilt playlist by only inserting and removing the rows that differ so that
+    # the selection and scroll position survive. While rows are being moved the old and new
+    # entries share one list and the order points into whichever of them each row shows
+    def update_entries(self, entries: list[PlaylistEntry],
+                       sort_name: str, sort_key: SortKey, reverse: bool) -> None:
+        order = _get_sorted(entries, sort_key)
+        new_rows = order[::-1] if reverse else order
+        old_entries = self.entries
+        changes = _get_changes([entry.filename for entry in old_entries],
+                               [entries[i].filename for i in new_rows])
+        if len(changes) > _MAX_UPDATE_CHANGES:
+            watched = self._watched
+            self.set_entries(entries, sort_name, sort_key, reverse)
+            self._watched = watched
+        else:
+            base = len(old_entries)
+            self._entries = old_entries + [entries[i] for i in new_rows]
+            self._order = list(range(base))
+            self._reversed = False
+            # going from the bottom up keeps the rows that are still to be changed where they are
+            for first, last, new_first, new_last in reversed(changes):
+                if last > first:
+                    self.beginRemoveRows(QModelIndex(), first, last - 1)
+                    del self._order[first:last]
+                    self.endRemoveRows()
+                if new_last > new_first:
+                    self.beginInsertRows(QModelIndex(), first, first + new_last - new_first - 1)
+                    self._order[first:first] = range(base + new_first, base + new_last)
+                    self.endInsertRows()
+            self._entries = entries
+            self._orders = {sort_name: order}
+            self._order = order
+            self._reversed = reverse
+        self._watched.intersection_update(entry.filename for entry in entries)
+
+    def sort_by(self, sort_name: str, sort_key: SortKey) -> None:
+        self._set_order(self._get_order(sort_name, sort_key), self._reversed)
+
+    def set_reversed(self, reverse: bool) -> None:
+        self._set_order(self._order, reverse)
+
+    def set_watched(self, rows: Iterable[int], watched: bool) -> None:
+        rows = list(rows)
+        for row in rows:
+            if watched:
+                self._watched.add(self.entry(row).filename)
+            else:
+                self._watched.discard(self.entry(row).filename)
+        for first, last in _get_ranges(rows):
+            self.dataChanged.emit(self.index(first), self.index(last),
+                                  [Qt.ItemDataRole.BackgroundRole])
+
+    def set_watched_filenames(self, filenames: Iterable[str], watched: bool) -> None:
+        if watched:
+            self._watched.update(filenames)
+        else:
+            self._watched.difference_update(filenames)
+        if self._entries:
+            self.dataChanged.emit(self.index(0), self.index(len(self._entries) - 1),
+                                  [Qt.ItemDataRole.BackgroundRole])
+
+    def remove_rows(self, rows: Iterable[int]) -> None:
+        removed: set[int] = set()
+        # going from the bottom up keeps the rows that are still to be removed where they are
+        for first, last in reversed(_get_ranges(rows)):
+            self.beginRemoveRows(QModelIndex(), first, last)
+            positions = range(first, last + 1)
+            if self._reversed:
+                positions = range(len(self._order) - 1 - last, len(self._order) - first)
+            removed.update(self._order[positions.start:positions.stop])
+            del self._order[positions.start:positions.stop]
+            self.endRemoveRows()
+        if not removed:
+            return
+        new_indexes: dict[int, int] = {}
+        kept: list[PlaylistEntry] = []
+        for i, entry in enumerate(self._entries):
+            if i not in removed:
+                new_indexes[i] = len(kept)
+                kept.append(entry)
+        self._entries = kept
+        self._order = [new_indexes[i] for i in self._order]
+        self._orders = {name: [new_indexes[i] for i in order if i not in removed]
+                        for name, order in self._orders.items()}
+
+    def _get_entry_index(self, row: int) -> int:
+        return self._order[-1 - row] if self._reversed else self._order[row]
+
+    def _get_order(self, sort_name: str, sort_key: SortKey) -> list[int]:
+        if sort_name not in self._orders:
+            self._orders[sort_name] = _get_sorted(self._entries, sort_key)
+        return self._orders[sort_name]
+
+    def _set_order(self, order: list[int], reverse: bool) -> None:
+        if order is self._order and reverse == self._reversed:
+            return
+        self.layoutAboutToBeChanged.emit()
+        old_indexes = self.persistentIndexList()
+        entry_indexes = [self._get_entry_index(index.row()) for index in old_indexes]
+        self._order = order
+        self._reversed = reverse
+        last = len(order) - 1
+        rows = [0] * len(order)
+        for position, entry_index in enumerate(order):
+            rows[entry_index] = last - position if reverse else position
+        self.changePersistentIndexList(
+            old_indexes, [self.index(rows[entry_index]) for entry_index in entry_indexes])
+        self.layoutChanged.emit()
+
+
+def _get_sorted(entries: list[PlaylistEntry], sort_key: SortKey) -> list[int]:
+    return (list(range(len(entries)))
+            if sort_key is None else
+            sorted(range(len(entries)), key=lambda i: sort_key(entries[i])))
+
+
+# The stretches of old that have to be replaced by stretches of new, as (first, last, new_first,
+# new_last), keeping the most rows possible where they are. Filenames are unique, so the rows kept
+# are the longest run of old rows whose new positions only go up, which is found in n log n
+def _get_changes(old: list[str], new: list[str]) -> list[tuple[int, int, int, int]]:
+    new_positions = {filename: j for j, filename in enumerate(new)}
+    pairs = [(i, new_positions[filename])
+             for i, filename in enumerate(old) if filename in new_positions]
+    # tails[k] is the pair ending the best run of length k + 1 found so far
+    tails: list[int] = []
+    tail_positions: list[int] = []
+    previous: list[int] = [-1] * len(pairs)
+    for p, (_, j) in enumerate(pairs):
+        k = bisect_left(tail_positions, j)
+        if k > 0:
+            previous[p] = tails[k - 1]
+        if k == len(tails):
+            tails.append(p)
+            tail_positions.append(j)
+        else:
+            tails[k] = p
+            tail_positions[k] = j
+    kept: list[tuple[int, int]] = []
+    p = tails[-1] if tails else -1
+    while p != -1:
+        kept.append(pairs[p])
+        p = previous[p]
+    kept.reverse()
+    changes: list[tuple[int, int, int, int]] = []
+    first = new_first = 0
+    for i, j in kept + [(len(old), len(new))]:
+        if i > first or j > new_first:
+            changes.append((first, i, new_first, j))
+        first, new_first = i + 1, j + 1
+    return changes
+
+
+def _get_ranges(rows: Iterable[int]) -> list[tuple[int, int]]:
+    ranges: list[tuple[int, int]] = []
+    for row in sorted(set(rows)):
+        if ranges and ranges[-1][1] == row - 1:
+            ranges[-1] = (ranges[-1][0], row)
+        else:
+            ranges.append((row, row))
+    return ranges
@@ -1,5 +1,5 @@
 #    Interleave Playlist
-#    Copyright (C) 2021-2025 Thomas Sweeney
+#    Copyright (C) 2021-2026 Thomas Sweeney
 #    This file is part of Interleave Playlist.
 #    Interleave Playlist is free software: you can redistribute it and/or modify
 #    it under the terms of the GNU General Public License as published by
@@ -11,33 +11,34 @@
 #    GNU General Public License for more details.
 #    You should have received a copy of the GNU General Public License
 #    along with this program.  If not, see <http://www.gnu.org/licenses/>.
-import itertools
 import math
 import os
 import subprocess
 import threading
 import typing
 from pathlib import Path
-from typing import Optional, Callable, Any
+from typing import Optional, Callable
 
-import natsort
-from PySide6.QtCore import Slot, QEvent, Qt, Signal, QThread, QDeadlineTimer, SignalInstance
+from PySide6.QtCore import Slot, QEvent, Qt, Signal, QThread, QDeadlineTimer, SignalInstance, \
+    QItemSelection, QThreadPool, QTimer
 from PySide6.QtGui import QFont, QColor, QBrush, QFontDatabase, QCloseEvent
-from PySide6.QtWidgets import QVBoxLayout, QListWidget, QWidget, QAbstractItemView, QHBoxLayout, \
+from PySide6.QtWidgets import QVBoxLayout, QListView, QWidget, QAbstractItemView, QHBoxLayout, \
     QPushButton, QMessageBox, QFileDialog, QLabel, QGridLayout, QProgressBar, QRadioButton, \
     QGroupBox, QCheckBox, QLineEdit, QLayout
 from natsort import natsorted
-from pymediainfo import MediaInfo
-
-from interleave_playlist.core.playlist import PlaylistEntry
-from interleave_playlist.interface import open_with_default_application, _create_playlist, \
-    _get_duration_str
-from interleave_playlist.interface.PlaylistWindowItem import PlaylistWindowItem
-from interleave_playlist.interface.SearchBarThread import SearchBarThread, \
-    SearchBarThreadAlreadyDeadException
-from interleave_playlist.persistence import input_, state, watched
+
+from interleave_playlist.core import probe, runtime
+from interleave_playlist.core.playlist import PlaylistEntry, remove_dropped_groups, SORT_KEYS
+from interleave_playlist.interface import open_with_default_application, \
+    show_playlist_build_error, _get_duration_str, PLAYLIST_BUILD_ERRORS
+from interleave_playlist.interface.PlaylistBuildTask import PlaylistBuildTask
+from interleave_playlist.interface.PlaylistModel import PlaylistModel, FILENAME_ROLE
+from interleave_playlist.interface.ProgressReporter import ProgressReporter, merge_dicts
+from interleave_playlist.persistence import durations, input_, snapshot, state, watched
 from interleave_playlist.persistence import settings
-from interleave_playlist.persistence.watched import add_watched, remove_watched
+from interleave_playlist.persistence.watched import WatchedWriteQueue
+from interleave_playlist.player import mpv
+from interleave_playlist.player.playlist_file import write_playlist_file
 
 _LIGHT_MODE_WATCHED_COLOR = QBrush(QColor.fromRgb(255, 121, 121))
 _DARK_MODE_WATCHED_COLOR = QBrush(QColor.fromRgb(77, 12, 12))
@@ -45,32 +46,42 @@ _TOTAL_SHOWS_TEXT = 'Total Shows:    {}'
 _SELECTED_SHOWS_TEXT = 'Selected Shows: {}'
 _TOTAL_RUNTIME = 'Total Runtime:    {}'
 _SELECTED_RUNTIME = 'Selected Runtime: {}'
+_DURATION_WRITE_BATCH_SIZE = 256
+_MIN_SEARCH_DELAY_MS = 15
+_MAX_SEARCH_DELAY_MS = 500
+_SEARCH_DELAY_FACTOR = 2
+_INITIAL_SEARCH_MS = 100.0
+_SEARCH_MS_SMOOTHING = 0.3
+_PLAYLIST_FILE_MIN_ENTRIES = 100
 
 
 class RuntimeCalculationThread(QThread):
     value_updated = typing.cast(SignalInstance, Signal(int))
-    completed = typing.cast(SignalInstance, Signal(dict, int))
+    durations_updated = typing.cast(SignalInstance, Signal(dict))
+    completed = typing.cast(SignalInstance, Signal())
     error = typing.cast(SignalInstance, Signal(BaseException))
 
-    def __init__(self,
-                 playlist: list[PlaylistEntry],
-                 duration_cache: Optional[dict[str, int]] = None):
+    # only the filenames whose durations aren't known yet are handed over
+    def __init__(self, filenames: list[str]):
         super(RuntimeCalculationThread, self).__init__()
-        if duration_cache is None:
-            duration_cache = {}
         self.running: bool = False
         self.stop: bool = False
-        self.playlist: list[PlaylistEntry] = playlist.copy()
-        self.duration_cache: dict[str, int] = ({}
-                                               if duration_cache is None else
-                                               duration_cache.copy())
-        self.pending_playlist: Optional[list[PlaylistEntry]] = None
+        self.filenames: list[str] = filenames
+        self.resolved: set[str] = set()
+        self.pending_filenames: Optional[list[str]] = None
+        self.probe_queue = runtime.ProbeQueue()
+        # the queue only boosts files it already has, so this is applied again once they're put
+        self.prioritized: list[str] = []
 
     def __del__(self) -> None:
         self.wait()
 
-    def set_pending_playlist(self, playlist: list[PlaylistEntry]) -> None:
-        self.pending_playlist = playlist.copy()
+    def set_pending_filenames(self, filenames: list[str]) -> None:
+        self.pending_filenames = filenames
+
+    def prioritize(self, filenames: list[str]) -> None:
+        self.prioritized = filenames
+        self.probe_queue.prioritize(filenames)
 
     def run(self) -> None:
         self.running = True
@@ -83,47 +94,78 @@ class RuntimeCalculationThread(QThread):
 
     def _run(self) -> None:
         while True:
-            total_duration = 0
-            for i, elem in enumerate(item.filename for item in self.playlist):
-                if self.stop:
-                    return
-                if elem not in self.duration_cache:
-                    duration: int = 0
-                    if os.path.isfile(elem):
-                        media_info = MediaInfo.parse(elem)
-                        if len(media_info.video_tracks) > 0 \
-                                and media_info.video_tracks[0].duration:
-                            duration = int(float(media_info.video_tracks[0].duration))
-                        elif len(media_info.audio_tracks) > 0 \
-                                and media_info.audio_tracks[0].duration:
-                            duration = int(float(media_info.audio_tracks[0].duration))
-                        else:
-                            print(f'Warning: {elem} has no duration info for video or audio')
-                            duration = 0
-                    self.duration_cache[elem] = duration
-                    self.value_updated.emit(i+1)
-                total_duration += self.duration_cache[elem]
-            if not self.pending_playlist:
+            file_keys: dict[str, Optional[durations.FileKey]] = {
+                filename: durations.get_file_key(filename)
+                for filename in self.filenames
+                if filename not in self.resolved
+            }
+            known_durations = durations.get_durations(
+                {k: v for k, v in file_keys.items() if v is not None})
+            to_probe: dict[str, durations.FileKey] = {}
+            for filename, file_key in file_keys.items():
+                if file_key is None:
+                    known_durations[filename] = 0
+                elif filename not in known_durations:
+                    to_probe[filename] = file_key
+                    self.probe_queue.put(filename, file_key[0])
+            self.probe_queue.prioritize(self.prioritized)
+            self.resolved.update(known_durations)
+            self.durations_updated.emit(known_durations)
+            known = len(self.filenames) - len(to_probe)
+            self.value_updated.emit(known)
+            progress = ProgressReporter(self.value_updated.emit)
+            updates = ProgressReporter(self.durations_updated.emit, merge_dicts)
+            settings_ = settings.get_settings()
+            probed: list[tuple[str, durations.FileKey, int]] = []
+            try:
+                for filename, duration in runtime.probe_durations(
+                        self.probe_queue,
+                        probe.get_duration,
+                        settings_.runtime_probe_workers,
+                        settings_.runtime_probe_workers_per_device,
+                        lambda: self.stop):
+                    self.resolved.add(filename)
+                    updates.report({filename: duration})
+                    probed.append((filename, to_probe[filename], duration))
+                    if len(probed) >= _DURATION_WRITE_BATCH_SIZE:
+                        durations.set_durations(probed)
+                        probed = []
+                    known += 1
+                    progress.report(known)
+            finally:
+                updates.flush()
+                progress.flush()
+                updates.close()
+                progress.close()
+                durations.set_durations(probed)
+            if self.stop:
+                return
+            if self.pending_filenames is None:
                 break
-            self.playlist = self.pending_playlist
-            self.pending_playlist = None
-        self.completed.emit(self.duration_cache, total_duration)
+            self.filenames = self.pending_filenames
+            self.pending_filenames = None
+        self.completed.emit()
 
 
 class PlaylistWindow(QWidget):
+    watched_write_failed = typing.cast(SignalInstance, Signal(list, BaseException))
+    player_finished = typing.cast(SignalInstance, Signal(str))
+    player_failed = typing.cast(SignalInstance, Signal(BaseException))
+
     def __init__(self) -> None:
         super().__init__()
         self._warned_about_mediainfo_missing = False
         self.selection_dependent_buttons: list[QPushButton] = []
-        self._row_color1, self._row_color2 = self._get_standard_row_colors()
-        self.duration_cache: dict[str, int] = {}
+        self.runtimes = runtime.RuntimeAggregator()
         self.durations_loaded = False
-        counter = itertools.count()
-        self.sort: Callable[[Any], Any] = lambda x: next(counter)
+        self.sort_name = 'INTERLEAVE'
 
-        self.search_bar_thread = None
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.timeout.connect(self.search_timer_timeout)
+        self._search_ms: float = _INITIAL_SEARCH_MS
         label_font = QFontDatabase.systemFont(QFontDatabase.FixedFont)
-        label_font.setPointSize(int(settings.get_font_size() * 1.25))
+        label_font.setPointSize(int(settings.get_settings().font_size * 1.25))
         self.total_shows_label = QLabel()
         self.total_shows_label.setFont(label_font)
 
@@ -131,20 +173,46 @@ class PlaylistWindow(QWidget):
         self.total_selected_label.setFont(label_font)
 
         self.playlist: list[PlaylistEntry] = []
-        self.item_list: QListWidget = self._create_item_list()
+        self.playlist_model = PlaylistModel(self._get_watched_color, self)
+        self.item_list: QListView = self._create_item_list()
 
         self.total_runtime_label = QLabel(_TOTAL_RUNTIME.format('...'))
         self.total_runtime_label.setFont(label_font)
         self.total_runtime_progress = QProgressBar()
         self.total_runtime_progress.setMaximum(len(self.playlist))
         self.total_runtime_progress.hide()
+        # how far the latest build has got through scanning the locations
+        self.build_progress = QProgressBar()
+        self.build_progress.setFormat('Scanning %v/%m')
+        self.build_progress.hide()
 
         self.selected_runtime_label = QLabel(_SELECTED_RUNTIME.format('...'))
         self.selected_runtime_label.setFont(label_font)
         self.item_list.selectAll()
 
         self.runtime_thread = None
-        self.total_duration: int = 0
+        # rows are recoloured as soon as they're marked and the watched file catches up in the
+        # background. Failed writes come back through a signal so they're undone on the GUI thread
+        self.watched_write_failed.connect(self.watched_write_failed_slot)
+        self.watched_queue = WatchedWriteQueue(self.watched_write_failed.emit)
+        # mpv is reused over its IPC socket, and tells us when something has been played to the end
+        self.player: Optional[mpv.MpvPlayer] = None
+        self._played: dict[str, PlaylistEntry] = {}
+        self.player_finished.connect(self.player_finished_slot)
+        self.player_failed.connect(self.player_failed_slot)
+        self._build_generation = 0
+        self._build_tasks: list[PlaylistBuildTask] = []
+        self._build_use_cache = False
+        # one worker so that builds never race each other over the playlist caches. A cancelled
+        # build gives up at its next stage so whatever is queued behind it doesn't wait long
+        self.build_pool = QThreadPool(self)
+        self.build_pool.setMaxThreadCount(1)
+        self._select_all_after_build = False
+        self._focus_search_bar_after_build = False
+        # while the last session's playlist is on screen the first build is applied as a diff
+        # against it, and the durations it came with still need checking against the files
+        self._showing_snapshot = False
+        self._unverified_durations: set[str] = set()
 
         search_label = QLabel("Search ")
         self.search_bar = QLineEdit()
@@ -168,8 +236,8 @@ class PlaylistWindow(QWidget):
         self.reversed_checkbox.toggled.connect(self.reverse_sort)
         self.reversed_checkbox.setToolTip('Ctrl+Shift+R')
 
-        self._enable_sort(settings.get_default_sort_name(),
-                          settings.get_default_sort_reversed())
+        self._enable_sort(settings.get_settings().default_sort_name,
+                          settings.get_settings().default_sort_reversed)
 
         total_layout = QVBoxLayout()
         stats_group = QGroupBox("Stats")
@@ -200,23 +268,27 @@ class PlaylistWindow(QWidget):
         list_layout.addWidget(self.item_list)
 
         layout = QVBoxLayout(self)
+        layout.addWidget(self.build_progress)
         layout.addWidget(self.total_runtime_progress)
         layout.addLayout(label_layout)
         layout.addLayout(self._create_button_layout())
         layout.addLayout(list_layout)
 
-        self._refresh()
-        self.item_list.selectAll()
+        self._show_snapshot()
+        self._refresh(select_all=True)
 
-    def _create_item_list(self) -> QListWidget:
-        item_list = QListWidget()
+    def _create_item_list(self) -> QListView:
+        item_list = QListView()
+        item_list.setModel(self.playlist_model)
         item_list.setSelectionMode(QAbstractItemView.ExtendedSelection)
         item_list.setAlternatingRowColors(True)
+        item_list.setUniformItemSizes(True)
         font = QFont()
-        font.setPointSize(settings.get_font_size())
+        font.setPointSize(settings.get_settings().font_size)
         item_list.setFont(font)
         item_list.doubleClicked.connect(self.play)
-        item_list.itemSelectionChanged.connect(self.selection_change)
+        item_list.selectionModel().selectionChanged.connect(self.selection_change)
+        item_list.verticalScrollBar().valueChanged.connect(self.item_list_scrolled)
         item_list.installEventFilter(self)
         return item_list
 
@@ -224,6 +296,7 @@ class PlaylistWindow(QWidget):
         button_layout = QHBoxLayout()
         buttons = [
             ('Play', self.play, 'Enter', True),
+            ('Enqueue', self.enqueue, 'Shift-Enter', True),
             ('Mark Watched', self.mark_watched, 'Ctrl-W', True),
             ('Unmark Watched', self.unmark_watched, 'Ctrl-U', True),
             ('Drop Shows', self.drop_groups, 'Ctrl-Shift-D', True),
@@ -238,15 +311,24 @@ class PlaylistWindow(QWidget):
                 button.setToolTip(tooltip)
             if selection_dependent:
                 self.selection_dependent_buttons.append(button)
+            if name == 'Enqueue':
+                self.enqueue_button = button
             button_layout.addWidget(button)
+        self._refresh_enqueue_button()
         return button_layout
 
+    # only mpv can be added to while it's playing, anything else would just be played again
+    def _refresh_enqueue_button(self) -> None:
+        self.enqueue_button.setVisible(mpv.is_mpv(settings.get_settings().play_command))
+
     @typing.no_type_check
     def eventFilter(self, widget: QWidget, event: QEvent) -> bool:
         if event.type() == QEvent.KeyPress:
             switch: dict[int, Callable] = {
                 Qt.NoModifier | Qt.Key_Return: self._play,
                 Qt.NoModifier | Qt.Key_Enter: self._play,
+                Qt.ShiftModifier | Qt.Key_Return: self._enqueue,
+                Qt.ShiftModifier | Qt.Key_Enter: self._enqueue,
                 Qt.ControlModifier | Qt.Key_W: self.mark_watched,
                 Qt.ControlModifier | Qt.Key_U: self.unmark_watched,
                 Qt.NoModifier | Qt.Key_F5: self.refresh,
@@ -269,48 +351,99 @@ class PlaylistWindow(QWidget):
         self._play()
         self.item_list.setFocus()
 
-    def _play(self) -> None:
+    @Slot()
+    def enqueue(self) -> None:
+        self._enqueue()
+        self.item_list.setFocus()
+
+    def _enqueue(self) -> None:
+        if mpv.is_mpv(settings.get_settings().play_command):
+            self._play(append=True)
+
+    def _play(self, append: bool = False) -> None:
+        entries = self._get_selected_entries()
+        files = [entry.filename for entry in entries]
+        play_command = settings.get_settings().play_command
+        player = None
+        if mpv.is_mpv(play_command):
+            if self.player is None or self.player.command != play_command:
+                if self.player is not None:
+                    self.player.close()
+                self.player = mpv.MpvPlayer(play_command, self.player_finished.emit)
+            player = self.player
+            self._played.update((entry.filename, entry) for entry in entries)
+
         def _impl() -> None:
-            files = [i.getValue().filename
-                     for i
-                     in typing.cast(list[PlaylistWindowItem], self.item_list.selectedItems())]
-            subprocess.run([settings.get_play_command()] + files)
+            try:
+                _play_entries()
+            except (mpv.MpvError, OSError) as e:
+                self.player_failed.emit(e)
+
+        def _play_entries() -> None:
+            if len(entries) < _PLAYLIST_FILE_MIN_ENTRIES:
+                if player is not None:
+                    player.play(files, append)
+                else:
+                    subprocess.run([play_command] + files)
+                return
+            playlist_file = write_playlist_file(entries)
+            if player is not None:
+                try:
+                    player.play_playlist_file(playlist_file, append)
+                finally:
+                    os.remove(playlist_file)
+            else:
+                subprocess.run([play_command, str(playlist_file)])
         if self.playlist is not None:
             thread = threading.Thread(target=_impl)
             thread.start()
 
+    @Slot(str)
+    def player_finished_slot(self, filename: str) -> None:
+        entry = self._played.get(filename)
+        if entry is None or filename in self.playlist_model.watched:
+            return
+        self.playlist_model.set_watched_filenames([filename], True)
+        self.watched_queue.submit([entry], True)
+
+    @Slot(BaseException)
+    def player_failed_slot(self, e: BaseException) -> None:
+        msg_box = QMessageBox()
+        msg_box.setWindowTitle('Error')
+        msg_box.setText('Could not play the selected files')
+        msg_box.setInformativeText(str(e))
+        msg_box.setIcon(QMessageBox.Icon.Critical)
+        msg_box.exec()
+
     @Slot()
     def mark_watched(self) -> None:
-        selected_values: list[PlaylistEntry] = [
-            i.getValue()
-            for i
-            in typing.cast(list[PlaylistWindowItem], self.item_list.selectedItems())
-        ]
-        add_watched(selected_values)
-        for item in self.item_list.selectedItems():
-            item.setBackground(self._get_watched_color())
+        rows = self._get_selected_rows()
+        self.playlist_model.set_watched(rows, True)
+        self.watched_queue.submit([self.playlist_model.entry(row) for row in rows], True)
         self.item_list.setFocus()
 
     @Slot()
     def unmark_watched(self) -> None:
-        selected_values: list[PlaylistEntry] = [
-            i.getValue()
-            for i
-            in typing.cast(list[PlaylistWindowItem], self.item_list.selectedItems())
-        ]
-        remove_watched(selected_values)
-        for i, item in enumerate(self.item_list.selectedItems()):
-            color = self._row_color1 if i % 2 == 0 else self._row_color2
-            item.setBackground(color)
+        rows = self._get_selected_rows()
+        self.playlist_model.set_watched(rows, False)
+        self.watched_queue.submit([self.playlist_model.entry(row) for row in rows], False)
         self.item_list.setFocus()
 
+    @Slot(list, BaseException)
+    def watched_write_failed_slot(self, changes: list[tuple[PlaylistEntry, bool]],
+                                  e: BaseException) -> None:
+        for entry, watched_ in reversed(changes):
+            self.playlist_model.set_watched_filenames([entry.filename], not watched_)
+        msg_box = QMessageBox()
+        msg_box.setWindowTitle('Error')
+        msg_box.setText('Could not save watched changes, they have been undone')
+        msg_box.setInformativeText(str(e))
+        msg_box.setIcon(QMessageBox.Icon.Critical)
+        msg_box.exec()
+
     @Slot()
     def drop_groups(self) -> None:
-        selected_entries: list[PlaylistEntry] = [
-            i.getValue()
-            for i
-            in typing.cast(list[PlaylistWindowItem], self.item_list.selectedItems())
-        ]
+        selected_entries = self._get_selected_entries()
         if len(selected_entries) == 0:
             return
         groups_str = set()
@@ -326,32 +459,157 @@ class PlaylistWindow(QWidget):
         reply = msg_box.exec()
         if reply == QMessageBox.Ok:
             input_.drop_groups(selected_entries)
+            self._remove_dropped_groups(selected_entries)
         self.item_list.setFocus()
 
+    def _remove_dropped_groups(self, dropped: list[PlaylistEntry]) -> None:
+        kept = remove_dropped_groups(self.playlist, dropped)
+        if len(kept) == len(self.playlist):
+            return
+        kept_ids = {id(entry) for entry in kept}
+        self.playlist_model.remove_rows(
+            row for row, entry in enumerate(self.playlist_model.entries)
+            if id(entry) not in kept_ids)
+        self.runtimes.remove(entry.filename for entry in self.playlist
+                             if id(entry) not in kept_ids)
+        self.playlist = kept
+        self.total_shows_label.setText(_TOTAL_SHOWS_TEXT.format(len(self.playlist)))
+        self._run_calculate_total_runtime_thread()
+        self._refresh_buttons()
+
     @Slot()
     def refresh(self) -> None:
+        self._refresh_enqueue_button()
         self._refresh()
 
     def _refresh_sort(self) -> None:
-        self.item_list.clear()
-        if self.playlist is not None:
-            for item in sorted(self.playlist,
-                               key=self.sort,
-                               reverse=self.reversed_checkbox.isChecked()):
-                self.item_list.addItem(
-                    PlaylistWindowItem(value=item)
-                )
-
-    def _refresh(self, *, use_cache: bool = False) -> None:
-        self.playlist = _create_playlist(self.search_bar.text(), use_cache)
+        # resetting the model drops the selection without telling the selection model's listeners
+        self.playlist_model.set_entries(self.playlist,
+                                        self.sort_name,
+                                        SORT_KEYS[self.sort_name],
+                                        self.reversed_checkbox.isChecked())
+        self.runtimes.clear_selection()
+        self._selection_change()
+
+    # Only the most recently requested build ever gets applied. Anything still in flight when a new
+    # one is asked for is cancelled and whatever it comes back with is thrown away
+    def _refresh(self, *, use_cache: bool = False, select_all: bool = False,
+                 focus_search_bar: bool = False) -> None:
+        self.search_timer.stop()
+        self._cancel_builds()
+        self._build_generation += 1
+        self._build_use_cache = use_cache
+        self._select_all_after_build = select_all
+        self._focus_search_bar_after_build = focus_search_bar
+        build_task = PlaylistBuildTask(self._build_generation, self.search_bar.text(), use_cache,
+                                       self.watched_queue)
+        build_task.signals.completed.connect(self.playlist_build_completed)
+        build_task.signals.progress.connect(self.playlist_build_progress)
+        build_task.signals.failed.connect(self.playlist_build_failed)
+        build_task.signals.error.connect(self.playlist_build_error)
+        build_task.signals.done.connect(self._remove_finished_builds)
+        self._build_tasks.append(build_task)
+        self.build_pool.start(build_task)
+
+    @Slot()
+    def playlist_build_completed(self, generation: int, playlist: list[PlaylistEntry],
+                                 elapsed_ms: int) -> None:
+        if generation != self._build_generation:
+            return
+        self.build_progress.hide()
+        if self._build_use_cache:
+            self._search_ms += (elapsed_ms - self._search_ms) * _SEARCH_MS_SMOOTHING
+        self._apply_playlist(playlist)
+
+    @Slot()
+    def playlist_build_failed(self, generation: int, exception: BaseException) -> None:
+        if generation != self._build_generation:
+            return
+        self.build_progress.hide()
+        show_playlist_build_error(exception)
+        self._apply_playlist([])
+
+    @Slot()
+    def playlist_build_progress(self, generation: int, scanned: int, total: int) -> None:
+        if generation != self._build_generation:
+            return
+        self.build_progress.setMaximum(total)
+        self.build_progress.setValue(scanned)
+        self.build_progress.show()
+
+    @Slot()
+    def playlist_build_error(self, exception: BaseException) -> None:
+        raise exception
+
+    @Slot()
+    def _remove_finished_builds(self) -> None:
+        self._build_tasks.pop(0)
+
+    def _cancel_builds(self) -> None:
+        for build_task in self._build_tasks:
+            build_task.cancel()
+
+    def _show_snapshot(self) -> None:
+        try:
+            snapshot_ = snapshot.get_snapshot(input_.get_locations())
+        except PLAYLIST_BUILD_ERRORS:
+            # the build will run into the same problem and report it
+            return
+        if snapshot_ is None:
+            return
+        self._showing_snapshot = True
+        self._unverified_durations = set(snapshot_.durations)
+        self.playlist = snapshot_.entries
+        self.runtimes.reset(entry.filename for entry in self.playlist)
+        self.runtimes.set_durations(snapshot_.durations)
+        self._refresh_sort()
+        self.playlist_model.set_watched_filenames(snapshot_.watched, True)
+        self.total_shows_label.setText(_TOTAL_SHOWS_TEXT.format(len(self.playlist)))
+        if self.playlist_model.rowCount() > 0:
+            self.item_list.setCurrentIndex(self.playlist_model.index(0))
+        self.item_list.selectAll()
+        self._update_runtime_labels()
+        self._refresh_buttons()
+
+    def _reconcile_snapshot(self, playlist: list[PlaylistEntry]) -> None:
+        self._showing_snapshot = False
+        all_selected = self.runtimes.selected_count == len(self.playlist)
+        self.playlist = playlist
+        self.playlist_model.update_entries(self.playlist,
+                                           self.sort_name,
+                                           SORT_KEYS[self.sort_name],
+                                           self.reversed_checkbox.isChecked())
+        self.runtimes.reset(entry.filename for entry in self.playlist)
+        self.runtimes.select(self._get_selected_filenames())
+        if all_selected:
+            self.item_list.selectAll()
+        self._selection_change()
+        self.total_shows_label.setText(_TOTAL_SHOWS_TEXT.format(len(self.playlist)))
+        self.durations_loaded = False
+        if not self.item_list.currentIndex().isValid() and self.playlist_model.rowCount() > 0:
+            self.item_list.setCurrentIndex(self.playlist_model.index(0))
+        self._run_calculate_total_runtime_thread()
+        self._refresh_buttons()
+
+    def _apply_playlist(self, playlist: list[PlaylistEntry]) -> None:
+        if self._showing_snapshot:
+            self._reconcile_snapshot(playlist)
+            return
+        self.playlist = playlist
+        self.runtimes.reset(entry.filename for entry in self.playlist)
         self._refresh_sort()
         self.total_shows_label.setText(_TOTAL_SHOWS_TEXT.format(len(self.playlist)))
         self.durations_loaded = False
-        if self.item_list.count() > 0:
-            self.item_list.setCurrentItem(self.item_list.item(0))
+        if self.playlist_model.rowCount() > 0:
+            self.item_list.setCurrentIndex(self.playlist_model.index(0))
         self._run_calculate_total_runtime_thread()
+        if self._select_all_after_build:
+            self.item_list.selectAll()
         self._refresh_buttons()
-        self.item_list.setFocus()
+        if self._focus_search_bar_after_build:
+            self.search_bar.setFocus()
+        else:
+            self.item_list.setFocus()
 
     @Slot()
     def open_input(self) -> None:
@@ -365,6 +623,8 @@ class PlaylistWindow(QWidget):
                 self, 'Open yaml', open_dir, 'yaml files (*.yml *.yaml)')[0]
             if file_name.strip() == '':
                 return
+            # marks still queued belong to the input that's being closed
+            self.watched_queue.flush()
             try:
                 state.set_last_input_file(Path(file_name))
             except input_.InvalidInputFile:
@@ -388,76 +648,72 @@ class PlaylistWindow(QWidget):
         self.item_list.setFocus()
 
     @Slot()
-    def selection_change(self) -> None:
-        self._selection_change(len(self.item_list.selectedItems()))
+    def selection_change(self, selected: QItemSelection, deselected: QItemSelection) -> None:
+        self.runtimes.deselect(self._get_filenames(deselected))
+        selected_filenames = self._get_filenames(selected)
+        self.runtimes.select(selected_filenames)
+        self._selection_change()
+        self._prioritize_runtimes(selected_filenames)
+
+    @Slot()
+    def item_list_scrolled(self, value: int) -> None:
+        self._prioritize_runtimes(self._get_visible_filenames())
 
     @Slot()
     def update_total_runtime_progress_bar(self, value: int) -> None:
         if self.runtime_thread is None:
             return
-        self.total_runtime_progress.setMaximum(len(self.runtime_thread.playlist))
+        self.total_runtime_progress.setMaximum(len(self.runtime_thread.filenames))
         self.total_runtime_progress.setValue(value)
 
     @Slot()
-    def total_runtime_thread_completed(self, duration_cache: dict[str, int],
-                                       total_duration: int) -> None:
-        self.duration_cache = duration_cache
-        self.total_duration = total_duration
-        self.total_runtime_label.setText(
-            _TOTAL_RUNTIME.format(_get_duration_str(total_duration, total_duration)))
+    def runtime_durations_updated(self, updated: dict[str, int]) -> None:
+        selected_missing = self.runtimes.selected_missing
+        self.runtimes.set_durations(updated)
+        if selected_missing and not self.runtimes.selected_missing:
+            self._get_selected_runtime()
+
+    @Slot()
+    def total_runtime_thread_completed(self) -> None:
         self.durations_loaded = True
-        self._get_selected_runtime()
+        self._update_runtime_labels()
         self.total_runtime_progress.hide()
 
     @Slot()
     def total_runtime_thread_error(self, exception: BaseException) -> None:
         raise exception
 
-    @Slot()
-    def search_bar_thread_error(self, exception: BaseException) -> None:
-        raise exception
-
     @Slot()
     def interleave_sort(self, checked: bool) -> None:
-        if not checked:
-            return
-        counter = itertools.count()
-        self.sort = lambda x: next(counter)
-        self._refresh_sort()
-        self.item_list.setFocus()
+        self._sort(checked, 'INTERLEAVE')
 
     @Slot()
     def alphabetical_sort(self, checked: bool) -> None:
-        if not checked:
-            return
-        self.sort = natsort.natsort_keygen(
-            lambda i: os.path.basename(i.filename))
-        self._refresh_sort()
-        self.item_list.setFocus()
+        self._sort(checked, 'ALPHABETICAL')
 
     @Slot()
     def last_modified_sort(self, checked: bool) -> None:
-        if not checked:
-            return
-        self.sort = lambda x: os.path.getmtime(x.filename)
-        self._refresh_sort()
-        self.item_list.setFocus()
+        self._sort(checked, 'LAST MODIFIED')
 
     @Slot()
     def reverse_sort(self, checked: bool) -> None:
-        self._refresh_sort()
+        self.playlist_model.set_reversed(checked)
+        self.item_list.setFocus()
+
+    def _sort(self, checked: bool, sort_name: str) -> None:
+        if not checked:
+            return
+        self.sort_name = sort_name
+        self.playlist_model.sort_by(sort_name, SORT_KEYS[sort_name])
         self.item_list.setFocus()
 
     @Slot()
     def search_bar_text_edited(self, text: str) -> None:
-        if self.search_bar_thread is None:
-            self._init_search_bar_thread(text)
-            return
-        try:
-            self.search_bar_thread.search_value = text
-            return
-        except SearchBarThreadAlreadyDeadException:
-            self._init_search_bar_thread(text)
+        # wait for typing to stop for about as long as a search has recently been taking, so a
+        # fast library updates as you type while a slow one isn't asked to search every keystroke
+        self.search_timer.start(min(_MAX_SEARCH_DELAY_MS,
+                                    max(_MIN_SEARCH_DELAY_MS,
+                                        int(self._search_ms * _SEARCH_DELAY_FACTOR))))
 
     @Slot()
     def search_bar_editing_finished(self) -> None:
@@ -465,21 +721,16 @@ class PlaylistWindow(QWidget):
         # we don't want focus back here. we're finished
 
     @Slot()
-    def search_bar_thread_completed(self, text: str) -> None:
-        self._refresh(use_cache=True)
+    def search_timer_timeout(self) -> None:
+        self._refresh(use_cache=True, focus_search_bar=True)
         self.search_bar.setFocus()
 
-    def _init_search_bar_thread(self, text: str) -> None:
-        self.search_bar_thread = SearchBarThread(text, 500)
-        self.search_bar_thread.error.connect(self.search_bar_thread_error)
-        self.search_bar_thread.completed.connect(self.search_bar_thread_completed)
-        self.search_bar_thread.start()
-
     def _focus_search_bar(self) -> None:
         self.search_bar.setFocus()
         self.search_bar.selectAll()
 
-    def _selection_change(self, num_selected: int) -> None:
+    def _selection_change(self) -> None:
+        num_selected = self.runtimes.selected_count
         self.total_selected_label.setText(
             _SELECTED_SHOWS_TEXT.format(
                 str(num_selected).rjust(math.ceil(
@@ -492,55 +743,99 @@ class PlaylistWindow(QWidget):
             btn.setEnabled(num_selected > 0)
 
     def _get_selected_runtime(self) -> None:
-        if not self.durations_loaded:
+        if self.runtimes.selected_missing:
+            self.selected_runtime_label.setText(_SELECTED_RUNTIME.format('...'))
             return
-        self.selected_runtime_label.setText(_SELECTED_RUNTIME.format('...'))
-        duration = sum([self.duration_cache[i.getValue().filename]
-                        for i
-                        in typing.cast(list[PlaylistWindowItem], self.item_list.selectedItems())])
-        self.selected_runtime_label.setText(
-            _SELECTED_RUNTIME.format(_get_duration_str(duration, self.total_duration)))
+        duration = self.runtimes.selected
+        self.selected_runtime_label.setText(_SELECTED_RUNTIME.format(_get_duration_str(
+            duration, self.runtimes.total if self.durations_loaded else duration)))
+
+    def _update_runtime_labels(self) -> None:
+        if self.runtimes.total_missing:
+            self.total_runtime_label.setText(_TOTAL_RUNTIME.format('...'))
+        else:
+            total = self.runtimes.total
+            self.total_runtime_label.setText(
+                _TOTAL_RUNTIME.format(_get_duration_str(total, total)))
+        self._get_selected_runtime()
 
     @staticmethod
-    def _get_standard_row_colors() -> tuple[QBrush, QBrush]:
-        # wow this is silly
-        _hidden_list = QListWidget()
-        _hidden_list.setAlternatingRowColors(True)
-        _hidden_list.addItems(["", ""])
-        color1 = _hidden_list.item(0).background()
-        color2 = _hidden_list.item(1).background()
-        return color1, color2
+    def _get_filenames(selection: QItemSelection) -> list[str]:
+        filenames = (index.data(FILENAME_ROLE) for index in selection.indexes())
+        return [filename for filename in filenames if filename is not None]
+
+    def _get_selected_rows(self) -> list[int]:
+        return sorted(index.row() for index in self.item_list.selectionModel().selectedRows())
+
+    def _get_selected_entries(self) -> list[PlaylistEntry]:
+        return [self.playlist_model.entry(row) for row in self._get_selected_rows()]
+
+    def _get_selected_filenames(self) -> list[str]:
+        return [entry.filename for entry in self._get_selected_entries()]
+
+    def _get_visible_filenames(self) -> list[str]:
+        viewport = self.item_list.viewport().rect()
+        first = self.item_list.indexAt(viewport.topLeft()).row()
+        if first < 0:
+            return []
+        last = self.item_list.indexAt(viewport.bottomLeft()).row()
+        if last < 0:
+            last = self.playlist_model.rowCount() - 1
+        return [self.playlist_model.entry(row).filename for row in range(first, last + 1)]
+
+    def _prioritize_runtimes(self, filenames: list[str]) -> None:
+        if self.runtime_thread is not None and not self.durations_loaded and filenames:
+            self.runtime_thread.prioritize(filenames)
 
     @staticmethod
     def _get_watched_color() -> QBrush:
         return (_LIGHT_MODE_WATCHED_COLOR
-                if not settings.get_dark_mode() else
+                if not settings.get_settings().dark_mode else
                 _DARK_MODE_WATCHED_COLOR)
 
     def closeEvent(self, event: QCloseEvent) -> None:
+        self._cancel_builds()
+        self.build_pool.waitForDone()
+        self.watched_queue.flush()
+        if self.player is not None:
+            self.player.close()
         self._stop_runtime_thread()
+        # a filtered playlist isn't what the next launch should open with
+        if not self._showing_snapshot and not self.search_bar.text():
+            snapshot.set_snapshot(snapshot.Snapshot(self.playlist,
+                                                    self.playlist_model.watched,
+                                                    self.runtimes.get_durations()))
 
     def _run_calculate_total_runtime_thread(self) -> None:
         self.selected_runtime_label.setText(_SELECTED_RUNTIME.format('...'))
         self.durations_loaded = False
-        if not MediaInfo.can_parse():
-            if not self._warned_about_mediainfo_missing:
-                self._warned_about_mediainfo_missing = True
-                msg_box = QMessageBox()
-                msg_box.setWindowTitle('Warning')
-                msg_box.setText("libmediainfo not found. Will be unable to calculate "
-                                "runtimes unless installed")
-                msg_box.setIcon(QMessageBox.Icon.Warning)
-                msg_box.exec()
-            return
+        if not probe.media_info_available() and not self._warned_about_mediainfo_missing:
+            self._warned_about_mediainfo_missing = True
+            msg_box = QMessageBox()
+            msg_box.setWindowTitle('Warning')
+            msg_box.setText("libmediainfo not found. Will be unable to calculate runtimes "
+                            "of files other than Matroska and MP4 unless installed")
+            msg_box.setIcon(QMessageBox.Icon.Warning)
+            msg_box.exec()
+        missing = self.runtimes.get_missing()
+        if self._unverified_durations and not self._showing_snapshot:
+            unverified = self._unverified_durations.intersection(self.runtimes.get_durations())
+            self._unverified_durations -= unverified
+            missing.extend(unverified)
         if self.runtime_thread is not None and not self.runtime_thread.isFinished():
-            self.runtime_thread.set_pending_playlist(self.playlist)
+            self.runtime_thread.set_pending_filenames(missing)
+            return
+        if not missing:
+            self.total_runtime_thread_completed()
             return
         self.total_runtime_progress.setValue(0)
         self.total_runtime_progress.show()
         self.total_runtime_label.setText(_TOTAL_RUNTIME.format('...'))
-        self.runtime_thread = RuntimeCalculationThread(self.playlist, self.duration_cache)
+        self.runtime_thread = RuntimeCalculationThread(missing)
+        self._prioritize_runtimes(self._get_selected_filenames())
+        self._prioritize_runtimes(self._get_visible_filenames())
         self.runtime_thread.value_updated.connect(self.update_total_runtime_progress_bar)
+        self.runtime_thread.durations_updated.connect(self.runtime_durations_updated)
         self.runtime_thread.completed.connect(self.total_runtime_thread_completed)
         self.runtime_thread.error.connect(self.total_runtime_thread_error)
         self.runtime_thread.start()
@@ -553,11 +848,10 @@ class PlaylistWindow(QWidget):
         self.runtime_thread.wait(QDeadlineTimer(10 * 1000))
         self.runtime_thread = None
         self.durations_loaded = False
-        self.duration_cache = {}
 
     def _refresh_buttons(self) -> None:
         for button in self.selection_dependent_buttons:
-            button.setEnabled(len(self.item_list.selectedItems()) > 0)
+            button.setEnabled(self.item_list.selectionModel().hasSelection())
 
     def _enable_sort(self, sort_name: str, reverse_sort: bool) -> None:
         if sort_name == 'INTERLEAVE':
@@ -0,0 +1,122 @@
+#    Interleave Playlist
+#    Copyright (C) 2026 Thomas Sweeney
+#    This file is part of Interleave Playlist.
+#    Interleave Playlist is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#    Interleave Playlist is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+import typing
+from collections.abc import Callable
+from threading import Lock, Timer
+from time import time_ns
+from typing import Generic, Optional, TypeVar
+
+T = TypeVar('T')
+
+DEFAULT_RATE_HZ = 30
+
+
+def _replace(_: Optional[T], new: T) -> T:
+    return new
+
+
+def _schedule(delay_s: float, callback: Callable[[], None]) -> None:
+    timer = Timer(delay_s, callback)
+    timer.daemon = True
+    timer.start()
+
+
+# Coalesces updates coming from a worker into at most rate_hz emits per second so that big jobs
+# don't flood the event loop with cross thread signals. By default only the latest value is kept,
+# but a merge function can be given to accumulate updates between ticks instead.
+# An update held back by the rate limit is emitted by a timer at the next tick if nothing else
+# has been by then, so the last value before a worker goes quiet still shows up. Whatever is
+# still pending is emitted straight away when flush is called, which workers should always do last.
+# close stops anything else from being emitted, which has to happen before whatever emit reaches
+# can go away since the trailing emit comes from another thread
+class ProgressReporter(Generic[T]):
+
+    def __init__(self,
+                 emit: Callable[[T], None],
+                 merge: Callable[[Optional[T], T], T] = _replace,
+                 rate_hz: int = DEFAULT_RATE_HZ,
+                 clock: Callable[[], int] = time_ns,
+                 schedule: Callable[[float, Callable[[], None]], None] = _schedule):
+        if rate_hz <= 0:
+            raise ValueError("rate_hz must be positive")
+        self._emit = emit
+        self._merge = merge
+        self._interval_ns = 1000 * 1000 * 1000 // rate_hz
+        self._clock = clock
+        self._schedule = schedule
+        self._lock = Lock()
+        # held for the whole of a trailing emit so that close can wait for one that's under way
+        self._trailing_lock = Lock()
+        self._closed = False
+        self._pending: Optional[T] = None
+        self._has_pending = False
+        self._next_emit = 0
+        self._trailing_scheduled = False
+
+    def report(self, value: T) -> None:
+        with self._lock:
+            if self._closed:
+                return
+            self._pending = self._merge(self._pending if self._has_pending else None, value)
+            self._has_pending = True
+            now = self._clock()
+            if now < self._next_emit:
+                if self._trailing_scheduled:
+                    return
+                self._trailing_scheduled = True
+                delay_s = (self._next_emit - now) / (1000 * 1000 * 1000)
+            else:
+                self._next_emit = now + self._interval_ns
+                pending = self._take()
+                delay_s = -1
+        if delay_s >= 0:
+            self._schedule(delay_s, self._emit_trailing)
+        else:
+            self._emit(pending)
+
+    def flush(self) -> None:
+        with self._lock:
+            if not self._has_pending:
+                return
+            pending = self._take()
+        self._emit(pending)
+
+    def close(self) -> None:
+        with self._trailing_lock, self._lock:
+            self._closed = True
+            self._pending = None
+            self._has_pending = False
+
+    def _emit_trailing(self) -> None:
+        with self._trailing_lock:
+            with self._lock:
+                self._trailing_scheduled = False
+                if not self._has_pending:
+                    return
+                self._next_emit = self._clock() + self._interval_ns
+                pending = self._take()
+            self._emit(pending)
+
+    def _take(self) -> T:
+        pending = typing.cast(T, self._pending)
+        self._pending = None
+        self._has_pending = False
+        return pending
+
+
+def merge_dicts(pending: Optional[dict[str, int]], new: dict[str, int]) -> dict[str, int]:
+    if pending is None:
+        return dict(new)
+    pending.update(new)
+    return pending
@@ -16,11 +16,13 @@ import platform
 import subprocess
 import sys
 from math import log10, ceil
+from typing import Optional
 
 from PySide6.QtWidgets import QMessageBox
 
-from interleave_playlist.core.playlist import get_playlist, PlaylistEntry
-from interleave_playlist.persistence import input_, state
+from interleave_playlist.core.cancellation import CancellationToken
+from interleave_playlist.core.playlist import get_playlist, PlaylistEntry, ProgressCallback
+from interleave_playlist.persistence import input_, settings, state
 from interleave_playlist.persistence.watched import get_watched
 
 
@@ -36,26 +38,44 @@ def open_with_default_application(filepath: str) -> None:
 
 
 def _create_playlist(search_filter: str = "", use_cache: bool = False) -> list[PlaylistEntry]:
-    def show_warning(text: str) -> None:
-        msg_box = QMessageBox()
-        msg_box.setWindowTitle('Error')
-        msg_box.setText(text)
-        msg_box.setIcon(QMessageBox.Warning)
-        msg_box.show()
     try:
-        return get_playlist(input_.get_locations(), get_watched(), search_filter, use_cache)
-    except (FileNotFoundError, IsADirectoryError):
-        show_warning(f'Input yml file not found: {state.get_last_input_file()}\n\n'
-                     'Please create or find file and open it')
-    except input_.InvalidInputFile as e:
-        show_warning(f'Error reading yml file. Please fix it and try again\n'
-                     f'{state.get_last_input_file()}\n{e}')
-    except input_.LocationNotFound as e:
-        show_warning(f'Location from input file not found. Please fix it and try again\n'
-                     f'{state.get_last_input_file()}\n{e}')
+        return _build_playlist(search_filter, use_cache)
+    except PLAYLIST_BUILD_ERRORS as e:
+        show_playlist_build_error(e)
     return []
 
 
+PLAYLIST_BUILD_ERRORS = (FileNotFoundError, IsADirectoryError,
+                         input_.InvalidInputFile, input_.LocationNotFound)
+
+
+# Safe to call off of the GUI thread. Anything in PLAYLIST_BUILD_ERRORS should be shown to the
+# user with show_playlist_build_error once back on the GUI thread
+def _build_playlist(search_filter: str = "", use_cache: bool = False,
+                    cancellation_token: Optional[CancellationToken] = None,
+                    on_progress: Optional[ProgressCallback] = None) \
+        -> list[PlaylistEntry]:
+    return get_playlist(input_.get_locations(), get_watched(), settings.get_settings(),
+                        search_filter, use_cache, cancellation_token, on_progress)
+
+
+def show_playlist_build_error(e: BaseException) -> None:
+    if isinstance(e, (FileNotFoundError, IsADirectoryError)):
+        text = (f'Input yml file not found: {state.get_last_input_file()}\n\n'
+                'Please create or find file and open it')
+    elif isinstance(e, input_.InvalidInputFile):
+        text = (f'Error reading yml file. Please fix it and try again\n'
+                f'{state.get_last_input_file()}\n{e}')
+    else:
+        text = (f'Location from input file not found. Please fix it and try again\n'
+                f'{state.get_last_input_file()}\n{e}')
+    msg_box = QMessageBox()
+    msg_box.setWindowTitle('Error')
+    msg_box.setText(text)
+    msg_box.setIcon(QMessageBox.Warning)
+    msg_box.show()
+
+
 def _get_duration_str(ms: int, override_ms: int) -> str:
     hours, remainder = divmod(ms, 1000 * 60 * 60)
     minutes, remainder = divmod(remainder, 1000 * 60)
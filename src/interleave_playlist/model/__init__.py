@@ -18,11 +18,12 @@ from datetime import datetime, timedelta
 from typing import Optional, Any
 from uuid import uuid4
 
-from crontab import CronTab
+if typing.TYPE_CHECKING:
+    from crontab import CronTab
 
 
 class Timed:
-    def __init__(self, start: datetime, cron: CronTab, first: Optional[int] = None,
+    def __init__(self, start: datetime, cron: 'CronTab', first: Optional[int] = None,
                  amount: Optional[int] = None, start_at_cron: Optional[bool] = False):
         self.start = (start.astimezone()
                       if start.tzinfo is None else
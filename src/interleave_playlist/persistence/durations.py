@@ -0,0 +1,86 @@
+#    Interleave Playlist
+#    Copyright (C) 2026 Thomas Sweeney
+#    This file is part of Interleave Playlist.
+#    Interleave Playlist is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#    Interleave Playlist is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+import os
+import sqlite3
+import stat
+from collections.abc import Iterable
+from contextlib import closing
+from pathlib import Path
+from typing import Optional
+
+import appdirs
+
+import interleave_playlist
+
+# (device, inode, size, modification time in ns). Any change to the file changes its key,
+# so stale durations are never returned and never need to be explicitly invalidated
+FileKey = tuple[int, int, int, int]
+
+_DURATIONS_FILE = Path(os.path.join(appdirs.user_data_dir(interleave_playlist.APP_NAME),
+                                    'durations.sqlite3'))
+
+
+def get_file_key(filename: str) -> Optional[FileKey]:
+    try:
+        st = os.stat(filename)
+    except OSError:
+        return None
+    if not stat.S_ISREG(st.st_mode):
+        return None
+    return st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns
+
+
+# Looked up with a single join against a temporary table of the keys rather than a query per
+# file, so whole libraries come back at once
+def get_durations(file_keys: dict[str, FileKey]) -> dict[str, int]:
+    if not file_keys:
+        return {}
+    with closing(_connect()) as conn:
+        conn.execute('CREATE TEMP TABLE lookup ('
+                     'dev INTEGER NOT NULL, '
+                     'inode INTEGER NOT NULL, '
+                     'size INTEGER NOT NULL, '
+                     'mtime_ns INTEGER NOT NULL, '
+                     'path TEXT NOT NULL)')
+        conn.executemany('INSERT INTO lookup VALUES (?, ?, ?, ?, ?)',
+                         [(*file_key, filename) for filename, file_key in file_keys.items()])
+        return dict(conn.execute('SELECT lookup.path, durations.duration FROM lookup '
+                                 'JOIN durations USING (dev, inode, size, mtime_ns)'))
+
+
+def set_durations(durations: Iterable[tuple[str, FileKey, int]]) -> None:
+    rows = [(*file_key, filename, duration) for filename, file_key, duration in durations]
+    if not rows:
+        return
+    with closing(_connect()) as conn, conn:
+        conn.executemany('DELETE FROM durations WHERE path = ?', [(row[4],) for row in rows])
+        conn.executemany('INSERT OR REPLACE INTO durations '
+                         '(dev, inode, size, mtime_ns, path, duration) '
+                         'VALUES (?, ?, ?, ?, ?, ?)', rows)
+
+
+def _connect() -> sqlite3.Connection:
+    os.makedirs(_DURATIONS_FILE.parent, exist_ok=True)
+    conn = sqlite3.connect(_DURATIONS_FILE)
+    with conn:
+        conn.execute('CREATE TABLE IF NOT EXISTS durations ('
+                     'dev INTEGER NOT NULL, '
+                     'inode INTEGER NOT NULL, '
+                     'size INTEGER NOT NULL, '
+                     'mtime_ns INTEGER NOT NULL, '
+                     'path TEXT NOT NULL, '
+                     'duration INTEGER NOT NULL, '
+                     'PRIMARY KEY (dev, inode, size, mtime_ns))')
+        conn.execute('CREATE INDEX IF NOT EXISTS durations_path ON durations (path)')
+    return conn
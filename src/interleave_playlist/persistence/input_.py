@@ -1,5 +1,5 @@
 #    Interleave Playlist
-#    Copyright (C) 2021-2025 Thomas Sweeney
+#    Copyright (C) 2021-2026 Thomas Sweeney
 #    This file is part of Interleave Playlist.
 #    Interleave Playlist is free software: you can redistribute it and/or modify
 #    it under the terms of the GNU General Public License as published by
@@ -14,17 +14,19 @@
 import os
 import re
 from collections.abc import Iterable
+from copy import deepcopy
 from datetime import datetime
 from pathlib import Path
 from typing import Any, Optional, cast
 
-from crontab import CronTab
-from ruamel.yaml import YAML, YAMLError
+from ruamel.yaml import YAML, YAMLError, CommentedMap
 
 from interleave_playlist.core import PlaylistEntry
 from interleave_playlist.model import Location, Group, Timed
 from interleave_playlist.persistence import state
 
+_CACHED_INPUT: dict[Path, tuple[tuple[int, int], Any]] = {}
+
 
 class InvalidInputFile(Exception):
     pass
@@ -34,36 +36,47 @@ class LocationNotFound(Exception):
     pass
 
 
-def get_locations() -> list[Location]:
-    input_: dict = _get_input(state.get_last_input_file())
+def get_locations(input_file: Optional[Path] = None) -> list[Location]:
+    input_: dict = _get_input(input_file or state.get_last_input_file())
     locations = []
     for loc in input_['locations']:
         if 'disabled' in loc and loc['disabled'] is True:
             continue
         options = [loc, input_]
+        default_group = Group(
+            loc['name'],
+            loc['name'],
+            _nested_get('priority', options),
+            _nested_get('whitelist', options),
+            _nested_get('blacklist', options),
+            _get_timed(loc['timed']) if 'timed' in loc else None,
+        )
         locations.append(
             Location(
                 loc['name'],
-                Group(
-                    loc['name'],
-                    loc['name'],
-                    _nested_get('priority', options),
-                    _nested_get('whitelist', options),
-                    _nested_get('blacklist', options),
-                    _get_timed(loc['timed']) if 'timed' in loc else None,
-                ),
+                default_group,
                 loc['additional'] if 'additional' in loc else [],
                 _nested_get('regex', options),
-                _get_group_list(loc['groups'], options) if 'groups' in loc else []
+                _get_group_list(loc['groups'], options, default_group.blacklist)
+                if 'groups' in loc else []
             )
         )
     return locations
 
 
 def drop_groups(entries: Iterable[PlaylistEntry]) -> None:
-    input_ = _get_input(state.get_last_input_file())
+    last_input_file = state.get_last_input_file()
+    if not last_input_file:
+        raise InvalidInputFile("Input file is unexpectedly missing! "
+                               "This is likely a bug and should be reported.")
+    # the cached document is shared with the locations and groups already handed out, which a
+    # build may be reading at the same time, so the changes are made to a copy of it
+    input_ = deepcopy(_get_input(last_input_file, round_trip=True))
+    locations: dict[str, dict[str, Any]] = {}
+    for loc in input_['locations']:
+        locations.setdefault(loc['name'], loc)
     for entry in entries:
-        location = next(filter(lambda i: i['name'] == entry.location.name, input_['locations']))
+        location = locations[entry.location.name]
         if entry.group.name == entry.location.name:
             location['disabled'] = True
             continue
@@ -71,16 +84,16 @@ def drop_groups(entries: Iterable[PlaylistEntry]) -> None:
         blacklist: list[str] = location.setdefault('blacklist', [])
         if group_name not in blacklist:
             blacklist.append(group_name)
-    yaml = YAML()
-    last_input_file = state.get_last_input_file()
-    if not last_input_file:
-        raise InvalidInputFile("Input file is unexpectedly missing! "
-                               "This is likely a bug and should be reported.")
-    yaml.dump(input_, Path(last_input_file))
+    tmp_file = Path(str(last_input_file) + '.tmp')
+    YAML().dump(input_, tmp_file)
+    os.replace(tmp_file, last_input_file)
+    _CACHED_INPUT[last_input_file] = (_get_file_key(last_input_file), input_)
 
 
-def _get_group_list(data: list[dict[str, Any]], additional_options: list[dict[str, Any]]) \
-        -> list[Group]:
+# Groups without a blacklist of their own share the location's list, so it can be told which of
+# them a blacklist added to the location applies to
+def _get_group_list(data: list[dict[str, Any]], additional_options: list[dict[str, Any]],
+                    location_blacklist: list[str]) -> list[Group]:
     groups = []
     for g in data:
         options = [g, *additional_options]
@@ -89,14 +102,16 @@ def _get_group_list(data: list[dict[str, Any]], additional_options: list[dict[st
             _nested_get('name', additional_options),
             _nested_get('priority', options),
             _nested_get('whitelist', options),
-            _nested_get('blacklist', options),
+            g['blacklist'] if 'blacklist' in g else location_blacklist,
             _nested_get('timed', options),
             _nested_get('exact', options),
         ))
     return groups
 
 
+# crontab is only imported once a timed group turns up
 def _get_timed(d: dict[str, Any]) -> Timed:
+    from crontab import CronTab
     return Timed(
         datetime.fromisoformat(d['start']),
         CronTab(d['cron']),
@@ -106,15 +121,39 @@ def _get_timed(d: dict[str, Any]) -> Timed:
     )
 
 
-def _get_input(input_file: Optional[Path]) -> dict[str, Any]:
+def _get_file_key(input_file: Path) -> tuple[int, int]:
+    stat = os.stat(input_file)
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _load_input(input_file: Path, round_trip: bool) -> Any:
+    file_key = _get_file_key(input_file)
+    cached = _CACHED_INPUT.get(input_file)
+    if (cached is not None and cached[0] == file_key
+            and (not round_trip or isinstance(cached[1], CommentedMap))):
+        return cached[1]
+    with open(input_file, 'r') as f:
+        yml = _get_yaml(round_trip).load(f)
+    _CACHED_INPUT[input_file] = (file_key, yml)
+    return yml
+
+
+def _get_yaml(round_trip: bool) -> YAML:
+    if round_trip:
+        yaml = YAML()
+        yaml.preserve_quotes = True
+        return yaml
+    # The safe loader uses the C extension when available and is much faster, but it throws
+    # away the comments and formatting that have to be preserved when writing the file back
+    return YAML(typ='safe')
+
+
+def _get_input(input_file: Optional[Path], round_trip: bool = False) -> dict[str, Any]:
     if not input_file:
         raise InvalidInputFile('Input file is unexpectedly missing. '
                                'This is likely a bug and should be reported.')
     try:
-        with open(input_file, 'r') as f:
-            yaml = YAML()
-            yaml.preserve_quotes = True
-            yml = yaml.load(f)
+        yml = _load_input(input_file, round_trip)
         _validate_group(yml)
         if 'locations' not in yml:
             raise InvalidInputFile('Input requires "locations"')
@@ -184,6 +223,7 @@ def _validate_timed(d: dict) -> None:
             datetime.fromisoformat(d['timed']['start'])
         except (TypeError, ValueError) as e:
             raise InvalidInputFile('Invalid start date format. Requires ISO string') from e
+        from crontab import CronTab
         try:
             CronTab(d['timed']['cron'])
         except ValueError as e:
@@ -1,5 +1,5 @@
 #    Interleave Playlist
-#    Copyright (C) 2021-2025 Thomas Sweeney
+#    Copyright (C) 2021-2026 Thomas Sweeney
 #    This file is part of Interleave Playlist.
 #    Interleave Playlist is free software: you can redistribute it and/or modify
 #    it under the terms of the GNU General Public License as published by
@@ -15,7 +15,8 @@
 import os
 import pathlib
 import typing
-from typing import Any
+from dataclasses import dataclass
+from typing import Any, Optional
 
 import appdirs
 from ruamel.yaml import YAML
@@ -26,6 +27,9 @@ from interleave_playlist import CriticalUserError
 _SETTINGS_FILE = pathlib.Path(os.path.join(appdirs.user_config_dir(interleave_playlist.APP_NAME),
                                            'settings.yml'))
 _CACHED_FILE: dict[str, Any] = {}
+_CACHED_FILE_KEY: Optional[tuple[int, int]] = None
+_CACHED_SETTINGS: Optional['Settings'] = None
+_SORT_NAMES: list[str] = ['INTERLEAVE', 'ALPHABETICAL', 'LAST MODIFIED']
 
 T = typing.TypeVar('T')
 
@@ -38,6 +42,30 @@ class InvalidSettingsYmlException(Exception):
         self.value = value
 
 
+@dataclass(frozen=True)
+class Settings:
+    __slots__ = ('font_size', 'play_command', 'dark_mode', 'max_watched_remembered',
+                 'exclude_directories', 'default_sort_name', 'default_sort_reversed',
+                 'runtime_probe_workers', 'runtime_probe_workers_per_device')
+    font_size: int
+    play_command: str
+    dark_mode: bool
+    max_watched_remembered: int
+    exclude_directories: bool
+    default_sort_name: str
+    default_sort_reversed: bool
+    runtime_probe_workers: int
+    runtime_probe_workers_per_device: int
+
+
+def get_settings() -> Settings:
+    global _CACHED_SETTINGS
+    _load_settings_file()
+    if _CACHED_SETTINGS is None:
+        _CACHED_SETTINGS = _create_settings()
+    return _CACHED_SETTINGS
+
+
 def get_font_size() -> int:
     return _get_settings_and_convert('font-size', int)
 
@@ -64,32 +92,77 @@ def get_default_sort_reversed() -> bool:
 
 def get_default_sort_name() -> str:
     key: str = 'default-sort-name'
-    allowed_values: list[str] = ['INTERLEAVE', 'ALPHABETICAL', 'LAST MODIFIED']
     sort_name: str = _get_settings_and_convert(key, str)
-    if sort_name.upper() not in allowed_values:
+    if sort_name.upper() not in _SORT_NAMES:
         raise InvalidSettingsYmlException(f"Invalid settings.yml value for "
                                           f"'{key}': {sort_name}"
-                                          f"valid values are: {allowed_values}", key, sort_name)
+                                          f"valid values are: {_SORT_NAMES}", key, sort_name)
     return sort_name.upper()
 
 
-def _get_settings(option: str) -> Any:
-    global _CACHED_FILE
-    if not _CACHED_FILE:
-        with open(_SETTINGS_FILE, 'r') as f:
-            yaml = YAML()
-            yaml.preserve_quotes = True
-            _CACHED_FILE = yaml.load(f)
-            if _CACHED_FILE is None:
-                _CACHED_FILE = {}
-            default_settings = _get_default_settings()
-        for key in default_settings.keys():
-            if key not in _CACHED_FILE:
-                _CACHED_FILE[key] = default_settings[key]
+def _create_settings() -> Settings:
+    fields: dict[str, tuple[str, typing.Callable[[Any], Any]]] = {
+        'font_size': ('font-size', int),
+        'play_command': ('play-command', str),
+        'dark_mode': ('dark-mode', _convert_to_bool),
+        'max_watched_remembered': ('max-watched-remembered', int),
+        'exclude_directories': ('exclude-directories', _convert_to_bool),
+        'default_sort_name': ('default-sort-name', _convert_to_sort_name),
+        'default_sort_reversed': ('default-sort-reversed', _convert_to_bool),
+        'runtime_probe_workers': ('runtime-probe-workers', _convert_to_positive_int),
+        'runtime_probe_workers_per_device': ('runtime-probe-workers-per-device',
+                                             _convert_to_positive_int),
+    }
+    values: dict[str, Any] = {}
+    errors: list[InvalidSettingsYmlException] = []
+    for field_name, (key, conv) in fields.items():
+        try:
+            values[field_name] = _get_settings_and_convert(key, conv)
+        except InvalidSettingsYmlException as e:
+            errors.append(e)
+    if errors:
+        message = 'Invalid settings.yml values:'
+        for error in errors:
+            message += f'\n    {error.key}: {error.value}'
+        raise CriticalUserError(message)
+    return Settings(**values)
+
+
+def _get_file_key() -> Optional[tuple[int, int]]:
+    try:
+        stat = os.stat(_SETTINGS_FILE)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _load_settings_file() -> dict[str, Any]:
+    global _CACHED_FILE, _CACHED_FILE_KEY, _CACHED_SETTINGS
+    file_key = _get_file_key()
+    if _CACHED_FILE and file_key == _CACHED_FILE_KEY:
+        return _CACHED_FILE
+    with open(_SETTINGS_FILE, 'r') as f:
+        yaml = YAML()
+        yaml.preserve_quotes = True
+        loaded = yaml.load(f)
+        if loaded is None:
+            loaded = {}
+    default_settings = _get_default_settings()
+    missing_keys = [key for key in default_settings.keys() if key not in loaded]
+    if missing_keys:
+        for key in missing_keys:
+            loaded[key] = default_settings[key]
         with open(_SETTINGS_FILE, 'w') as f:
-            yaml.dump(_CACHED_FILE, f)
+            yaml.dump(loaded, f)
+        file_key = _get_file_key()
+    _CACHED_FILE = loaded
+    _CACHED_FILE_KEY = file_key
+    _CACHED_SETTINGS = None
+    return _CACHED_FILE
 
-    return _CACHED_FILE[option]
+
+def _get_settings(option: str) -> Any:
+    return _load_settings_file()[option]
 
 
 def _get_settings_and_convert(key: str, conv: typing.Callable[[Any], T]) -> T:
@@ -113,6 +186,19 @@ def _convert_to_bool(x: Any) -> bool:
     raise ValueError(f'Unable to convert {x} to type bool')
 
 
+def _convert_to_positive_int(x: Any) -> int:
+    value = int(x)
+    if value < 1:
+        raise ValueError(f'{x} is not a positive integer')
+    return value
+
+
+def _convert_to_sort_name(x: Any) -> str:
+    if isinstance(x, str) and x.upper() in _SORT_NAMES:
+        return x.upper()
+    raise ValueError(f'{x} is not one of {_SORT_NAMES}')
+
+
 def _get_default_settings() -> dict[str, Any]:
     return {
         'font-size': 12,
@@ -121,35 +207,20 @@ def _get_default_settings() -> dict[str, Any]:
         'max-watched-remembered': 100,
         'exclude-directories': True,
         'default-sort-name': 'interleave',
-        'default-sort-reversed': False
+        'default-sort-reversed': False,
+        'runtime-probe-workers': 8,
+        'runtime-probe-workers-per-device': 4,
     }
 
 
 def create_settings_file() -> None:
     if not os.path.exists(_SETTINGS_FILE):
         if not os.path.exists(_SETTINGS_FILE.parent):
-            os.mkdir(_SETTINGS_FILE.parent)
+            os.makedirs(_SETTINGS_FILE.parent)
         with open(_SETTINGS_FILE, 'w') as f:
             yaml = YAML()
             yaml.dump(_get_default_settings(), f)
 
 
 def validate_settings_file() -> None:
-    options = [
-        get_font_size,
-        get_play_command,
-        get_dark_mode,
-        get_max_watched_remembered,
-        get_exclude_directories
-    ]
-    errors = []
-    for option in options:
-        try:
-            option()
-        except InvalidSettingsYmlException as e:
-            errors.append(e)
-    if errors:
-        message = 'Invalid settings.yml values:'
-        for error in errors:
-            message += f'\n    {error.key}: {error.value}'
-        raise CriticalUserError(message)
+    get_settings()
@@ -0,0 +1,109 @@
+#    Interleave Playlist
+#    Copyright (C) 2026 Thomas Sweeney
+#    This file is part of Interleave Playlist.
+#    Interleave Playlist is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#    Interleave Playlist is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+import json
+import os
+from copy import copy
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Optional
+
+import appdirs
+
+import interleave_playlist
+from interleave_playlist.core import PlaylistEntry
+from interleave_playlist.model import Group, Location
+from interleave_playlist.persistence import state
+
+_SNAPSHOT_FILE = Path(os.path.join(appdirs.user_data_dir(interleave_playlist.APP_NAME),
+                                   'snapshot.json'))
+_VERSION = 1
+
+
+# The last playlist that was on screen, so that the next launch can show it straight away while
+# the real playlist is rebuilt. Entries are stored against the names of their location and group
+# and are matched back up with the locations from the input file when loaded
+@dataclass
+class Snapshot:
+    entries: list[PlaylistEntry]
+    watched: set[str] = field(default_factory=set)
+    durations: dict[str, int] = field(default_factory=dict)
+
+
+def get_snapshot(locations: list[Location]) -> Optional[Snapshot]:
+    try:
+        with open(_SNAPSHOT_FILE, 'r') as f:
+            data: dict[str, Any] = json.load(f)
+    except (OSError, ValueError):
+        return None
+    try:
+        if data['version'] != _VERSION or data['input_file'] != str(state.get_last_input_file()):
+            return None
+        groups: dict[tuple[str, str], tuple[Location, Group]] = {
+            (loc.name, group.name): (loc, group)
+            for loc in locations
+            for group in [loc.default_group] + loc.groups
+        }
+        locations_by_name = {loc.name: loc for loc in locations}
+        snapshot_groups = [_get_group(groups, locations_by_name, location_name, group_name)
+                           for location_name, group_name in data['groups']]
+        snapshot = Snapshot([], set(data['watched']))
+        for filename, group_index, duration in data['entries']:
+            loc, group = snapshot_groups[group_index]
+            snapshot.entries.append(PlaylistEntry(filename, loc, group))
+            if duration is not None:
+                snapshot.durations[filename] = duration
+        return snapshot
+    except (KeyError, IndexError, TypeError, ValueError):
+        return None
+
+
+# A group that has since been removed or renamed means the snapshot is too far out of date,
+# except for groups a location's regex names, which are never listed in the input. Those are made
+# from the default group the same way building the playlist does
+def _get_group(groups: dict[tuple[str, str], tuple[Location, Group]],
+               locations: dict[str, Location],
+               location_name: str,
+               group_name: str) -> tuple[Location, Group]:
+    if (location_name, group_name) in groups:
+        return groups[(location_name, group_name)]
+    loc = locations[location_name]
+    if loc.regex is None:
+        raise KeyError(group_name)
+    group = copy(loc.default_group)
+    group.name = group_name
+    return loc, group
+
+
+def set_snapshot(snapshot: Snapshot) -> None:
+    group_indexes: dict[tuple[str, str], int] = {}
+    entries: list[tuple[str, int, Optional[int]]] = []
+    for entry in snapshot.entries:
+        group_index = group_indexes.setdefault((entry.location.name, entry.group.name),
+                                               len(group_indexes))
+        entries.append((entry.filename, group_index, snapshot.durations.get(entry.filename)))
+    data = {
+        'version': _VERSION,
+        'input_file': str(state.get_last_input_file()),
+        'groups': list(group_indexes),
+        'entries': entries,
+        'watched': sorted(snapshot.watched),
+    }
+    temp_file = str(_SNAPSHOT_FILE) + '.tmp'
+    try:
+        with open(temp_file, 'w') as f:
+            json.dump(data, f, separators=(',', ':'))
+        os.replace(temp_file, _SNAPSHOT_FILE)
+    except OSError:
+        # the snapshot only saves time on the next launch, so there's nothing worth reporting
+        pass
@@ -36,7 +36,7 @@ _CACHED_STATE: dict[str, Any] = {}
 
 def create_state_file() -> None:
     if not os.path.exists(_STATE_FILE.parent):
-        os.mkdir(_STATE_FILE.parent)
+        os.makedirs(_STATE_FILE.parent)
     if not os.path.exists(_STATE_FILE):
         with open(_STATE_FILE, 'w') as f:
             json.dump(_DEFAULT_STATE, f)
@@ -13,15 +13,19 @@
 #    along with this program.  If not, see <http://www.gnu.org/licenses/>.
 import csv
 import os
+from collections.abc import Callable
 from os import path
+from pathlib import Path
+from threading import Condition, Thread
+from typing import Optional
 
-from interleave_playlist.core.playlist import FileGroup, get_playlist, PlaylistEntry
+from interleave_playlist.core.playlist import FileGroup, PlaylistEntry
 from interleave_playlist.persistence import settings
 from interleave_playlist.persistence import state, input_
 
 
-def get_watched() -> list[FileGroup]:
-    with open(get_watched_file_name(), 'r') as f:
+def get_watched(input_file: Optional[Path] = None) -> list[FileGroup]:
+    with open(get_watched_file_name(input_file), 'r') as f:
         rows = csv.reader(f)
         watched_list: list[FileGroup] = []
         for row in rows:
@@ -49,35 +53,136 @@ def remove_watched(remove: list[PlaylistEntry]) -> None:
     _write_new_watched_list(new_watched_list)
 
 
-def get_watched_file_name() -> str:
-    fn = str(state.get_last_input_file()) + '.watched.txt'
+# Applies a batch of marks and unmarks with a single rewrite of the watched file. The result is
+# the same as applying them one at a time in order
+def update_watched(changes: list[tuple[PlaylistEntry, bool]],
+                   input_file: Optional[Path] = None) -> None:
+    update_watched_files([((entry.filename, entry.group.name), watched)
+                          for entry, watched in changes], input_file)
+
+
+# Same as update_watched but by (filename, group name). The group name is only needed for marks
+def update_watched_files(changes: list[tuple[FileGroup, bool]],
+                         input_file: Optional[Path] = None) -> None:
+    remove_names = {path.basename(filename) for (filename, _), watched in changes if not watched}
+    last_change: dict[str, tuple[str, bool]] = {}
+    for (filename, group_name), watched in changes:
+        name = path.basename(filename)
+        # later changes to the same file are appended after everything submitted before them
+        last_change.pop(name, None)
+        last_change[name] = (group_name, watched)
+    new_watched_list: list[FileGroup] = _clean_watched_list(list(remove_names), input_file)
+    for name, (group_name, watched) in last_change.items():
+        if watched:
+            new_watched_list.append((name, group_name))
+    _write_new_watched_list(new_watched_list, input_file)
+
+
+# Writes marks and unmarks in the background. Anything submitted while a write is in progress
+# or within delay_s of the last submission is folded into the same write. If a write fails
+# on_error gets the changes that were lost, in the order they were submitted. Changes go to the
+# watched file of the input that was open when they were submitted, even if another one has
+# been opened by the time they're written
+class WatchedWriteQueue:
+
+    def __init__(self,
+                 on_error: Callable[[list[tuple[PlaylistEntry, bool]], BaseException], None],
+                 delay_s: float = 0.25):
+        self._on_error = on_error
+        self._delay_s = delay_s
+        self._condition = Condition()
+        self._pending: list[tuple[Optional[Path], PlaylistEntry, bool]] = []
+        self._writing = False
+        self._running = False
+        self._flush_requests = 0
+
+    def submit(self, entries: list[PlaylistEntry], watched: bool) -> None:
+        input_file = state.get_last_input_file()
+        with self._condition:
+            self._pending.extend((input_file, entry, watched) for entry in entries)
+            if not self._running:
+                self._running = True
+                Thread(target=self._run, daemon=True).start()
+            self._condition.notify_all()
+
+    # Blocks until everything submitted so far has been written or has failed
+    def flush(self) -> None:
+        with self._condition:
+            self._flush_requests += 1
+            self._condition.notify_all()
+            try:
+                self._condition.wait_for(lambda: not self._pending and not self._writing)
+            finally:
+                self._flush_requests -= 1
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                pending_count = -1
+                while pending_count != len(self._pending) and not self._flush_requests:
+                    pending_count = len(self._pending)
+                    self._condition.wait(self._delay_s)
+                if not self._pending:
+                    self._running = False
+                    self._condition.notify_all()
+                    return
+                pending = self._pending
+                self._pending = []
+                self._writing = True
+            try:
+                for input_file, changes in _by_input_file(pending):
+                    try:
+                        update_watched(changes, input_file)
+                    except BaseException as e:
+                        self._on_error(changes, e)
+            finally:
+                with self._condition:
+                    self._writing = False
+                    self._condition.notify_all()
+
+
+def _by_input_file(pending: list[tuple[Optional[Path], PlaylistEntry, bool]]) \
+        -> list[tuple[Optional[Path], list[tuple[PlaylistEntry, bool]]]]:
+    by_input_file: dict[Optional[Path], list[tuple[PlaylistEntry, bool]]] = {}
+    for input_file, entry, watched in pending:
+        by_input_file.setdefault(input_file, []).append((entry, watched))
+    return list(by_input_file.items())
+
+
+def get_watched_file_name(input_file: Optional[Path] = None) -> str:
+    fn = str(input_file or state.get_last_input_file()) + '.watched.txt'
     if not os.path.exists(fn):
         with open(fn, 'w'):
             pass
     return fn
 
 
-def _get_temp_file_name() -> str:
-    return get_watched_file_name() + '.tmp'
+def _get_temp_file_name(input_file: Optional[Path] = None) -> str:
+    return get_watched_file_name(input_file) + '.tmp'
 
 
-def _get_basename_playlist() -> list[PlaylistEntry]:
-    return [i for i in get_playlist(input_.get_locations(), [], use_cache=True)]
+# Names of everything in the input's directories. Listed here rather than through the playlist
+# caches since writes run on their own thread, alongside playlist builds
+def _get_basenames(input_file: Optional[Path] = None) -> set[str]:
+    basenames: set[str] = set()
+    for loc in input_.get_locations(input_file):
+        for directory in [loc.name] + loc.additional:
+            basenames.update(name.strip() for name in os.listdir(directory))
+    return basenames
 
 
-def _clean_watched_list(remove_names: list[str]) -> list[FileGroup]:
-    full_playlist = _get_basename_playlist()
-    watched_list = get_watched()
+def _clean_watched_list(remove_names: list[str],
+                        input_file: Optional[Path] = None) -> list[FileGroup]:
+    basenames = _get_basenames(input_file)
+    watched_list = get_watched(input_file)
     new_watched_list: list[FileGroup] = []
     max_watched_remembered = settings.get_max_watched_remembered()
     watched_remembered = 0
     for row in reversed(watched_list):
         new_watched_list_len = len(new_watched_list)
         if row[0] not in remove_names:
-            for item in full_playlist:
-                if row[0].strip() == os.path.basename(item.filename).strip():
-                    new_watched_list.append(row)
-                    break
+            if row[0].strip() in basenames:
+                new_watched_list.append(row)
             if (new_watched_list_len == len(new_watched_list)
                     and watched_remembered < max_watched_remembered):
                 watched_remembered += 1
@@ -86,8 +191,9 @@ def _clean_watched_list(remove_names: list[str]) -> list[FileGroup]:
     return new_watched_list
 
 
-def _write_new_watched_list(new_watched_list: list[FileGroup]) -> None:
-    with open(_get_temp_file_name(), 'w') as tmp:
+def _write_new_watched_list(new_watched_list: list[FileGroup],
+                            input_file: Optional[Path] = None) -> None:
+    with open(_get_temp_file_name(input_file), 'w') as tmp:
         writer = csv.writer(tmp, quoting=csv.QUOTE_ALL)
         writer.writerows(new_watched_list)
-    os.replace(_get_temp_file_name(), get_watched_file_name())
+    os.replace(_get_temp_file_name(input_file), get_watched_file_name(input_file))
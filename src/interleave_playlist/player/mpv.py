@@ -0,0 +1,223 @@
+#    Interleave Playlist
+#    Copyright (C) 2026 Thomas Sweeney
+#    This file is part of Interleave Playlist.
+#    Interleave Playlist is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#    Interleave Playlist is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+import json
+import os
+import socket
+import subprocess
+import threading
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any, Optional
+
+import appdirs
+
+import interleave_playlist
+
+# Talks to mpv over its JSON IPC (--input-ipc-server) so that playing hands the files to the
+# mpv that's already open instead of starting another one each time
+# https://mpv.io/manual/stable/#json-ipc
+
+SOCKET_FILE = Path(os.path.join(appdirs.user_data_dir(interleave_playlist.APP_NAME), 'mpv.sock'))
+
+_PLAYLIST_OBSERVER_ID = 1
+
+Event = dict[str, Any]
+
+
+class MpvError(Exception):
+    pass
+
+
+# mpv only listens on a Unix socket here. On Windows it's a named pipe, which isn't supported
+def is_mpv(command: str) -> bool:
+    return os.name == 'posix' and Path(command).stem.lower() == 'mpv'
+
+
+# One connection to mpv. Replies are matched to commands by request_id, and everything else mpv
+# sends is an event that's passed to on_event from the thread reading the socket
+class MpvClient:
+    def __init__(self,
+                 socket_file: Path,
+                 on_event: Optional[Callable[[Event], None]] = None,
+                 timeout: float = 5.0) -> None:
+        self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            self._socket.connect(str(socket_file))
+        except OSError:
+            self._socket.close()
+            raise
+        self._on_event = on_event
+        self._timeout = timeout
+        self._condition = threading.Condition()
+        self._write_lock = threading.Lock()
+        self._replies: dict[int, Event] = {}
+        self._last_request_id = 0
+        self._closed = False
+        threading.Thread(target=self._read, daemon=True).start()
+
+    @property
+    def closed(self) -> bool:
+        with self._condition:
+            return self._closed
+
+    def close(self) -> None:
+        try:
+            self._socket.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self._socket.close()
+
+    def command(self, *args: Any) -> Any:
+        return self.commands([list(args)])[0]
+
+    # All of them are sent before waiting for any replies, so a long playlist costs one round trip
+    def commands(self, commands: list[list[Any]]) -> list[Any]:
+        with self._condition:
+            if self._closed:
+                raise MpvError('mpv has closed')
+            first_id = self._last_request_id + 1
+            self._last_request_id += len(commands)
+        data = ''.join(json.dumps({'command': command, 'request_id': first_id + i}) + '\n'
+                       for i, command in enumerate(commands))
+        with self._write_lock:
+            self._socket.sendall(data.encode('utf-8'))
+        deadline = time.monotonic() + self._timeout
+        return [self._get_reply(first_id + i, command[0], deadline)
+                for i, command in enumerate(commands)]
+
+    # Replaces the playlist, or adds to the end of it and starts playing if mpv was idle
+    def play(self, filenames: list[str], append: bool = False) -> None:
+        self.commands([['loadfile', filename,
+                        'append-play' if append else 'replace' if i == 0 else 'append']
+                       for i, filename in enumerate(filenames)])
+
+    # mpv has read the file by the time this returns
+    def play_playlist_file(self, playlist_file: Path, append: bool = False) -> None:
+        self.command('loadlist', str(playlist_file), 'append-play' if append else 'replace')
+
+    def _get_reply(self, request_id: int, name: str, deadline: float) -> Any:
+        with self._condition:
+            if not self._condition.wait_for(
+                    lambda: request_id in self._replies or self._closed,
+                    max(deadline - time.monotonic(), 0)):
+                raise MpvError(f'mpv did not reply to {name}')
+            if request_id not in self._replies:
+                raise MpvError('mpv has closed')
+            reply = self._replies.pop(request_id)
+        if reply.get('error') != 'success':
+            raise MpvError(f"{name}: {reply.get('error')}")
+        return reply.get('data')
+
+    def _read(self) -> None:
+        try:
+            with self._socket.makefile('rb') as f:
+                for line in f:
+                    try:
+                        message = json.loads(line)
+                    except ValueError:
+                        continue
+                    if 'event' in message:
+                        if self._on_event is not None:
+                            self._on_event(message)
+                    elif 'request_id' in message:
+                        with self._condition:
+                            self._replies[message['request_id']] = message
+                            self._condition.notify_all()
+        except OSError:
+            pass
+        finally:
+            with self._condition:
+                self._closed = True
+                self._condition.notify_all()
+
+
+# Keeps hold of one mpv, starting it the first time something is played and again whenever it
+# has been closed. on_finished is called with the filename of anything that plays to the end,
+# from a background thread
+class MpvPlayer:
+    def __init__(self,
+                 command: str,
+                 on_finished: Optional[Callable[[str], None]] = None,
+                 socket_file: Path = SOCKET_FILE,
+                 start_timeout: float = 5.0) -> None:
+        self.command = command
+        self._on_finished = on_finished
+        self._socket_file = socket_file
+        self._start_timeout = start_timeout
+        self._lock = threading.Lock()
+        self._client: Optional[MpvClient] = None
+        self._process: Optional[subprocess.Popen[bytes]] = None
+        # playlist entry ids to filenames, for telling which one end-file is about
+        self._filenames: dict[int, str] = {}
+
+    def play(self, filenames: list[str], append: bool = False) -> None:
+        with self._lock:
+            self._get_client().play(filenames, append)
+
+    def play_playlist_file(self, playlist_file: Path, append: bool = False) -> None:
+        with self._lock:
+            self._get_client().play_playlist_file(playlist_file, append)
+
+    # mpv is left playing
+    def close(self) -> None:
+        with self._lock:
+            if self._client is not None:
+                self._client.close()
+                self._client = None
+
+    def _get_client(self) -> MpvClient:
+        if self._client is not None and not self._client.closed:
+            return self._client
+        try:
+            # one that was started before, or by something else with the same socket
+            client = MpvClient(self._socket_file, self._on_event)
+        except OSError:
+            client = self._start()
+        client.command('observe_property', _PLAYLIST_OBSERVER_ID, 'playlist')
+        self._client = client
+        return client
+
+    def _start(self) -> MpvClient:
+        if self._process is not None:
+            # reaps the one that was closed
+            self._process.poll()
+        os.makedirs(os.path.dirname(self._socket_file), exist_ok=True)
+        # idle so that it waits for the files to be sent, once so that it still quits at the end
+        process = subprocess.Popen([self.command, '--idle=once',
+                                    f'--input-ipc-server={self._socket_file}'])
+        self._process = process
+        deadline = time.monotonic() + self._start_timeout
+        while True:
+            try:
+                return MpvClient(self._socket_file, self._on_event)
+            except OSError:
+                if process.poll() is not None:
+                    raise MpvError(f'{self.command} exited with {process.returncode}')
+                if time.monotonic() > deadline:
+                    raise MpvError(f'{self.command} did not open {self._socket_file}')
+                time.sleep(0.02)
+
+    def _on_event(self, event: Event) -> None:
+        if event['event'] == 'property-change' and event.get('id') == _PLAYLIST_OBSERVER_ID:
+            # entries that have been removed are kept, as their end-file can come afterwards
+            self._filenames.update((entry['id'], entry['filename'])
+                                   for entry in event.get('data') or [])
+        elif event['event'] == 'end-file':
+            entry_id: Optional[int] = event.get('playlist_entry_id')
+            filename = self._filenames.pop(entry_id, None) if entry_id is not None else None
+            # not when it was stopped, skipped or failed to load
+            if event.get('reason') == 'eof' and filename is not None \
+                    and self._on_finished is not None:
+                self._on_finished(filename)
@@ -0,0 +1,51 @@
+#    Interleave Playlist
+#    Copyright (C) 2026 Thomas Sweeney
+#    This file is part of Interleave Playlist.
+#    Interleave Playlist is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#    Interleave Playlist is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+import os
+import tempfile
+import time
+from pathlib import Path
+
+import appdirs
+
+import interleave_playlist
+from interleave_playlist.core import PlaylistEntry
+from interleave_playlist.core.export import write_m3u
+
+# Large selections are given to the player as one M3U8 file instead of a filename per argument,
+# which is slow to start and can go over the system's limit on argument length
+
+PLAYLIST_DIR = Path(os.path.join(appdirs.user_cache_dir(interleave_playlist.APP_NAME),
+                                 'playlists'))
+# players that hand off to an instance that's already running can return before it has read the
+# file, so files are left this long and cleaned up by a later play instead of straight away
+_MAX_AGE_S = 24 * 60 * 60
+
+
+def write_playlist_file(playlist: list[PlaylistEntry]) -> Path:
+    os.makedirs(PLAYLIST_DIR, exist_ok=True)
+    _remove_old_playlist_files()
+    fd, name = tempfile.mkstemp(suffix='.m3u8', prefix='play-', dir=PLAYLIST_DIR)
+    with open(fd, 'w', encoding='utf-8', newline='\n') as f:
+        write_m3u(playlist, f)
+    return Path(name)
+
+
+def _remove_old_playlist_files() -> None:
+    oldest = time.time() - _MAX_AGE_S
+    for entry in os.scandir(PLAYLIST_DIR):
+        try:
+            if entry.name.endswith('.m3u8') and entry.stat().st_mtime < oldest:
+                os.remove(entry.path)
+        except OSError:
+            pass
@@ -0,0 +1,208 @@
+#    Interleave Playlist
+#    Copyright (C) 2026 Thomas Sweeney
+#    This file is part of Interleave Playlist.
+#    Interleave Playlist is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#    Interleave Playlist is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+import hashlib
+import os
+import threading
+from pathlib import Path
+from typing import Any, Optional
+
+from interleave_playlist.core import PlaylistEntry
+from interleave_playlist.core.playlist import (FileGroup, get_locations_fingerprint, get_playlist,
+                                               next_up, sort_playlist, SORT_KEYS)
+from interleave_playlist.model import Location
+from interleave_playlist.persistence import input_, settings, state
+from interleave_playlist.persistence.watched import (get_watched, get_watched_file_name,
+                                                     update_watched_files)
+
+# Like cli, nothing in here may import PySide6
+
+# sorts that depend on when each file was last written rather than on the directory listings
+_MTIME_SORTS = {'LAST MODIFIED'}
+
+
+class UnknownFile(Exception):
+    pass
+
+
+# Accepts the names used on the command line (last-modified) as well as the ones in the settings
+def get_sort_name(value: str) -> str:
+    sort_name = value.upper().replace('-', ' ')
+    if sort_name not in SORT_KEYS:
+        raise ValueError(
+            f"invalid sort: {value} (choose from "
+            f"{', '.join(name.lower().replace(' ', '-') for name in SORT_KEYS)})")
+    return sort_name
+
+
+def get_input_file(input_file: Optional[Path]) -> Path:
+    input_file = input_file.resolve() if input_file else state.get_last_input_file()
+    if not input_file:
+        raise input_.InvalidInputFile('No input file has been opened yet. '
+                                      'Pass one with --input')
+    return input_file
+
+
+def build_playlist(input_file: Path,
+                   search_filter: str = '',
+                   sort_name: Optional[str] = None,
+                   reverse: Optional[bool] = None,
+                   limit: Optional[int] = None,
+                   use_cache: bool = False) -> list[PlaylistEntry]:
+    settings_ = settings.get_settings()
+    sort_name = sort_name or settings_.default_sort_name
+    reverse = settings_.default_sort_reversed if reverse is None else reverse
+    locations = input_.get_locations(input_file)
+    watched_list = get_watched(input_file)
+    if limit is not None and sort_name == 'INTERLEAVE' and not reverse:
+        # the start of the interleaved order can be worked out without the rest of it
+        return next_up(locations, watched_list, max(limit, 0), settings_, search_filter,
+                       use_cache=use_cache)
+    playlist = get_playlist(locations, watched_list, settings_, search_filter,
+                            use_cache=use_cache)
+    playlist = sort_playlist(playlist, sort_name, reverse)
+    if limit is not None:
+        playlist = playlist[:max(limit, 0)]
+    return playlist
+
+
+def _get_mtime(file: str) -> Optional[int]:
+    try:
+        return os.stat(file).st_mtime_ns
+    except OSError:
+        return None
+
+
+# Adding, removing or renaming a file changes the modification time of its directory, so these
+# say whether the cached listings of a location can still be trusted without listing it again
+def _get_directories_fingerprint(locations: list[Location]) -> tuple[Optional[int], ...]:
+    return tuple(_get_mtime(directory)
+                 for loc in locations
+                 for directory in [loc.name] + loc.additional)
+
+
+# Digest of the modification time of every file in the locations
+def _get_files_fingerprint(locations: list[Location]) -> str:
+    digest = hashlib.sha1()
+    for loc in locations:
+        for directory in [loc.name] + loc.additional:
+            try:
+                with os.scandir(directory) as entries:
+                    mtimes = sorted((entry.name, _get_entry_mtime(entry)) for entry in entries)
+            except OSError:
+                mtimes = []
+            digest.update(repr((directory, mtimes)).encode('utf-8'))
+    return digest.hexdigest()
+
+
+def _get_entry_mtime(entry: os.DirEntry[str]) -> Optional[int]:
+    try:
+        return entry.stat().st_mtime_ns
+    except OSError:
+        return None
+
+
+# Keeps the parsed inputs, directory listings and interleaving from one request to the next so a
+# long running process can answer straight away. Directories are only listed again once their
+# modification time changes. Requests are served one at a time since the caches are shared
+class PlaylistService:
+    def __init__(self) -> None:
+        self._lock = threading.RLock()
+        self._directories: dict[Path, tuple[Optional[int], ...]] = {}
+        self._fingerprints: dict[Path, tuple[Any, ...]] = {}
+        self._entries: dict[Path, dict[str, PlaylistEntry]] = {}
+
+    def get_playlist(self,
+                     input_file: Optional[Path] = None,
+                     search_filter: str = '',
+                     sort_name: Optional[str] = None,
+                     reverse: Optional[bool] = None,
+                     limit: Optional[int] = None) -> list[PlaylistEntry]:
+        with self._lock:
+            input_file = get_input_file(input_file)
+            directories = _get_directories_fingerprint(input_.get_locations(input_file))
+            use_cache = self._directories.get(input_file) == directories
+            playlist = build_playlist(input_file, search_filter, sort_name, reverse, limit,
+                                      use_cache)
+            self._directories[input_file] = directories
+            self._fingerprints[input_file] = self._get_fingerprint(input_file)
+            self._entries.setdefault(input_file, {}).update(
+                (entry.filename, entry) for entry in playlist)
+            return playlist
+
+    def mark_watched(self,
+                     filenames: list[str],
+                     watched: bool = True,
+                     input_file: Optional[Path] = None) -> Path:
+        with self._lock:
+            input_file = get_input_file(input_file)
+            changes: list[tuple[FileGroup, bool]] = []
+            for filename in filenames:
+                if not watched:
+                    changes.append(((filename, ''), False))
+                    continue
+                entry = self._find_entry(input_file, filename)
+                if entry is None:
+                    raise UnknownFile(f'{filename} is not in the playlist')
+                changes.append(((entry.filename, entry.group.name), True))
+            update_watched_files(changes, input_file)
+            self._fingerprints[input_file] = self._get_fingerprint(input_file)
+            return input_file
+
+    def get_watched(self, input_file: Optional[Path] = None) -> list[FileGroup]:
+        with self._lock:
+            return get_watched(get_input_file(input_file))
+
+    # Changes whenever anything a playlist of the input is built from might have, which is
+    # cheap to check without building it. Rewriting a file doesn't touch its directory, so when
+    # the playlist is sorted by the files' own modification times those are looked at as well
+    def get_version(self, input_file: Optional[Path] = None,
+                    sort_name: Optional[str] = None) -> str:
+        with self._lock:
+            input_file = get_input_file(input_file)
+            settings_ = settings.get_settings()
+            locations = input_.get_locations(input_file)
+            key: tuple[Any, ...] = (str(input_file), self._get_fingerprint(input_file),
+                                    get_locations_fingerprint(locations), settings_)
+            if (sort_name or settings_.default_sort_name) in _MTIME_SORTS:
+                key += (_get_files_fingerprint(locations),)
+            return hashlib.sha1(repr(key).encode('utf-8')).hexdigest()
+
+    # The inputs served before whose playlist may now be different, because their input, their
+    # watched list or one of their directories was changed by something else
+    def get_changed(self) -> list[Path]:
+        with self._lock:
+            changed = []
+            for input_file, fingerprint in self._fingerprints.items():
+                new_fingerprint = self._get_fingerprint(input_file)
+                if new_fingerprint != fingerprint:
+                    self._fingerprints[input_file] = new_fingerprint
+                    changed.append(input_file)
+            return changed
+
+    def _find_entry(self, input_file: Path, filename: str) -> Optional[PlaylistEntry]:
+        entries = self._entries.get(input_file, {})
+        if filename not in entries:
+            # only part of the playlist may have been asked for so far
+            self.get_playlist(input_file)
+            entries = self._entries[input_file]
+        return entries.get(filename)
+
+    @staticmethod
+    def _get_fingerprint(input_file: Path) -> tuple[Any, ...]:
+        try:
+            directories = _get_directories_fingerprint(input_.get_locations(input_file))
+        except (OSError, input_.InvalidInputFile, input_.LocationNotFound):
+            directories = ()
+        return (_get_mtime(str(input_file)), _get_mtime(get_watched_file_name(input_file)),
+                directories)
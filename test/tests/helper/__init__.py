@@ -11,14 +11,21 @@
 #    GNU General Public License for more details.
 #    You should have received a copy of the GNU General Public License
 #    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+import os
 import typing
 from os import PathLike
 from pathlib import Path
 from typing import Union, Any
 from unittest.mock import MagicMock
 
+import pytest
 from pytest_mock import MockerFixture
 
+# Timings are only checked when asked for, e.g. BENCHMARK=1 pytest -s, since they're at the
+# mercy of whatever else the machine is doing
+benchmark = pytest.mark.skipif(not os.environ.get('BENCHMARK'),
+                               reason='set BENCHMARK=1 to run benchmarks')
+
 
 class ListdirMock:
 
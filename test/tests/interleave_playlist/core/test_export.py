@@ -0,0 +1,50 @@
+#    Interleave Playlist
+#    Copyright (C) 2026 Thomas Sweeney
+#    This file is part of Interleave Playlist.
+#    Interleave Playlist is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#    Interleave Playlist is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+import io
+import json
+
+from interleave_playlist.core import PlaylistEntry
+from interleave_playlist.core.export import to_json, to_m3u, to_text, write_m3u
+from interleave_playlist.model import Group, Location
+
+GROUP = Group('show', '/a')
+PLAYLIST = [PlaylistEntry('/a/show 1.mkv', Location('/a', GROUP), GROUP),
+            PlaylistEntry('/a/b, c.mkv', Location('/a', GROUP), GROUP)]
+
+
+def test_to_text() -> None:
+    assert to_text(PLAYLIST) == '/a/show 1.mkv\n/a/b, c.mkv\n'
+    assert to_text([]) == ''
+
+
+def test_to_json() -> None:
+    assert json.loads(to_json(PLAYLIST)) == [
+        {'filename': '/a/show 1.mkv', 'location': '/a', 'group': 'show'},
+        {'filename': '/a/b, c.mkv', 'location': '/a', 'group': 'show'},
+    ]
+
+
+def test_to_m3u() -> None:
+    assert to_m3u(PLAYLIST) == ('#EXTM3U\n'
+                                '#EXTINF:-1,show 1.mkv\n'
+                                '/a/show 1.mkv\n'
+                                '#EXTINF:-1,b, c.mkv\n'
+                                '/a/b, c.mkv\n')
+    assert to_m3u([]) == '#EXTM3U\n'
+
+
+def test_write_m3u() -> None:
+    f = io.StringIO()
+    write_m3u(iter(PLAYLIST), f)
+    assert f.getvalue() == to_m3u(PLAYLIST)
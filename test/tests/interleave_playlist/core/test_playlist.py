@@ -12,6 +12,7 @@
 #    You should have received a copy of the GNU General Public License
 #    along with this program.  If not, see <http://www.gnu.org/licenses/>.
 import pathlib
+from os import path
 from datetime import datetime, timedelta
 
 import pytest
@@ -19,8 +20,10 @@ from crontab import CronTab
 from freezegun import freeze_time
 from pytest_mock import MockerFixture
 
-from interleave_playlist.core import PlaylistEntry, playlist
-from interleave_playlist.core.playlist import get_playlist
+from interleave_playlist.core import PlaylistEntry, playlist, natsort_key
+from interleave_playlist.core.cancellation import CancellationToken, Cancelled
+from interleave_playlist.core.playlist import get_playlist, next_up
+from interleave_playlist.core.search import TrigramIndex
 from interleave_playlist.model import Location, Group, Timed, Weight
 from interleave_playlist.persistence import settings
 from tests.helper import mock_listdir, get_mock_open, get_mock_isfile
@@ -39,10 +42,15 @@ B_DIR = str(B_DIR_PATH)
 def before_each() -> None:
     settings._CACHED_FILE = {}
     playlist._FILE_CACHE = {}
+    playlist._NATSORT_KEY_CACHE = {}
+    playlist._CANDIDATES_CACHE = None
+    playlist._SEARCH_CACHE = None
+    playlist._POSITIONS_CACHE = None
+    playlist._SEARCH_INDEX = TrigramIndex()
 
 
 def test_get_playlist_with_no_locations() -> None:
-    actual = get_playlist([], [])
+    actual = get_playlist([], [], settings.get_settings())
     expected: list[PlaylistEntry] = []
     assert actual == expected
 
@@ -54,7 +62,7 @@ def test_get_playlist_with_one_location_empty(mocker: MockerFixture) -> None:
 
     group = Group(A_DIR)
     location = Location(A_DIR, group)
-    actual = get_playlist([location], watched_list=[])
+    actual = get_playlist([location], [], settings.get_settings())
     expected: list[PlaylistEntry] = []
     assert actual == expected
 
@@ -66,7 +74,7 @@ def test_get_playlist_with_one_location_one_file(mocker: MockerFixture) -> None:
 
     group = Group(A_DIR)
     location = Location(A_DIR, group)
-    actual = get_playlist([location], watched_list=[])
+    actual = get_playlist([location], [], settings.get_settings())
     expected = [PlaylistEntry(str(A_DIR_PATH / 'foo.mkv'), location, group)]
     assert actual == expected
 
@@ -78,7 +86,7 @@ def test_get_playlist_with_one_location_many_files(mocker: MockerFixture) -> Non
 
     group = Group(A_DIR)
     location = Location(A_DIR, group)
-    actual = get_playlist([location], watched_list=[])
+    actual = get_playlist([location], [], settings.get_settings())
     expected = [
         PlaylistEntry(str(A_DIR_PATH / 'foo.mkv'), location, group),
         PlaylistEntry(str(A_DIR_PATH / 'bar.mkv'), location, group),
@@ -98,7 +106,7 @@ def test_get_playlist_with_many_locations_no_files(mocker: MockerFixture) -> Non
     al = Location(A_DIR, ag)
     bg = Group(B_DIR)
     bl = Location(B_DIR, bg)
-    actual = get_playlist([al, bl], watched_list=[])
+    actual = get_playlist([al, bl], [], settings.get_settings())
     expected: list[PlaylistEntry] = []
     assert set(actual) == set(expected)
 
@@ -115,7 +123,7 @@ def test_get_playlist_with_many_locations_one_file(mocker: MockerFixture) -> Non
     al = Location(A_DIR, ag)
     bg = Group(B_DIR)
     bl = Location(B_DIR, bg)
-    actual = get_playlist([al, bl], watched_list=[])
+    actual = get_playlist([al, bl], [], settings.get_settings())
     expected = [
         PlaylistEntry(str(A_DIR_PATH / 'foo.mkv'), al, ag),
         PlaylistEntry(str(B_DIR_PATH / 'bar.mkv'), bl, bg),
@@ -135,7 +143,7 @@ def test_get_playlist_with_many_locations_many_files(mocker: MockerFixture) -> N
     al = Location(A_DIR, ag)
     bg = Group(B_DIR)
     bl = Location(B_DIR, bg)
-    actual = get_playlist([al, bl], watched_list=[])
+    actual = get_playlist([al, bl], [], settings.get_settings())
     expected = [
         PlaylistEntry(str(A_DIR_PATH / 'foo.mkv'), al, ag),
         PlaylistEntry(str(A_DIR_PATH / 'hooplah.mkv'), al, ag),
@@ -157,7 +165,7 @@ def test_get_playlist_with_many_locations_many_duplicate_files(mocker: MockerFix
     al = Location(A_DIR, ag)
     bg = Group(B_DIR)
     bl = Location(B_DIR, bg)
-    actual = get_playlist([al, bl], watched_list=[])
+    actual = get_playlist([al, bl], [], settings.get_settings())
     expected = [
         PlaylistEntry(str(A_DIR_PATH / 'bar.mkv'), al, ag),
         PlaylistEntry(str(B_DIR_PATH / 'bar.mkv'), bl, bg),
@@ -178,7 +186,7 @@ def test_get_playlist_with_duplicate_locations_no_files(mocker: MockerFixture) -
     al = Location(A_DIR, ag)
     aag = Group(A_DIR)
     aal = Location(A_DIR, aag)
-    actual = get_playlist([al, aal], watched_list=[])
+    actual = get_playlist([al, aal], [], settings.get_settings())
     expected: list[PlaylistEntry] = []
     assert set(actual) == set(expected)
 
@@ -194,7 +202,7 @@ def test_get_playlist_with_duplicate_locations_one_file(mocker: MockerFixture) -
     al = Location(A_DIR, ag)
     aag = Group(A_DIR)
     aal = Location(A_DIR, aag)
-    actual = get_playlist([al, aal], watched_list=[])
+    actual = get_playlist([al, aal], [], settings.get_settings())
     expected = [
         PlaylistEntry(str(A_DIR_PATH / 'foo.mkv'), al, ag),
     ]
@@ -212,7 +220,7 @@ def test_get_playlist_with_duplicate_locations_many_files(mocker: MockerFixture)
     al = Location(A_DIR, ag)
     aag = Group(A_DIR)
     aal = Location(A_DIR, aag)
-    actual = get_playlist([al, aal], watched_list=[])
+    actual = get_playlist([al, aal], [], settings.get_settings())
     expected = [
         PlaylistEntry(str(A_DIR_PATH / 'foo.mkv'), al, ag),
         PlaylistEntry(str(A_DIR_PATH / 'bar.mkv'), al, ag),
@@ -227,7 +235,7 @@ def test_get_playlist_with_one_location_with_no_files_with_regex(mocker: MockerF
 
     group = Group(A_DIR)
     location = Location(A_DIR, group, regex='.+\\.mkv')
-    actual = get_playlist([location], watched_list=[])
+    actual = get_playlist([location], [], settings.get_settings())
     expected: list[PlaylistEntry] = []
     assert set(actual) == set(expected)
 
@@ -240,7 +248,7 @@ def test_get_playlist_with_one_location_with_no_files_with_group_regex(
 
     group = Group(A_DIR)
     location = Location(A_DIR, group, regex='(?P<group>.+)\\.mkv')
-    actual = get_playlist([location], watched_list=[])
+    actual = get_playlist([location], [], settings.get_settings())
     expected: list[PlaylistEntry] = []
     assert set(actual) == set(expected)
 
@@ -253,7 +261,7 @@ def test_get_playlist_with_one_location_with_files_with_regex_no_matches(
 
     group = Group(A_DIR)
     location = Location(A_DIR, group, regex='.+\\.mkv')
-    actual = get_playlist([location], watched_list=[])
+    actual = get_playlist([location], [], settings.get_settings())
     expected: list[PlaylistEntry] = []
     assert set(actual) == set(expected)
 
@@ -266,7 +274,7 @@ def test_get_playlist_with_one_location_with_files_with_group_regex_no_matches(
 
     group = Group(A_DIR)
     location = Location(A_DIR, group, regex='(?P<group>.+)\\.mkv')
-    actual = get_playlist([location], watched_list=[])
+    actual = get_playlist([location], [], settings.get_settings())
     expected: list[PlaylistEntry] = []
     assert set(actual) == set(expected)
 
@@ -278,7 +286,7 @@ def test_get_playlist_with_one_location_with_files_one_regex_match(mocker: Mocke
 
     group = Group(A_DIR)
     location = Location(A_DIR, group, regex='.+\\.mkv')
-    actual = get_playlist([location], watched_list=[])
+    actual = get_playlist([location], [], settings.get_settings())
     expected = [PlaylistEntry(str(A_DIR_PATH / 'foo.mkv'), location, group)]
     assert set(actual) == set(expected)
 
@@ -290,7 +298,7 @@ def test_get_playlist_with_one_location_one_regex_group(mocker: MockerFixture) -
 
     group = Group(A_DIR)
     location = Location(A_DIR, group, regex='(?P<group>.+)\\.mkv')
-    actual = get_playlist([location], watched_list=[])
+    actual = get_playlist([location], [], settings.get_settings())
     expected = [PlaylistEntry(str(A_DIR_PATH / 'foo.mkv'), location, Group('foo'))]
     assert set(actual) == set(expected)
 
@@ -302,7 +310,7 @@ def test_get_playlist_with_one_location_many_regex_groups(mocker: MockerFixture)
 
     group = Group(A_DIR)
     location = Location(A_DIR, group, regex='(?P<group>[a-z]+).*\\.mkv')
-    actual = get_playlist([location], watched_list=[])
+    actual = get_playlist([location], [], settings.get_settings())
     expected = [
         PlaylistEntry(str(A_DIR_PATH / 'foo 1.mkv'), location, Group('foo')),
         PlaylistEntry(str(A_DIR_PATH / 'bar 1.mkv'), location, Group('bar')),
@@ -320,7 +328,7 @@ def test_get_playlist_with_one_location_many_regex_groups_many_files_each(
 
     group = Group(A_DIR)
     location = Location(A_DIR, group, regex='(?P<group>[a-z]+).*\\.mkv')
-    actual = get_playlist([location], watched_list=[])
+    actual = get_playlist([location], [], settings.get_settings())
     expected = [
         PlaylistEntry(str(A_DIR_PATH / 'foo 1.mkv'), location, Group('foo')),
         PlaylistEntry(str(A_DIR_PATH / 'foo 2.mkv'), location, Group('foo')),
@@ -340,7 +348,7 @@ def test_get_playlist_with_one_location_many_regex_groups_many_files_each_interl
 
     group = Group(A_DIR)
     location = Location(A_DIR, group, regex='(?P<group>[a-z]+).*\\.mkv')
-    actual = get_playlist([location], watched_list=[])
+    actual = get_playlist([location], [], settings.get_settings())
     expected = [
         PlaylistEntry(str(A_DIR_PATH / 'bar 1.mkv'), location, Group('bar')),
         PlaylistEntry(str(A_DIR_PATH / 'foo 1.mkv'), location, Group('foo')),
@@ -362,7 +370,7 @@ def test_get_playlist_with_many_locations_with_regex_with_no_matches(mocker: Moc
     al = Location(A_DIR, ag, regex='[A-Z]+.+\\.mkv')
     bg = Group(B_DIR)
     bl = Location(B_DIR, bg, regex='[A-Z]+.+\\.mkv')
-    actual = get_playlist([al, bl], watched_list=[])
+    actual = get_playlist([al, bl], [], settings.get_settings())
     expected: list[PlaylistEntry] = []
     assert set(actual) == set(expected)
 
@@ -380,7 +388,7 @@ def test_get_playlist_with_many_locations_with_regex_group_with_no_groups(
     al = Location(A_DIR, ag, regex='(?P<group>[A-Z]+).*\\.mkv')
     bg = Group(B_DIR)
     bl = Location(B_DIR, bg, regex='(?P<group>[A-Z]+).*\\.mkv')
-    actual = get_playlist([al, bl], watched_list=[])
+    actual = get_playlist([al, bl], [], settings.get_settings())
     expected: list[PlaylistEntry] = []
     assert set(actual) == set(expected)
 
@@ -397,7 +405,7 @@ def test_get_playlist_with_many_locations_one_regex_match_each(mocker: MockerFix
     al = Location(A_DIR, ag, regex='[a-z]+.*\\.mkv')
     bg = Group(B_DIR)
     bl = Location(B_DIR, bg, regex='[a-z]+.*\\.mkv')
-    actual = get_playlist([al, bl], watched_list=[])
+    actual = get_playlist([al, bl], [], settings.get_settings())
     expected = [
         PlaylistEntry(str(A_DIR_PATH / 'foo.mkv'), al, Group(A_DIR)),
         PlaylistEntry(str(B_DIR_PATH / 'bar.mkv'), bl, Group(B_DIR)),
@@ -417,7 +425,7 @@ def test_get_playlist_with_many_locations_one_regex_group_each(mocker: MockerFix
     al = Location(A_DIR, ag, regex='(?P<group>[a-z]+).*\\.mkv')
     bg = Group(B_DIR)
     bl = Location(B_DIR, bg, regex='(?P<group>[a-z]+).*\\.mkv')
-    actual = get_playlist([al, bl], watched_list=[])
+    actual = get_playlist([al, bl], [], settings.get_settings())
     expected = [
         PlaylistEntry(str(A_DIR_PATH / 'foo.mkv'), al, Group('foo')),
         PlaylistEntry(str(B_DIR_PATH / 'bar.mkv'), bl, Group('bar')),
@@ -437,7 +445,7 @@ def test_get_playlist_with_many_locations_many_regex_matches_each(mocker: Mocker
     al = Location(A_DIR, ag, regex='[a-z]+.*\\.mkv')
     bg = Group(B_DIR)
     bl = Location(B_DIR, bg, regex='[a-z]+.*\\.mkv')
-    actual = get_playlist([al, bl], watched_list=[])
+    actual = get_playlist([al, bl], [], settings.get_settings())
     expected = [
         PlaylistEntry(str(A_DIR_PATH / 'foo 1.mkv'), al, Group(A_DIR)),
         PlaylistEntry(str(A_DIR_PATH / 'foo 2.mkv'), al, Group(A_DIR)),
@@ -460,7 +468,7 @@ def test_get_playlist_with_many_locations_many_regex_matches_each_interleaved(
     al = Location(A_DIR, ag, regex='[a-z]+.*\\.mkv')
     bg = Group(B_DIR)
     bl = Location(B_DIR, bg, regex='[a-z]+.*\\.mkv')
-    actual = get_playlist([al, bl], watched_list=[])
+    actual = get_playlist([al, bl], [], settings.get_settings())
     expected = [
         PlaylistEntry(str(A_DIR_PATH / 'foo 1.mkv'), al, Group(A_DIR)),
         PlaylistEntry(str(B_DIR_PATH / 'bar 1.mkv'), bl, Group(B_DIR)),
@@ -482,7 +490,7 @@ def test_get_playlist_with_many_locations_many_regex_groups_each(mocker: MockerF
     al = Location(A_DIR, ag, regex='(?P<group>[a-z]+).*\\.mkv')
     bg = Group(B_DIR)
     bl = Location(B_DIR, bg, regex='(?P<group>[a-z]+).*\\.mkv')
-    actual = get_playlist([al, bl], watched_list=[])
+    actual = get_playlist([al, bl], [], settings.get_settings())
     expected = [
         PlaylistEntry(str(A_DIR_PATH / 'foo 1.mkv'), al, Group('foo')),
         PlaylistEntry(str(A_DIR_PATH / 'foo 2.mkv'), al, Group('foo')),
@@ -505,7 +513,7 @@ def test_get_playlist_with_many_locations_many_regex_group_files_each_interleave
     al = Location(A_DIR, ag, regex='(?P<group>[a-z]+).*\\.mkv')
     bg = Group(B_DIR)
     bl = Location(B_DIR, bg, regex='(?P<group>[a-z]+).*\\.mkv')
-    actual = get_playlist([al, bl], watched_list=[])
+    actual = get_playlist([al, bl], [], settings.get_settings())
     expected = [
         PlaylistEntry(str(B_DIR_PATH / 'bar 1.mkv'), bl, Group('bar')),
         PlaylistEntry(str(A_DIR_PATH / 'foo 1.mkv'), al, Group('foo')),
@@ -532,7 +540,7 @@ def test_get_playlist_with_many_locations_many_regex_groups_each_interleaved(
     al = Location(A_DIR, ag, regex='(?P<group>[a-z]+).*\\.mkv')
     bg = Group(B_DIR)
     bl = Location(B_DIR, bg, regex='(?P<group>[a-z]+).*\\.mkv')
-    actual = get_playlist([al, bl], watched_list=[])
+    actual = get_playlist([al, bl], [], settings.get_settings())
     expected = [
         PlaylistEntry(str(A_DIR_PATH / 'bar 1.mkv'), al, bar_group),
         PlaylistEntry(str(B_DIR_PATH / 'cat 1.mkv'), bl, cat_group),
@@ -559,7 +567,7 @@ def test_get_playlist_with_many_locations_many_regex_groups_each_with_groups_cro
     al = Location(A_DIR, ag, regex='(?P<group>[a-z]+).*\\.mkv')
     bg = Group(B_DIR, B_DIR)
     bl = Location(B_DIR, bg, regex='(?P<group>[a-z]+).*\\.mkv')
-    actual = get_playlist([al, bl], watched_list=[])
+    actual = get_playlist([al, bl], [], settings.get_settings())
     expected = [
         PlaylistEntry(str(A_DIR_PATH / 'foo 1.mkv'), al, Group('foo', A_DIR)),
         PlaylistEntry(str(B_DIR_PATH / 'foo 2.mkv'), bl, Group('foo', B_DIR)),
@@ -582,7 +590,7 @@ def test_get_playlist_with_many_locations_many_regex_groups_each_with_groups_cro
     al = Location(A_DIR, ag, regex='[AB]-(?P<group>[a-z]+).*\\.mkv')
     bg = Group(B_DIR, B_DIR, whitelist=['bar'])
     bl = Location(B_DIR, bg, regex='[AB]-(?P<group>[a-z]+).*\\.mkv', groups=[foo_b_group])
-    actual = get_playlist([al, bl], watched_list=[])
+    actual = get_playlist([al, bl], [], settings.get_settings())
     expected = [
         PlaylistEntry(str(A_DIR_PATH / 'A-foo 1.mkv'), al, Group('foo', A_DIR)),
         PlaylistEntry(str(A_DIR_PATH / 'A-bar 1.mkv'), al, Group('bar', A_DIR)),
@@ -604,7 +612,7 @@ def test_get_playlist_with_one_location_using_regex_other_no_regex_interleaved(
     al = Location(A_DIR, ag, regex='(?P<group>[a-z]+).*\\.mkv')
     bg = Group(B_DIR)
     bl = Location(B_DIR, bg)
-    actual = get_playlist([al, bl], watched_list=[])
+    actual = get_playlist([al, bl], [], settings.get_settings())
     expected = [
         PlaylistEntry(str(B_DIR_PATH / 'bar 1.mkv'), bl, Group(B_DIR)),
         PlaylistEntry(str(A_DIR_PATH / 'foo 1.mkv'), al, Group('foo')),
@@ -623,7 +631,7 @@ def test_get_playlist_with_one_location_with_priority(mocker: MockerFixture) ->
 
     ag = Group(A_DIR, priority=1)
     al = Location(A_DIR, ag)
-    actual = get_playlist([al], watched_list=[])
+    actual = get_playlist([al], [], settings.get_settings())
     expected = [
         PlaylistEntry(str(A_DIR_PATH / 'foo 1.mkv'), al, Group(A_DIR, priority=1)),
         PlaylistEntry(str(A_DIR_PATH / 'foo 2.mkv'), al, Group(A_DIR, priority=1)),
@@ -643,7 +651,7 @@ def test_get_playlist_with_many_locations_with_same_priority(mocker: MockerFixtu
     al = Location(A_DIR, ag)
     bg = Group(B_DIR, priority=1)
     bl = Location(B_DIR, bg)
-    actual = get_playlist([al, bl], watched_list=[])
+    actual = get_playlist([al, bl], [], settings.get_settings())
     expected = [
         PlaylistEntry(str(A_DIR_PATH / 'foo 1.mkv'), al, Group(A_DIR, priority=1)),
         PlaylistEntry(str(B_DIR_PATH / 'bar 1.mkv'), bl, Group(B_DIR, priority=1)),
@@ -666,7 +674,7 @@ def test_get_playlist_with_many_locations_with_one_priority_one_no_priority(
     al = Location(A_DIR, ag)
     bg = Group(B_DIR, priority=1)
     bl = Location(B_DIR, bg)
-    actual = get_playlist([al, bl], watched_list=[])
+    actual = get_playlist([al, bl], [], settings.get_settings())
     expected = [
         PlaylistEntry(str(B_DIR_PATH / 'bar 1.mkv'), bl, Group(B_DIR, priority=1)),
         PlaylistEntry(str(B_DIR_PATH / 'bar 2.mkv'), bl, Group(B_DIR, priority=1)),
@@ -688,7 +696,7 @@ def test_get_playlist_with_many_locations_different_priorities(mocker: MockerFix
     al = Location(A_DIR, ag)
     bg = Group(B_DIR, priority=1)
     bl = Location(B_DIR, bg)
-    actual = get_playlist([al, bl], watched_list=[])
+    actual = get_playlist([al, bl], [], settings.get_settings())
     expected = [
         PlaylistEntry(str(B_DIR_PATH / 'bar 1.mkv'), bl, Group(B_DIR, priority=1)),
         PlaylistEntry(str(B_DIR_PATH / 'bar 2.mkv'), bl, Group(B_DIR, priority=1)),
@@ -708,7 +716,7 @@ def test_get_playlist_with_one_location_many_regex_groups_same_priorities(
 
     ag = Group(A_DIR, priority=1)
     al = Location(A_DIR, ag, regex='(?P<group>[a-z]+).*\\.mkv')
-    actual = get_playlist([al], watched_list=[])
+    actual = get_playlist([al], [], settings.get_settings())
     expected = [
         PlaylistEntry(str(A_DIR_PATH / 'bar 1.mkv'), al, Group('bar', priority=1)),
         PlaylistEntry(str(A_DIR_PATH / 'foo 1.mkv'), al, Group('foo', priority=1)),
@@ -730,7 +738,7 @@ def test_get_playlist_with_one_location_many_regex_groups_same_priority_group_ov
     foo_g = Group('foo', priority=1)
     bar_g = Group('bar', priority=2)
     al = Location(A_DIR, ag, regex='(?P<group>[a-z]+).*\\.mkv', groups=[foo_g, bar_g])
-    actual = get_playlist([al], watched_list=[])
+    actual = get_playlist([al], [], settings.get_settings())
     expected = [
         PlaylistEntry(str(A_DIR_PATH / 'foo 1.mkv'), al, foo_g),
         PlaylistEntry(str(A_DIR_PATH / 'foo 2.mkv'), al, foo_g),
@@ -752,7 +760,7 @@ def test_get_playlist_with_one_location_many_regex_groups_same_priority_group_su
     foo_g = Group('fo', priority=1)
     bar_g = Group('ba', priority=2)
     al = Location(A_DIR, ag, regex='(?P<group>[a-z]+).*\\.mkv', groups=[foo_g, bar_g])
-    actual = get_playlist([al], watched_list=[])
+    actual = get_playlist([al], [], settings.get_settings())
     expected = [
         PlaylistEntry(str(A_DIR_PATH / 'foo 1.mkv'), al, foo_g),
         PlaylistEntry(str(A_DIR_PATH / 'foo 2.mkv'), al, foo_g),
@@ -773,7 +781,7 @@ def test_get_playlist_with_one_location_many_regex_groups_same_priority_group_su
     foo_g = Group('fO', priority=1)
     bar_g = Group('Ba', priority=2)
     al = Location(A_DIR, ag, regex='(?P<group>[a-z]+).*\\.mkv', groups=[foo_g, bar_g])
-    actual = get_playlist([al], watched_list=[])
+    actual = get_playlist([al], [], settings.get_settings())
     expected = [
         PlaylistEntry(str(A_DIR_PATH / 'foo 1.mkv'), al, foo_g),
         PlaylistEntry(str(A_DIR_PATH / 'foo 2.mkv'), al, foo_g),
@@ -795,7 +803,7 @@ def test_get_playlist_with_one_location_many_regex_groups_one_with_priority_one_
     foo_g = Group('foo')
     bar_g = Group('bar', priority=1)
     al = Location(A_DIR, ag, regex='(?P<group>[a-z]+).*\\.mkv', groups=[foo_g, bar_g])
-    actual = get_playlist([al], watched_list=[])
+    actual = get_playlist([al], [], settings.get_settings())
     expected = [
         PlaylistEntry(str(A_DIR_PATH / 'bar 1.mkv'), al, bar_g),
         PlaylistEntry(str(A_DIR_PATH / 'bar 2.mkv'), al, bar_g),
@@ -817,7 +825,7 @@ def test_get_playlist_with_one_location_many_regex_groups_different_priorities(
     foo_g = Group('foo', priority=2)
     bar_g = Group('bar', priority=1)
     al = Location(A_DIR, ag, regex='(?P<group>[a-z]+).*\\.mkv', groups=[foo_g, bar_g])
-    actual = get_playlist([al], watched_list=[])
+    actual = get_playlist([al], [], settings.get_settings())
     expected = [
         PlaylistEntry(str(A_DIR_PATH / 'bar 1.mkv'), al, bar_g),
         PlaylistEntry(str(A_DIR_PATH / 'bar 2.mkv'), al, bar_g),
@@ -842,7 +850,7 @@ def test_get_playlist_with_many_location_many_regex_groups_same_priorities(
     bg = Group(B_DIR, priority=1)
     bar_g = Group('bar', priority=1)
     bl = Location(B_DIR, bg, regex='(?P<group>[a-z]+).*\\.mkv')
-    actual = get_playlist([al, bl], watched_list=[])
+    actual = get_playlist([al, bl], [], settings.get_settings())
     expected = [
         PlaylistEntry(str(B_DIR_PATH / 'bar 1.mkv'), bl, bar_g),
         PlaylistEntry(str(A_DIR_PATH / 'foo 1.mkv'), al, foo_g),
@@ -867,7 +875,7 @@ def test_get_playlist_with_many_location_many_regex_groups_one_with_one_without_
     bg = Group(B_DIR, priority=1)
     bar_g = Group('bar', priority=1)
     bl = Location(B_DIR, bg, regex='(?P<group>[a-z]+).*\\.mkv')
-    actual = get_playlist([al, bl], watched_list=[])
+    actual = get_playlist([al, bl], [], settings.get_settings())
     expected = [
         PlaylistEntry(str(B_DIR_PATH / 'bar 1.mkv'), bl, bar_g),
         PlaylistEntry(str(B_DIR_PATH / 'bar 2.mkv'), bl, bar_g),
@@ -892,7 +900,7 @@ def test_get_playlist_with_many_location_many_regex_groups_different_priorities(
     bg = Group(B_DIR, priority=1)
     bar_g = Group('bar', priority=1)
     bl = Location(B_DIR, bg, regex='(?P<group>[a-z]+).*\\.mkv')
-    actual = get_playlist([al, bl], watched_list=[])
+    actual = get_playlist([al, bl], [], settings.get_settings())
     expected = [
         PlaylistEntry(str(B_DIR_PATH / 'bar 1.mkv'), bl, bar_g),
         PlaylistEntry(str(B_DIR_PATH / 'bar 2.mkv'), bl, bar_g),
@@ -917,7 +925,7 @@ def test_get_playlist_with_many_location_many_regex_groups_different_priorities_
     bg = Group(B_DIR, priority=2)
     bar_g = Group('bar', priority=1)
     bl = Location(B_DIR, bg, regex='(?P<group>[a-z]+).*\\.mkv', groups=[bar_g])
-    actual = get_playlist([al, bl], watched_list=[])
+    actual = get_playlist([al, bl], [], settings.get_settings())
     expected = [
         PlaylistEntry(str(B_DIR_PATH / 'bar 1.mkv'), bl, bar_g),
         PlaylistEntry(str(B_DIR_PATH / 'bar 2.mkv'), bl, bar_g),
@@ -936,7 +944,7 @@ def test_get_playlist_with_search_empty_string_no_op(mocker: MockerFixture) -> N
 
     ag = Group(A_DIR)
     al = Location(A_DIR, ag)
-    actual = get_playlist([al], watched_list=[], search_filter='')
+    actual = get_playlist([al], [], settings.get_settings(), search_filter='')
     expected = [
         PlaylistEntry(str(A_DIR_PATH / 'foo 1.mkv'), al, ag),
         PlaylistEntry(str(A_DIR_PATH / 'foo 2.mkv'), al, ag),
@@ -953,7 +961,7 @@ def test_get_playlist_with_search_filter_no_entries_none_matching(mocker: Mocker
 
     ag = Group(A_DIR)
     al = Location(A_DIR, ag)
-    actual = get_playlist([al], watched_list=[], search_filter='bar 1.mkv')
+    actual = get_playlist([al], [], settings.get_settings(), search_filter='bar 1.mkv')
     expected: list[PlaylistEntry] = []
     assert actual == expected
 
@@ -967,7 +975,7 @@ def test_get_playlist_with_search_filter_none_matching(mocker: MockerFixture) ->
 
     ag = Group(A_DIR)
     al = Location(A_DIR, ag)
-    actual = get_playlist([al], watched_list=[], search_filter='bar 1.mkv')
+    actual = get_playlist([al], [], settings.get_settings(), search_filter='bar 1.mkv')
     expected: list[PlaylistEntry] = []
     assert actual == expected
 
@@ -981,7 +989,7 @@ def test_get_playlist_with_search_filter_matching_exact(mocker: MockerFixture) -
 
     ag = Group(A_DIR)
     al = Location(A_DIR, ag)
-    actual = get_playlist([al], watched_list=[], search_filter='foo 1.mkv')
+    actual = get_playlist([al], [], settings.get_settings(), search_filter='foo 1.mkv')
     expected = [
         PlaylistEntry(str(A_DIR_PATH / 'foo 1.mkv'), al, ag),
     ]
@@ -997,7 +1005,7 @@ def test_get_playlist_with_search_filter_matching_subset(mocker: MockerFixture)
 
     ag = Group(A_DIR)
     al = Location(A_DIR, ag)
-    actual = get_playlist([al], watched_list=[], search_filter='1.mkv')
+    actual = get_playlist([al], [], settings.get_settings(), search_filter='1.mkv')
     expected = [
         PlaylistEntry(str(A_DIR_PATH / 'foo 1.mkv'), al, ag),
     ]
@@ -1014,7 +1022,7 @@ def test_get_playlist_with_search_filter_matching_subset_case_insensitive(
 
     ag = Group(A_DIR)
     al = Location(A_DIR, ag)
-    actual = get_playlist([al], watched_list=[], search_filter='FoO 1.mKv')
+    actual = get_playlist([al], [], settings.get_settings(), search_filter='FoO 1.mKv')
     expected = [
         PlaylistEntry(str(A_DIR_PATH / 'foo 1.mkv'), al, ag),
     ]
@@ -1034,7 +1042,7 @@ def test_get_playlist_with_search_filter_with_many_locations_interleaved(
     al = Location(A_DIR, ag)
     bg = Group(B_DIR)
     bl = Location(B_DIR, bg)
-    actual = get_playlist([al, bl], watched_list=[], search_filter='1')
+    actual = get_playlist([al, bl], [], settings.get_settings(), search_filter='1')
     expected = [
         PlaylistEntry(str(A_DIR_PATH / 'foo 1.mkv'), al, ag),
         PlaylistEntry(str(B_DIR_PATH / 'bar 1.mkv'), bl, bg),
@@ -1056,7 +1064,7 @@ def test_get_playlist_with_search_filter_with_many_groups_interleaved(
     al = Location(A_DIR, ag, regex='(?P<group>[a-z]+).*\\.mkv')
     foo_group = Group('foo')
     bar_group = Group('bar')
-    actual = get_playlist([al], watched_list=[], search_filter='1')
+    actual = get_playlist([al], [], settings.get_settings(), search_filter='1')
     expected = [
         PlaylistEntry(str(A_DIR_PATH / 'bar 1.mkv'), al, bar_group),
         PlaylistEntry(str(A_DIR_PATH / 'foo 1.mkv'), al, foo_group),
@@ -1083,7 +1091,7 @@ def test_get_playlist_with_search_filter_with_many_locations_and_groups_interlea
     bar_group = Group('bar')
     cat_group = Group('cat')
     dog_group = Group('dog')
-    actual = get_playlist([al, bl], watched_list=[], search_filter='1')
+    actual = get_playlist([al, bl], [], settings.get_settings(), search_filter='1')
     expected = [
         PlaylistEntry(str(A_DIR_PATH / 'bar 1.mkv'), al, bar_group),
         PlaylistEntry(str(B_DIR_PATH / 'cat 1.mkv'), bl, cat_group),
@@ -1114,7 +1122,7 @@ def test_get_playlist_with_search_filter_with_many_groups_different_priorities_i
     al = Location(A_DIR, ag, regex='(?P<group>[a-z]+).*\\.mkv', groups=[foo_group])
     bg = Group(B_DIR)
     bl = Location(B_DIR, bg, regex='(?P<group>[a-z]+).*\\.mkv', groups=[dog_group])
-    actual = get_playlist([al, bl], watched_list=[], search_filter='1')
+    actual = get_playlist([al, bl], [], settings.get_settings(), search_filter='1')
     expected = [
         PlaylistEntry(str(B_DIR_PATH / 'dog 1.mkv'), bl, dog_group),
         PlaylistEntry(str(A_DIR_PATH / 'foo 1.mkv'), al, foo_group),
@@ -1137,7 +1145,7 @@ def test_get_playlist_with_search_ignoring_directory(mocker: MockerFixture) -> N
 
     ag = Group(A_DIR)
     al = Location(A_DIR, ag)
-    actual = get_playlist([al], watched_list=[], search_filter=A_DIR)
+    actual = get_playlist([al], [], settings.get_settings(), search_filter=A_DIR)
     expected: list[PlaylistEntry] = []
     assert actual == expected
 
@@ -1151,7 +1159,7 @@ def test_get_playlist_with_whitelist_no_entries_none_matching(mocker: MockerFixt
 
     ag = Group(A_DIR, whitelist=['1'])
     al = Location(A_DIR, ag)
-    actual = get_playlist([al], watched_list=[])
+    actual = get_playlist([al], [], settings.get_settings())
     expected: list[PlaylistEntry] = []
     assert actual == expected
 
@@ -1165,7 +1173,7 @@ def test_get_playlist_with_whitelist_none_matching(mocker: MockerFixture) -> Non
 
     ag = Group(A_DIR, whitelist=['3'])
     al = Location(A_DIR, ag)
-    actual = get_playlist([al], watched_list=[])
+    actual = get_playlist([al], [], settings.get_settings())
     expected: list[PlaylistEntry] = []
     assert actual == expected
 
@@ -1179,7 +1187,7 @@ def test_get_playlist_with_whitelist_matching_exact(mocker: MockerFixture) -> No
 
     ag = Group(A_DIR, whitelist=['foo 1.mkv'])
     al = Location(A_DIR, ag)
-    actual = get_playlist([al], watched_list=[])
+    actual = get_playlist([al], [], settings.get_settings())
     expected = [
         PlaylistEntry(str(A_DIR_PATH / 'foo 1.mkv'), al, ag),
     ]
@@ -1195,7 +1203,7 @@ def test_get_playlist_with_whitelist_matching_subset(mocker: MockerFixture) -> N
 
     ag = Group(A_DIR, whitelist=['1'])
     al = Location(A_DIR, ag)
-    actual = get_playlist([al], watched_list=[])
+    actual = get_playlist([al], [], settings.get_settings())
     expected = [
         PlaylistEntry(str(A_DIR_PATH / 'foo 1.mkv'), al, ag),
     ]
@@ -1212,7 +1220,7 @@ def test_get_playlist_with_whitelist_matching_subset_case_insensitive(
 
     ag = Group(A_DIR, whitelist=['FoO 1.MkV'])
     al = Location(A_DIR, ag)
-    actual = get_playlist([al], watched_list=[])
+    actual = get_playlist([al], [], settings.get_settings())
     expected = [
         PlaylistEntry(str(A_DIR_PATH / 'foo 1.mkv'), al, ag),
     ]
@@ -1229,7 +1237,7 @@ def test_get_playlist_with_group_whitelist_matching(mocker: MockerFixture) -> No
     ag = Group(A_DIR)
     foo_group = Group('foo', whitelist=['1'])
     al = Location(A_DIR, ag, groups=[foo_group], regex='(?P<group>[a-z]+).*\\.mkv')
-    actual = get_playlist([al], watched_list=[])
+    actual = get_playlist([al], [], settings.get_settings())
     expected = [
         PlaylistEntry(str(A_DIR_PATH / 'foo 1.mkv'), al, foo_group),
     ]
@@ -1248,7 +1256,7 @@ def test_get_playlist_with_whitelist_with_many_locations_interleaved(mocker: Moc
     al = Location(A_DIR, ag)
     bg = Group(B_DIR, whitelist=['1'])
     bl = Location(B_DIR, bg)
-    actual = get_playlist([al, bl], watched_list=[])
+    actual = get_playlist([al, bl], [], settings.get_settings())
     expected = [
         PlaylistEntry(str(A_DIR_PATH / 'foo 1.mkv'), al, ag),
         PlaylistEntry(str(B_DIR_PATH / 'bar 1.mkv'), bl, bg),
@@ -1269,7 +1277,7 @@ def test_get_playlist_with_whitelist_with_many_groups_interleaved(mocker: Mocker
     al = Location(A_DIR, ag, regex='(?P<group>[a-z]+).*\\.mkv')
     foo_group = Group('foo', whitelist=['1'])
     bar_group = Group('bar', whitelist=['1'])
-    actual = get_playlist([al], watched_list=[])
+    actual = get_playlist([al], [], settings.get_settings())
     expected = [
         PlaylistEntry(str(A_DIR_PATH / 'bar 1.mkv'), al, bar_group),
         PlaylistEntry(str(A_DIR_PATH / 'foo 1.mkv'), al, foo_group),
@@ -1296,7 +1304,7 @@ def test_get_playlist_with_whitelist_with_many_locations_and_groups_interleaved(
     bar_group = Group('bar', whitelist=['1'])
     cat_group = Group('cat', whitelist=['1'])
     dog_group = Group('dog', whitelist=['1'])
-    actual = get_playlist([al, bl], watched_list=[])
+    actual = get_playlist([al, bl], [], settings.get_settings())
     expected = [
         PlaylistEntry(str(A_DIR_PATH / 'bar 1.mkv'), al, bar_group),
         PlaylistEntry(str(B_DIR_PATH / 'cat 1.mkv'), bl, cat_group),
@@ -1327,7 +1335,7 @@ def test_get_playlist_with_whitelist_with_many_groups_different_priorities_inter
     al = Location(A_DIR, ag, regex='(?P<group>[a-z]+).*\\.mkv', groups=[foo_group])
     bg = Group(B_DIR, whitelist=['1'])
     bl = Location(B_DIR, bg, regex='(?P<group>[a-z]+).*\\.mkv', groups=[dog_group])
-    actual = get_playlist([al, bl], watched_list=[])
+    actual = get_playlist([al, bl], [], settings.get_settings())
     expected = [
         PlaylistEntry(str(B_DIR_PATH / 'dog 1.mkv'), bl, dog_group),
         PlaylistEntry(str(A_DIR_PATH / 'foo 1.mkv'), al, foo_group),
@@ -1350,7 +1358,7 @@ def test_get_playlist_with_whitelist_ignoring_directory(mocker: MockerFixture) -
 
     ag = Group(A_DIR, whitelist=[A_DIR])
     al = Location(A_DIR, ag)
-    actual = get_playlist([al], watched_list=[])
+    actual = get_playlist([al], [], settings.get_settings())
     expected: list[PlaylistEntry] = []
     assert actual == expected
 
@@ -1364,7 +1372,7 @@ def test_get_playlist_with_blacklist_no_entries_none_matching(mocker: MockerFixt
 
     ag = Group(A_DIR, blacklist=['1'])
     al = Location(A_DIR, ag)
-    actual = get_playlist([al], watched_list=[])
+    actual = get_playlist([al], [], settings.get_settings())
     expected: list[PlaylistEntry] = []
     assert actual == expected
 
@@ -1378,7 +1386,7 @@ def test_get_playlist_with_blacklist_none_matching(mocker: MockerFixture) -> Non
 
     ag = Group(A_DIR, blacklist=['3'])
     al = Location(A_DIR, ag)
-    actual = get_playlist([al], watched_list=[])
+    actual = get_playlist([al], [], settings.get_settings())
     expected = [
         PlaylistEntry(str(A_DIR_PATH / 'foo 1.mkv'), al, ag),
         PlaylistEntry(str(A_DIR_PATH / 'foo 2.mkv'), al, ag)
@@ -1395,7 +1403,7 @@ def test_get_playlist_with_blacklist_exact(mocker: MockerFixture) -> None:
 
     ag = Group(A_DIR, blacklist=['foo 1.mkv'])
     al = Location(A_DIR, ag)
-    actual = get_playlist([al], watched_list=[])
+    actual = get_playlist([al], [], settings.get_settings())
     expected = [
         PlaylistEntry(str(A_DIR_PATH / 'foo 2.mkv'), al, ag),
     ]
@@ -1411,7 +1419,7 @@ def test_get_playlist_with_blacklist_subset(mocker: MockerFixture) -> None:
 
     ag = Group(A_DIR, blacklist=['1.mkv'])
     al = Location(A_DIR, ag)
-    actual = get_playlist([al], watched_list=[])
+    actual = get_playlist([al], [], settings.get_settings())
     expected = [
         PlaylistEntry(str(A_DIR_PATH / 'foo 2.mkv'), al, ag),
     ]
@@ -1427,7 +1435,7 @@ def test_get_playlist_with_blacklist_subset_case_insensitive(mocker: MockerFixtu
 
     ag = Group(A_DIR, blacklist=['1.MkV'])
     al = Location(A_DIR, ag)
-    actual = get_playlist([al], watched_list=[])
+    actual = get_playlist([al], [], settings.get_settings())
     expected = [
         PlaylistEntry(str(A_DIR_PATH / 'foo 2.mkv'), al, ag),
     ]
@@ -1444,7 +1452,7 @@ def test_get_playlist_with_group_blacklist_matching(mocker: MockerFixture) -> No
     ag = Group(A_DIR)
     foo_group = Group('foo', blacklist=['2'])
     al = Location(A_DIR, ag, groups=[foo_group], regex='(?P<group>[a-z]+).*\\.mkv')
-    actual = get_playlist([al], watched_list=[])
+    actual = get_playlist([al], [], settings.get_settings())
     expected = [
         PlaylistEntry(str(A_DIR_PATH / 'foo 1.mkv'), al, foo_group),
     ]
@@ -1460,7 +1468,7 @@ def test_get_playlist_with_blacklist_ignoring_directory(mocker: MockerFixture) -
 
     ag = Group(A_DIR, blacklist=[A_DIR])
     al = Location(A_DIR, ag)
-    actual = get_playlist([al], watched_list=[])
+    actual = get_playlist([al], [], settings.get_settings())
     expected = [
         PlaylistEntry(str(A_DIR_PATH / 'foo 1.mkv'), al, ag),
         PlaylistEntry(str(A_DIR_PATH / 'foo 2.mkv'), al, ag),
@@ -1477,7 +1485,7 @@ def test_get_playlist_with_blacklist_and_whitelist_working_together(mocker: Mock
 
     ag = Group(A_DIR, blacklist=['foo'], whitelist=['bar'])
     al = Location(A_DIR, ag)
-    actual = get_playlist([al], watched_list=[])
+    actual = get_playlist([al], [], settings.get_settings())
     expected = [
         PlaylistEntry(str(A_DIR_PATH / 'bar 1.mkv'), al, ag),
     ]
@@ -1493,7 +1501,7 @@ def test_get_playlist_with_blacklist_and_whitelist_contradicting(mocker: MockerF
 
     ag = Group(A_DIR, blacklist=['bar'], whitelist=['bar'])
     al = Location(A_DIR, ag)
-    actual = get_playlist([al], watched_list=[])
+    actual = get_playlist([al], [], settings.get_settings())
     expected: list[PlaylistEntry] = []
     assert actual == expected
 
@@ -1507,7 +1515,7 @@ def test_get_playlist_with_whitelist_and_search_working_together(mocker: MockerF
 
     ag = Group(A_DIR, whitelist=['bar'])
     al = Location(A_DIR, ag)
-    actual = get_playlist([al], watched_list=[], search_filter='mkv')
+    actual = get_playlist([al], [], settings.get_settings(), search_filter='mkv')
     expected = [
         PlaylistEntry(str(A_DIR_PATH / 'bar 1.mkv'), al, ag),
     ]
@@ -1523,7 +1531,7 @@ def test_get_playlist_with_whitelist_and_search_contradicting(mocker: MockerFixt
 
     ag = Group(A_DIR, whitelist=['bar'])
     al = Location(A_DIR, ag)
-    actual = get_playlist([al], watched_list=[], search_filter='foo')
+    actual = get_playlist([al], [], settings.get_settings(), search_filter='foo')
     expected: list[PlaylistEntry] = []
     assert actual == expected
 
@@ -1537,7 +1545,7 @@ def test_get_playlist_with_blacklist_and_search_working_together(mocker: MockerF
 
     ag = Group(A_DIR, blacklist=['foo'])
     al = Location(A_DIR, ag)
-    actual = get_playlist([al], watched_list=[], search_filter='bar')
+    actual = get_playlist([al], [], settings.get_settings(), search_filter='bar')
     expected = [
         PlaylistEntry(str(A_DIR_PATH / 'bar 1.mkv'), al, ag),
     ]
@@ -1553,7 +1561,7 @@ def test_get_playlist_with_blacklist_and_search_contradicting(mocker: MockerFixt
 
     ag = Group(A_DIR, blacklist=['bar'])
     al = Location(A_DIR, ag)
-    actual = get_playlist([al], watched_list=[], search_filter='bar')
+    actual = get_playlist([al], [], settings.get_settings(), search_filter='bar')
     expected: list[PlaylistEntry] = []
     assert actual == expected
 
@@ -1568,7 +1576,7 @@ def test_get_playlist_with_whitelist_and_blacklist_and_search_working_together(
 
     ag = Group(A_DIR, blacklist=['foo'], whitelist=['bar'])
     al = Location(A_DIR, ag)
-    actual = get_playlist([al], watched_list=[], search_filter='bar')
+    actual = get_playlist([al], [], settings.get_settings(), search_filter='bar')
     expected = [
         PlaylistEntry(str(A_DIR_PATH / 'bar 1.mkv'), al, ag),
     ]
@@ -1585,7 +1593,7 @@ def test_get_playlist_with_whitelist_and_blacklist_and_search_contradicting_beca
 
     ag = Group(A_DIR, blacklist=['bar'], whitelist=['bar'])
     al = Location(A_DIR, ag)
-    actual = get_playlist([al], watched_list=[], search_filter='foo')
+    actual = get_playlist([al], [], settings.get_settings(), search_filter='foo')
     expected: list[PlaylistEntry] = []
     assert actual == expected
 
@@ -1600,7 +1608,7 @@ def test_get_playlist_with_whitelist_and_blacklist_and_search_contradicting_beca
 
     ag = Group(A_DIR, blacklist=['foo'], whitelist=['foo'])
     al = Location(A_DIR, ag)
-    actual = get_playlist([al], watched_list=[], search_filter='foo')
+    actual = get_playlist([al], [], settings.get_settings(), search_filter='foo')
     expected: list[PlaylistEntry] = []
     assert actual == expected
 
@@ -1615,7 +1623,7 @@ def test_get_playlist_with_whitelist_and_blacklist_and_search_contradicting_beca
 
     ag = Group(A_DIR, blacklist=['foo'], whitelist=['bar'])
     al = Location(A_DIR, ag)
-    actual = get_playlist([al], watched_list=[], search_filter='foo')
+    actual = get_playlist([al], [], settings.get_settings(), search_filter='foo')
     expected: list[PlaylistEntry] = []
     assert actual == expected
 
@@ -1630,7 +1638,7 @@ def test_get_playlist_with_exclude_directories_setting_on(mocker: MockerFixture)
 
     group = Group(A_DIR)
     location = Location(A_DIR, group)
-    actual = get_playlist([location], watched_list=[])
+    actual = get_playlist([location], [], settings.get_settings())
     expected = [PlaylistEntry(str(A_DIR_PATH / 'foo.mkv'), location, group)]
     assert actual == expected
 
@@ -1644,7 +1652,7 @@ def test_get_playlist_with_not_exclude_directories_setting_off(mocker: MockerFix
     get_mock_open(mocker, {settings._SETTINGS_FILE: 'exclude-directories: false'})
     group = Group(A_DIR)
     location = Location(A_DIR, group)
-    actual = get_playlist([location], watched_list=[])
+    actual = get_playlist([location], [], settings.get_settings())
     expected = [
         PlaylistEntry(str(A_DIR_PATH / 'foo.mkv'), location, group),
         PlaylistEntry(str(A_DIR_PATH / 'foo'), location, group)
@@ -1661,7 +1669,7 @@ def test_get_playlist_with_one_watched(mocker: MockerFixture) -> None:
 
     ag = Group(A_DIR)
     al = Location(A_DIR, ag)
-    actual = get_playlist([al], watched_list=[('bar 1.mkv', al.name)])
+    actual = get_playlist([al], [('bar 1.mkv', al.name)], settings.get_settings())
     expected = [PlaylistEntry(str(A_DIR_PATH / 'foo 1.mkv'), al, ag)]
     assert actual == expected
 
@@ -1675,10 +1683,10 @@ def test_get_playlist_with_many_watched(mocker: MockerFixture) -> None:
 
     ag = Group(A_DIR)
     al = Location(A_DIR, ag)
-    actual = get_playlist([al], watched_list=[
+    actual = get_playlist([al], [
         ('bar 1.mkv', al.name),
         ('foo 1.mkv', al.name)
-    ])
+    ], settings.get_settings())
     expected: list[PlaylistEntry] = []
     assert actual == expected
 
@@ -1692,7 +1700,7 @@ def test_get_playlist_with_watched_not_in_list(mocker: MockerFixture) -> None:
 
     ag = Group(A_DIR)
     al = Location(A_DIR, ag)
-    actual = get_playlist([al], watched_list=[('baz 1.mkv', al.name)])
+    actual = get_playlist([al], [('baz 1.mkv', al.name)], settings.get_settings())
     expected = [
         PlaylistEntry(str(A_DIR_PATH / 'foo 1.mkv'), al, ag),
         PlaylistEntry(str(A_DIR_PATH / 'bar 1.mkv'), al, ag)
@@ -1711,7 +1719,7 @@ def test_get_playlist_with_watched_and_different_group(mocker: MockerFixture) ->
     foo_group = Group('foo')
     ag = Group(A_DIR)
     al = Location(A_DIR, ag, groups=[foo_group])
-    actual = get_playlist([al], watched_list=[('foo 1.mkv', al.name)])
+    actual = get_playlist([al], [('foo 1.mkv', al.name)], settings.get_settings())
     expected = [
         PlaylistEntry(str(A_DIR_PATH / 'bar 1.mkv'), al, ag)
     ]
@@ -1733,7 +1741,7 @@ def test_get_playlist_with_watched_and_different_location(mocker: MockerFixture)
     al = Location(A_DIR, ag)
     bg = Group(B_DIR)
     bl = Location(B_DIR, bg)
-    actual = get_playlist([al, bl], watched_list=[('foo 1.mkv', al.name)])
+    actual = get_playlist([al, bl], [('foo 1.mkv', al.name)], settings.get_settings())
     expected: list[PlaylistEntry] = []
     assert set(actual) == set(expected)
 
@@ -1747,7 +1755,7 @@ def test_get_playlist_with_watched_and_case_insensitive(mocker: MockerFixture) -
 
     ag = Group(A_DIR)
     al = Location(A_DIR, ag)
-    actual = get_playlist([al], watched_list=[('bAr 1.MkV', al.name)])
+    actual = get_playlist([al], [('bAr 1.MkV', al.name)], settings.get_settings())
     expected = [PlaylistEntry(str(A_DIR_PATH / 'foo 1.mkv'), al, ag)]
     assert actual == expected
 
@@ -1761,7 +1769,8 @@ def test_get_playlist_with_watched_and_searched(mocker: MockerFixture) -> None:
 
     ag = Group(A_DIR)
     al = Location(A_DIR, ag)
-    actual = get_playlist([al], watched_list=[('bar 1.mkv', al.name)], search_filter='bar 1.mkv')
+    actual = get_playlist([al], [('bar 1.mkv', al.name)], settings.get_settings(),
+                          search_filter='bar 1.mkv')
     expected: list[PlaylistEntry] = []
     assert actual == expected
 
@@ -1775,7 +1784,7 @@ def test_get_playlist_with_watched_and_whitelisted(mocker: MockerFixture) -> Non
 
     ag = Group(A_DIR, whitelist=['bar 1.mkv'])
     al = Location(A_DIR, ag)
-    actual = get_playlist([al], watched_list=[('bar 1.mkv', al.name)])
+    actual = get_playlist([al], [('bar 1.mkv', al.name)], settings.get_settings())
     expected: list[PlaylistEntry] = []
     assert actual == expected
 
@@ -1789,7 +1798,7 @@ def test_get_playlist_with_watched_and_blacklisted(mocker: MockerFixture) -> Non
 
     ag = Group(A_DIR, blacklist=['bar 1.mkv'])
     al = Location(A_DIR, ag)
-    actual = get_playlist([al], watched_list=[('bar 1.mkv', al.name)])
+    actual = get_playlist([al], [('bar 1.mkv', al.name)], settings.get_settings())
     expected = [PlaylistEntry(str(A_DIR_PATH / 'foo 1.mkv'), al, ag)]
     assert actual == expected
 
@@ -1804,7 +1813,7 @@ def test_get_playlist_with_one_loc_timed_for_future(mocker: MockerFixture) -> No
         cron=CronTab('0 0 * * *')
     ))
     location = Location(A_DIR, group)
-    actual = get_playlist([location], watched_list=[])
+    actual = get_playlist([location], [], settings.get_settings())
     expected: list[PlaylistEntry] = []
     assert set(actual) == set(expected)
 
@@ -1819,7 +1828,7 @@ def test_get_playlist_with_one_loc_timed(mocker: MockerFixture) -> None:
         cron=CronTab('0 0 * * *')
     ))
     location = Location(A_DIR, group)
-    actual = get_playlist([location], watched_list=[])
+    actual = get_playlist([location], [], settings.get_settings())
     expected = [PlaylistEntry(str(A_DIR_PATH / 'foo 1.mkv'), location, group)]
     assert set(actual) == set(expected)
 
@@ -1834,7 +1843,7 @@ def test_get_playlist_with_many_loc_timed_right_before(mocker: MockerFixture) ->
         cron=CronTab('0 0 * * *')
     ))
     location = Location(A_DIR, group)
-    actual = get_playlist([location], watched_list=[])
+    actual = get_playlist([location], [], settings.get_settings())
     expected = [
         PlaylistEntry(str(A_DIR_PATH / 'foo 1.mkv'), location, group)
     ]
@@ -1851,7 +1860,7 @@ def test_get_playlist_with_many_loc_timed(mocker: MockerFixture) -> None:
         cron=CronTab('0 0 * * *')
     ))
     location = Location(A_DIR, group)
-    actual = get_playlist([location], watched_list=[])
+    actual = get_playlist([location], [], settings.get_settings())
     expected = [
         PlaylistEntry(str(A_DIR_PATH / 'foo 1.mkv'), location, group),
         PlaylistEntry(str(A_DIR_PATH / 'foo 2.mkv'), location, group)
@@ -1869,7 +1878,7 @@ def test_get_playlist_with_many_loc_timed_right_after(mocker: MockerFixture) ->
         cron=CronTab('0 0 * * *')
     ))
     location = Location(A_DIR, group)
-    actual = get_playlist([location], watched_list=[])
+    actual = get_playlist([location], [], settings.get_settings())
     expected = [
         PlaylistEntry(str(A_DIR_PATH / 'foo 1.mkv'), location, group),
         PlaylistEntry(str(A_DIR_PATH / 'foo 2.mkv'), location, group)
@@ -1887,7 +1896,7 @@ def test_get_playlist_with_loc_timed_finished(mocker: MockerFixture) -> None:
         cron=CronTab('0 0 * * *')
     ))
     location = Location(A_DIR, group)
-    actual = get_playlist([location], watched_list=[])
+    actual = get_playlist([location], [], settings.get_settings())
     expected = [
         PlaylistEntry(str(A_DIR_PATH / 'foo 1.mkv'), location, group),
         PlaylistEntry(str(A_DIR_PATH / 'foo 2.mkv'), location, group)
@@ -1906,7 +1915,7 @@ def test_get_playlist_with_many_amount(mocker: MockerFixture) -> None:
         amount=2
     ))
     location = Location(A_DIR, group)
-    actual = get_playlist([location], watched_list=[])
+    actual = get_playlist([location], [], settings.get_settings())
     expected = [
         PlaylistEntry(str(A_DIR_PATH / 'foo 1.mkv'), location, group),
         PlaylistEntry(str(A_DIR_PATH / 'foo 2.mkv'), location, group)
@@ -1925,7 +1934,7 @@ def test_get_playlist_with_zero_amount(mocker: MockerFixture) -> None:
         amount=0
     ))
     location = Location(A_DIR, group)
-    actual = get_playlist([location], watched_list=[])
+    actual = get_playlist([location], [], settings.get_settings())
     expected = [
         PlaylistEntry(str(A_DIR_PATH / 'foo 1.mkv'), location, group)
     ]
@@ -1943,7 +1952,7 @@ def test_get_playlist_with_negative_amount(mocker: MockerFixture) -> None:
         amount=-20
     ))
     location = Location(A_DIR, group)
-    actual = get_playlist([location], watched_list=[])
+    actual = get_playlist([location], [], settings.get_settings())
     expected = [
         PlaylistEntry(str(A_DIR_PATH / 'foo 1.mkv'), location, group)
     ]
@@ -1961,7 +1970,7 @@ def test_get_playlist_with_starting_at_episode(mocker: MockerFixture) -> None:
         first=2
     ))
     location = Location(A_DIR, group)
-    actual = get_playlist([location], watched_list=[])
+    actual = get_playlist([location], [], settings.get_settings())
     expected = [
         PlaylistEntry(str(A_DIR_PATH / 'foo 2.mkv'), location, group)
     ]
@@ -1979,7 +1988,7 @@ def test_get_playlist_with_one_loc_timed_start_at_cron_is_true(mocker: MockerFix
         start_at_cron=True
     ))
     location = Location(A_DIR, group)
-    actual = get_playlist([location], watched_list=[])
+    actual = get_playlist([location], [], settings.get_settings())
     expected: list[PlaylistEntry] = []
     assert set(actual) == set(expected)
 
@@ -1995,7 +2004,7 @@ def test_get_playlist_with_one_loc_timed_start_at_cron_is_false(mocker: MockerFi
         start_at_cron=False
     ))
     location = Location(A_DIR, group)
-    actual = get_playlist([location], watched_list=[])
+    actual = get_playlist([location], [], settings.get_settings())
     expected = [PlaylistEntry(str(A_DIR_PATH / 'foo 1.mkv'), location, group)]
     assert set(actual) == set(expected)
 
@@ -2011,7 +2020,7 @@ def test_get_playlist_with_many_loc_timed_start_at_cron_is_true(mocker: MockerFi
         start_at_cron=True
     ))
     location = Location(A_DIR, group)
-    actual = get_playlist([location], watched_list=[])
+    actual = get_playlist([location], [], settings.get_settings())
     expected = [PlaylistEntry(str(A_DIR_PATH / 'foo 1.mkv'), location, group)]
     assert set(actual) == set(expected)
 
@@ -2027,7 +2036,7 @@ def test_get_playlist_with_many_loc_timed_start_at_cron_is_false(mocker: MockerF
         start_at_cron=False
     ))
     location = Location(A_DIR, group)
-    actual = get_playlist([location], watched_list=[])
+    actual = get_playlist([location], [], settings.get_settings())
     expected = [
         PlaylistEntry(str(A_DIR_PATH / 'foo 1.mkv'), location, group),
         PlaylistEntry(str(A_DIR_PATH / 'foo 2.mkv'), location, group)
@@ -2047,7 +2056,7 @@ def test_get_playlist_with_one_loc_timed_start_at_cron_is_true_exact_at_cron(
         start_at_cron=True
     ))
     location = Location(A_DIR, group)
-    actual = get_playlist([location], watched_list=[])
+    actual = get_playlist([location], [], settings.get_settings())
     expected = [PlaylistEntry(str(A_DIR_PATH / 'foo 1.mkv'), location, group)]
     assert set(actual) == set(expected)
 
@@ -2064,7 +2073,7 @@ def test_get_playlist_with_many_loc_timed_start_at_cron_is_true_exact_at_cron(
         start_at_cron=True
     ))
     location = Location(A_DIR, group)
-    actual = get_playlist([location], watched_list=[])
+    actual = get_playlist([location], [], settings.get_settings())
     expected = [
         PlaylistEntry(str(A_DIR_PATH / 'foo 1.mkv'), location, group),
         PlaylistEntry(str(A_DIR_PATH / 'foo 2.mkv'), location, group)
@@ -2082,7 +2091,7 @@ def test_get_playlist_with_timed_and_watched(mocker: MockerFixture) -> None:
         cron=CronTab('0 0 * * *'),
     ))
     location = Location(A_DIR, group)
-    actual = get_playlist([location], watched_list=[('foo 1.mkv', group.name)])
+    actual = get_playlist([location], [('foo 1.mkv', group.name)], settings.get_settings())
     expected: list[PlaylistEntry] = []
     assert set(actual) == set(expected)
 
@@ -2097,7 +2106,7 @@ def test_get_playlist_with_timed_and_whitelist(mocker: MockerFixture) -> None:
         cron=CronTab('0 0 * * *'),
     ))
     location = Location(A_DIR, group)
-    actual = get_playlist([location], watched_list=[])
+    actual = get_playlist([location], [], settings.get_settings())
     expected = [
         PlaylistEntry(str(A_DIR_PATH / 'foo 2.mkv'), location, group)
     ]
@@ -2114,7 +2123,7 @@ def test_get_playlist_with_timed_and_blacklist(mocker: MockerFixture) -> None:
         cron=CronTab('0 0 * * *'),
     ))
     location = Location(A_DIR, group)
-    actual = get_playlist([location], watched_list=[])
+    actual = get_playlist([location], [], settings.get_settings())
     expected = [
         PlaylistEntry(str(A_DIR_PATH / 'foo 2.mkv'), location, group)
     ]
@@ -2131,7 +2140,7 @@ def test_get_playlist_with_timed_ands_search(mocker: MockerFixture) -> None:
         cron=CronTab('0 0 * * *'),
     ))
     location = Location(A_DIR, group)
-    actual = get_playlist([location], watched_list=[], search_filter='foo 2.mkv')
+    actual = get_playlist([location], [], settings.get_settings(), search_filter='foo 2.mkv')
     expected: list[PlaylistEntry] = []
     assert set(actual) == set(expected)
 
@@ -2148,7 +2157,7 @@ def test_get_playlist_with_timed_group_override(mocker: MockerFixture) -> None:
     ))
     bar_group = Group('bar')
     location = Location(A_DIR, group, regex='(?P<group>[a-z]+).*\\.mkv', groups=[foo_group])
-    actual = get_playlist([location], watched_list=[])
+    actual = get_playlist([location], [], settings.get_settings())
     expected = [
         PlaylistEntry(str(A_DIR_PATH / 'foo 1.mkv'), location, foo_group),
         PlaylistEntry(str(A_DIR_PATH / 'bar 1.mkv'), location, bar_group),
@@ -2173,11 +2182,11 @@ def test_get_playlist_with_least_recently_watched_bias_with_groups(mocker: Mocke
     bar_group = Group('bar')
     baz_group = Group('baz')
     al = Location(A_DIR, ag, regex='(?P<group>[a-z]+).*\\.mkv')
-    actual = get_playlist([al], watched_list=[
+    actual = get_playlist([al], [
         ('foo 1.mkv', foo_group.name),
         ('bar 1.mkv', bar_group.name),
         ('baz 1.mkv', baz_group.name),
-    ])
+    ], settings.get_settings())
     expected = [
         PlaylistEntry(str(A_DIR_PATH / 'abc 1.mkv'), al, abc_group),
         PlaylistEntry(str(A_DIR_PATH / 'foo 2.mkv'), al, foo_group),
@@ -2216,14 +2225,15 @@ def test_get_playlist_with_least_recently_watched_bias_with_locations(
     abc_location = Location(str(abc_dir_path), abc_group)
     actual = get_playlist(
         [foo_location, bar_location, baz_location, abc_location],
-        watched_list=[
+        [
             ('foo 1.mkv', foo_group.name),
             ('bar 1.mkv', bar_group.name),
             ('baz 1.mkv', baz_group.name),
             ('foo 2.mkv', foo_group.name),
             ('bar 2.mkv', bar_group.name),
             ('baz 2.mkv', baz_group.name),
-        ])
+        ],
+        settings.get_settings())
     expected = [
         PlaylistEntry(str(abc_dir_path / 'abc 1.mkv'), abc_location, abc_group),
         PlaylistEntry(str(foo_dir_path / 'foo 3.mkv'), foo_location, foo_group),
@@ -2244,9 +2254,9 @@ def test_get_playlist_using_cache_with_existing_after_update(mocker: MockerFixtu
 
     group = Group(A_DIR)
     location = Location(A_DIR, group)
-    get_playlist([location], watched_list=[])
+    get_playlist([location], [], settings.get_settings())
     mock_listdir(mocker, {A_DIR: ['foo.mkv', 'bar.mkv', 'hooplah.mkv']})
-    actual = get_playlist([location], watched_list=[], use_cache=True)
+    actual = get_playlist([location], [], settings.get_settings(), use_cache=True)
     expected = [
         PlaylistEntry(str(A_DIR_PATH / 'foo.mkv'), location, group),
         PlaylistEntry(str(A_DIR_PATH / 'bar.mkv'), location, group),
@@ -2262,9 +2272,9 @@ def test_get_playlist_using_cache_after_refreshing_cache_after_update(
 
     group = Group(A_DIR)
     location = Location(A_DIR, group)
-    get_playlist([location], watched_list=[])
+    get_playlist([location], [], settings.get_settings())
     mock_listdir(mocker, {A_DIR: ['foo.mkv', 'bar.mkv', 'hooplah.mkv']})
-    actual = get_playlist([location], watched_list=[], use_cache=False)
+    actual = get_playlist([location], [], settings.get_settings(), use_cache=False)
     expected = [
         PlaylistEntry(str(A_DIR_PATH / 'foo.mkv'), location, group),
         PlaylistEntry(str(A_DIR_PATH / 'bar.mkv'), location, group),
@@ -2272,10 +2282,193 @@ def test_get_playlist_using_cache_after_refreshing_cache_after_update(
     ]
     assert set(actual) == set(expected)
     mock_listdir(mocker, {A_DIR: ['foo.mkv', 'bar.mkv', 'hooplah.mkv', 'wow.mkv']})
-    actual = get_playlist([location], watched_list=[], use_cache=True)
+    actual = get_playlist([location], [], settings.get_settings(), use_cache=True)
     assert set(actual) == set(expected)
 
 
+def test_get_playlist_entries_carry_natsort_keys(mocker: MockerFixture) -> None:
+    mock_listdir(mocker, {A_DIR: ['Foo 10.mkv', 'foo 9.mkv']})
+    mocker.patch('os.path.isfile', return_value=True)
+    get_mock_open(mocker, DEFAULT_SETTINGS_MOCK)
+
+    group = Group(A_DIR)
+    location = Location(A_DIR, group)
+    actual = get_playlist([location], [], settings.get_settings())
+    assert [path.basename(i.filename) for i in actual] == ['foo 9.mkv', 'Foo 10.mkv']
+    assert [i.natsort_key for i in actual] == \
+        [natsort_key('foo 9.mkv'), natsort_key('Foo 10.mkv')]
+
+
+def test_get_playlist_only_keys_new_names(mocker: MockerFixture) -> None:
+    mock_listdir(mocker, {A_DIR: ['foo.mkv', 'bar.mkv']})
+    mocker.patch('os.path.isfile', return_value=True)
+    get_mock_open(mocker, DEFAULT_SETTINGS_MOCK)
+    keygen = mocker.patch('interleave_playlist.core.playlist.natsort_key',
+                          side_effect=natsort_key)
+
+    group = Group(A_DIR)
+    location = Location(A_DIR, group)
+    get_playlist([location], [], settings.get_settings())
+    assert keygen.call_count == 2
+    get_playlist([location], [], settings.get_settings())
+    assert keygen.call_count == 2
+    mock_listdir(mocker, {A_DIR: ['foo.mkv', 'bar.mkv', 'hooplah.mkv']})
+    actual = get_playlist([location], [], settings.get_settings())
+    assert keygen.call_count == 3
+    assert len(actual) == 3
+
+
+def test_get_playlist_cancelled(mocker: MockerFixture) -> None:
+    listdir = mock_listdir(mocker, {A_DIR: ['foo.mkv'], B_DIR: ['bar.mkv']})
+    mocker.patch('os.path.isfile', return_value=True)
+    get_mock_open(mocker, DEFAULT_SETTINGS_MOCK)
+
+    token = CancellationToken()
+    token.cancel()
+    locations = [Location(A_DIR, Group(A_DIR)), Location(B_DIR, Group(B_DIR))]
+    with pytest.raises(Cancelled):
+        get_playlist(locations, [], settings.get_settings(), cancellation_token=token)
+    listdir.assert_not_called()
+
+
+def test_get_playlist_cancelled_between_locations(mocker: MockerFixture) -> None:
+    token = CancellationToken()
+
+    def listdir(directory: str) -> list[str]:
+        token.cancel()
+        return ['foo.mkv']
+    listdir_mock = mocker.patch('os.listdir', side_effect=listdir)
+    mocker.patch('os.path.isfile', return_value=True)
+    get_mock_open(mocker, DEFAULT_SETTINGS_MOCK)
+
+    locations = [Location(A_DIR, Group(A_DIR)), Location(B_DIR, Group(B_DIR))]
+    with pytest.raises(Cancelled):
+        get_playlist(locations, [], settings.get_settings(), cancellation_token=token)
+    assert listdir_mock.call_count == 1
+
+
+def test_get_playlist_reports_locations_scanned(mocker: MockerFixture) -> None:
+    mock_listdir(mocker, {A_DIR: ['foo.mkv'], B_DIR: ['bar.mkv']})
+    mocker.patch('os.path.isfile', return_value=True)
+    get_mock_open(mocker, DEFAULT_SETTINGS_MOCK)
+    progress: list[tuple[int, int]] = []
+
+    locations = [Location(A_DIR, Group(A_DIR)), Location(B_DIR, Group(B_DIR))]
+    get_playlist(locations, [], settings.get_settings(), on_progress=lambda *p: progress.append(p))
+    assert progress == [(1, 2), (2, 2)]
+    progress.clear()
+    next_up(locations, [], 1, settings.get_settings(), on_progress=lambda *p: progress.append(p))
+    assert progress == [(1, 2), (2, 2)]
+
+
+def test_get_playlist_search_refined_and_widened(mocker: MockerFixture) -> None:
+    mock_listdir(mocker, {A_DIR: ['foo 1.mkv', 'food 2.mkv', 'fig 3.mkv', 'bar 4.mkv']})
+    mocker.patch('os.path.isfile', return_value=True)
+    get_mock_open(mocker, DEFAULT_SETTINGS_MOCK)
+    filter_groups = mocker.spy(playlist, '_filter_groups')
+
+    location = Location(A_DIR, Group(A_DIR))
+
+    def search(search_filter: str) -> list[str]:
+        return [path.basename(i.filename)
+                for i in get_playlist([location], [], settings.get_settings(), search_filter,
+                                      use_cache=True)]
+    assert search('F') == ['fig 3.mkv', 'foo 1.mkv', 'food 2.mkv']
+    assert search('fo') == ['foo 1.mkv', 'food 2.mkv']
+    assert search('food') == ['food 2.mkv']
+    assert search('xfood') == []
+    assert search('fo') == ['foo 1.mkv', 'food 2.mkv']
+    assert search('') == ['bar 4.mkv', 'fig 3.mkv', 'foo 1.mkv', 'food 2.mkv']
+    assert filter_groups.call_count == 1
+
+
+def test_get_playlist_search_refines_only_previous_matches(mocker: MockerFixture) -> None:
+    mock_listdir(mocker, {A_DIR: ['foo 1.mkv', 'bar 2.mkv']})
+    mocker.patch('os.path.isfile', return_value=True)
+    get_mock_open(mocker, DEFAULT_SETTINGS_MOCK)
+
+    location = Location(A_DIR, Group(A_DIR))
+    get_playlist([location], [], settings.get_settings(), 'foo', use_cache=True)
+    assert playlist._SEARCH_CACHE is not None
+    candidates, query, fuzzy, filenames = playlist._SEARCH_CACHE
+    filenames.clear()
+    assert get_playlist([location], [], settings.get_settings(), 'foo 1', use_cache=True) == []
+    assert len(get_playlist([location], [], settings.get_settings(), 'o', use_cache=True)) == 1
+
+
+def test_get_playlist_cached_candidates_invalidated(mocker: MockerFixture) -> None:
+    mock_listdir(mocker, {A_DIR: ['foo 1.mkv', 'foo 2.mkv']})
+    mocker.patch('os.path.isfile', return_value=True)
+    get_mock_open(mocker, DEFAULT_SETTINGS_MOCK)
+    filter_groups = mocker.spy(playlist, '_filter_groups')
+
+    group = Group(A_DIR)
+    location = Location(A_DIR, group)
+    assert len(get_playlist([location], [], settings.get_settings(), use_cache=True)) == 2
+    assert len(get_playlist([location], [('foo 1.mkv', A_DIR)], settings.get_settings(),
+                            use_cache=True)) == 1
+    assert filter_groups.call_count == 2
+    group.blacklist = ['2']
+    assert len(get_playlist([location], [('foo 1.mkv', A_DIR)], settings.get_settings(),
+                            use_cache=True)) == 0
+    assert filter_groups.call_count == 3
+    assert len(get_playlist([location], [('foo 1.mkv', A_DIR)], settings.get_settings(),
+                            use_cache=True)) == 0
+    assert filter_groups.call_count == 3
+
+
+def test_get_playlist_without_cache_rebuilds_candidates(mocker: MockerFixture) -> None:
+    mock_listdir(mocker, {A_DIR: ['foo 1.mkv']})
+    mocker.patch('os.path.isfile', return_value=True)
+    get_mock_open(mocker, DEFAULT_SETTINGS_MOCK)
+
+    location = Location(A_DIR, Group(A_DIR))
+    assert len(get_playlist([location], [], settings.get_settings(), use_cache=True)) == 1
+    mock_listdir(mocker, {A_DIR: ['foo 1.mkv', 'foo 2.mkv']})
+    assert len(get_playlist([location], [], settings.get_settings(), use_cache=False)) == 2
+    assert len(get_playlist([location], [], settings.get_settings(), 'foo', use_cache=True)) == 2
+
+
+def test_get_playlist_search_multiple_terms(mocker: MockerFixture) -> None:
+    mock_listdir(mocker, {A_DIR: ['foo bar 1.mkv', 'foo 2.mkv', 'bar foo 3.mkv']})
+    mocker.patch('os.path.isfile', return_value=True)
+    get_mock_open(mocker, DEFAULT_SETTINGS_MOCK)
+
+    location = Location(A_DIR, Group(A_DIR))
+    actual = get_playlist([location], [], settings.get_settings(), '  BAR   foo ')
+    assert [path.basename(i.filename) for i in actual] == ['bar foo 3.mkv', 'foo bar 1.mkv']
+
+
+def test_get_playlist_search_fuzzy(mocker: MockerFixture) -> None:
+    mock_listdir(mocker, {A_DIR: ['frieren 1.mkv', 'frieren 2.mkv', 'bar 3.mkv']})
+    mocker.patch('os.path.isfile', return_value=True)
+    get_mock_open(mocker, DEFAULT_SETTINGS_MOCK)
+
+    location = Location(A_DIR, Group(A_DIR))
+    assert get_playlist([location], [], settings.get_settings(), 'freiren') == []
+    actual = get_playlist([location], [], settings.get_settings(), '~freiren', use_cache=True)
+    assert [path.basename(i.filename) for i in actual] == ['frieren 1.mkv', 'frieren 2.mkv']
+    assert get_playlist([location], [], settings.get_settings(), '~freiren zzz',
+                        use_cache=True) == []
+
+
+def test_get_playlist_search_fuzzy_ranked_by_score(mocker: MockerFixture) -> None:
+    mock_listdir(mocker, {
+        A_DIR: ['frieran 1.mkv', 'frieren 2.mkv'],
+        B_DIR: ['frieren 1.mkv', 'frieran 2.mkv'],
+    })
+    mocker.patch('os.path.isfile', return_value=True)
+    get_mock_open(mocker, DEFAULT_SETTINGS_MOCK)
+
+    locations = [Location(A_DIR, Group(A_DIR)), Location(B_DIR, Group(B_DIR))]
+    actual = get_playlist(locations, [], settings.get_settings(), '~frieren')
+    # the exact matches come first whichever group they're in
+    assert [path.basename(i.filename)[:7] for i in actual] == ['frieren'] * 2 + ['frieran'] * 2
+    assert {path.dirname(i.filename) for i in actual[:2]} == {A_DIR, B_DIR}
+    assert next_up(locations, [], 2, settings.get_settings(), '~frieren',
+                   use_cache=True) == actual[:2]
+
+
 def test_get_playlist_with_additional(mocker: MockerFixture) -> None:
     additional_a_dir_path = pathlib.Path('/a/dir/additional/A')  # sorts first
     mock_listdir(mocker, {
@@ -2287,7 +2480,7 @@ def test_get_playlist_with_additional(mocker: MockerFixture) -> None:
 
     ag = Group(A_DIR)
     al = Location(A_DIR, ag, additional=[str(additional_a_dir_path)])
-    actual = get_playlist([al], watched_list=[])
+    actual = get_playlist([al], [], settings.get_settings())
     expected = [
         PlaylistEntry(str(A_DIR_PATH / 'foo 1.mkv'), al, ag),
         PlaylistEntry(str(additional_a_dir_path / 'foo 2.mkv'), al, ag),
@@ -2314,7 +2507,7 @@ def test_get_playlist_with_additional_with_groups(mocker: MockerFixture) -> None
         regex='(?P<group>[a-z]+).*\\.mkv',
         groups=[foo_group, bar_group]
     )
-    actual = get_playlist([al], watched_list=[])
+    actual = get_playlist([al], [], settings.get_settings())
     expected = [
         PlaylistEntry(str(A_DIR_PATH / 'bar 1.mkv'), al, bar_group),
         PlaylistEntry(str(additional_a_dir_path / 'bar 2.mkv'), al, bar_group),
@@ -2342,7 +2535,7 @@ def test_get_playlist_with_additional_with_groups_interleaved(mocker: MockerFixt
         additional=[str(additional_a_dir_path)],
         regex='(?P<group>[a-z]+).*\\.mkv',
     )
-    actual = get_playlist([al], watched_list=[])
+    actual = get_playlist([al], [], settings.get_settings())
     expected = [
         PlaylistEntry(str(A_DIR_PATH / 'bar 1.mkv'), al, bar_group),
         PlaylistEntry(str(A_DIR_PATH / 'foo 1.mkv'), al, foo_group),
@@ -2360,7 +2553,7 @@ def test_get_playlist_with_weighted_and_one_location(mocker: MockerFixture) -> N
     weight = Weight('foo', 1)
     group = Group(A_DIR, weight=weight)
     location = Location(A_DIR, group)
-    actual = get_playlist([location], watched_list=[])
+    actual = get_playlist([location], [], settings.get_settings())
     expected = [
         PlaylistEntry(str(A_DIR_PATH / 'foo 1.mkv'), location, group),
         PlaylistEntry(str(A_DIR_PATH / 'foo 2.mkv'), location, group),
@@ -2382,7 +2575,7 @@ def test_get_playlist_with_weighted_and_many_locations_same(mocker: MockerFixtur
     al = Location(A_DIR, ag)
     bg = Group(B_DIR, weight=weight)
     bl = Location(B_DIR, bg)
-    actual = get_playlist([al, bl], watched_list=[])
+    actual = get_playlist([al, bl], [], settings.get_settings())
     expected = [
         PlaylistEntry(str(A_DIR_PATH / 'foo 1.mkv'), al, ag),
         PlaylistEntry(str(B_DIR_PATH / 'bar 1.mkv'), bl, bg),
@@ -2408,7 +2601,7 @@ def test_get_playlist_with_weighted_and_many_locations_different(mocker: MockerF
     al = Location(A_DIR, ag)
     bg = Group(B_DIR, weight=weight_bar)
     bl = Location(B_DIR, bg)
-    actual = get_playlist([al, bl], watched_list=[])
+    actual = get_playlist([al, bl], [], settings.get_settings())
     expected = [
         PlaylistEntry(str(B_DIR_PATH / 'bar 1.mkv'), bl, bg),
         PlaylistEntry(str(B_DIR_PATH / 'bar 2.mkv'), bl, bg),
@@ -2433,7 +2626,7 @@ def test_get_playlist_with_weighted_and_many_locations_mixed(mocker: MockerFixtu
     al = Location(A_DIR, ag)
     bg = Group(B_DIR)
     bl = Location(B_DIR, bg)
-    actual = get_playlist([al, bl], watched_list=[])
+    actual = get_playlist([al, bl], [], settings.get_settings())
     expected = [
         PlaylistEntry(str(A_DIR_PATH / 'foo 1.mkv'), al, ag),
         PlaylistEntry(str(A_DIR_PATH / 'foo 2.mkv'), al, ag),
@@ -2457,7 +2650,7 @@ def test_get_playlist_with_weighted_and_one_group(mocker: MockerFixture) -> None
                         default_group,
                         regex='(?P<group>.+) [0-9]+\\.mkv',
                         groups=[foo_group])
-    actual = get_playlist([location], watched_list=[])
+    actual = get_playlist([location], [], settings.get_settings())
     expected = [
         PlaylistEntry(str(A_DIR_PATH / 'foo 1.mkv'), location, foo_group),
         PlaylistEntry(str(A_DIR_PATH / 'foo 2.mkv'), location, foo_group),
@@ -2482,7 +2675,7 @@ def test_get_playlist_with_weighted_and_many_groups_same(mocker: MockerFixture)
                         default_group,
                         regex='(?P<group>.+) [0-9]+\\.mkv',
                         groups=[foo_group, bar_group])
-    actual = get_playlist([location], watched_list=[])
+    actual = get_playlist([location], [], settings.get_settings())
     expected = [
         PlaylistEntry(str(A_DIR_PATH / 'bar 1.mkv'), location, bar_group),
         PlaylistEntry(str(A_DIR_PATH / 'foo 1.mkv'), location, foo_group),
@@ -2511,7 +2704,7 @@ def test_get_playlist_with_weighted_and_many_groups_different(mocker: MockerFixt
                         default_group,
                         regex='(?P<group>.+) [0-9]+\\.mkv',
                         groups=[foo_group, bar_group])
-    actual = get_playlist([location], watched_list=[])
+    actual = get_playlist([location], [], settings.get_settings())
     expected = [
         PlaylistEntry(str(A_DIR_PATH / 'bar 1.mkv'), location, bar_group),
         PlaylistEntry(str(A_DIR_PATH / 'bar 2.mkv'), location, bar_group),
@@ -2539,7 +2732,7 @@ def test_get_playlist_with_weighted_and_many_groups_mixed(mocker: MockerFixture)
                         default_group,
                         regex='(?P<group>.+) [0-9]+\\.mkv',
                         groups=[foo_group, bar_group])
-    actual = get_playlist([location], watched_list=[])
+    actual = get_playlist([location], [], settings.get_settings())
     expected = [
         PlaylistEntry(str(A_DIR_PATH / 'bar 1.mkv'), location, bar_group),
         PlaylistEntry(str(A_DIR_PATH / 'bar 2.mkv'), location, bar_group),
@@ -2567,7 +2760,7 @@ def test_get_playlist_with_weighted_on_group_and_not_loc(mocker: MockerFixture)
                         default_group,
                         regex='(?P<group>.+) [0-9]+\\.mkv',
                         groups=[bar_group])
-    actual = get_playlist([location], watched_list=[])
+    actual = get_playlist([location], [], settings.get_settings())
     expected = [
         PlaylistEntry(str(A_DIR_PATH / 'bar 1.mkv'), location, bar_group),
         PlaylistEntry(str(A_DIR_PATH / 'bar 2.mkv'), location, bar_group),
@@ -2595,7 +2788,7 @@ def test_get_playlist_with_weighted_on_loc_and_not_group(mocker: MockerFixture)
                         default_group,
                         regex='(?P<group>.+) [0-9]+\\.mkv',
                         groups=[bar_group])
-    actual = get_playlist([location], watched_list=[])
+    actual = get_playlist([location], [], settings.get_settings())
     expected = [
         PlaylistEntry(str(A_DIR_PATH / 'foo 1.mkv'), location, foo_group),
         PlaylistEntry(str(A_DIR_PATH / 'foo 2.mkv'), location, foo_group),
@@ -2624,7 +2817,7 @@ def test_get_playlist_with_weighted_on_loc_and_group_same(mocker: MockerFixture)
                         default_group,
                         regex='(?P<group>.+) [0-9]+\\.mkv',
                         groups=[bar_group])
-    actual = get_playlist([location], watched_list=[])
+    actual = get_playlist([location], [], settings.get_settings())
     expected = [
         PlaylistEntry(str(A_DIR_PATH / 'bar 1.mkv'), location, bar_group),
         PlaylistEntry(str(A_DIR_PATH / 'foo 1.mkv'), location, foo_group),
@@ -2653,7 +2846,7 @@ def test_get_playlist_with_weighted_on_loc_and_group_different(mocker: MockerFix
                         default_group,
                         regex='(?P<group>.+) [0-9]+\\.mkv',
                         groups=[bar_group])
-    actual = get_playlist([location], watched_list=[])
+    actual = get_playlist([location], [], settings.get_settings())
     expected = [
         PlaylistEntry(str(A_DIR_PATH / 'bar 1.mkv'), location, bar_group),
         PlaylistEntry(str(A_DIR_PATH / 'bar 2.mkv'), location, bar_group),
@@ -2686,7 +2879,7 @@ def test_get_playlist_with_weighted_and_many_groups_across_locations_same(mocker
                           b_default_group,
                           regex='(?P<group>.+) [0-9]+\\.mkv',
                           groups=[bar_group])
-    actual = get_playlist([a_location, b_location], watched_list=[])
+    actual = get_playlist([a_location, b_location], [], settings.get_settings())
     expected = [
         PlaylistEntry(str(B_DIR_PATH / 'bar 1.mkv'), b_location, bar_group),
         PlaylistEntry(str(A_DIR_PATH / 'foo 1.mkv'), a_location, foo_group),
@@ -2720,7 +2913,7 @@ def test_get_playlist_with_weighted_and_many_groups_across_locations_different(m
                           b_default_group,
                           regex='(?P<group>.+) [0-9]+\\.mkv',
                           groups=[bar_group])
-    actual = get_playlist([a_location, b_location], watched_list=[])
+    actual = get_playlist([a_location, b_location], [], settings.get_settings())
     expected = [
         PlaylistEntry(str(B_DIR_PATH / 'bar 1.mkv'), b_location, bar_group),
         PlaylistEntry(str(B_DIR_PATH / 'bar 2.mkv'), b_location, bar_group),
@@ -2753,7 +2946,7 @@ def test_get_playlist_with_weighted_and_many_groups_across_locations_different_w
                           default_group,
                           regex='(?P<group>.+) [0-9]+\\.mkv',
                           groups=[bar_group])
-    actual = get_playlist([a_location, b_location], watched_list=[])
+    actual = get_playlist([a_location, b_location], [], settings.get_settings())
     expected = [
         PlaylistEntry(str(B_DIR_PATH / 'bar 1.mkv'), b_location, bar_group),
         PlaylistEntry(str(B_DIR_PATH / 'bar 2.mkv'), b_location, bar_group),
@@ -2784,7 +2977,7 @@ def test_get_playlist_with_weighted_and_priority(mocker: MockerFixture) -> None:
                         default_group,
                         regex='(?P<group>.+) [0-9]+\\.mkv',
                         groups=[foo_group, bar_group, priority_group])
-    actual = get_playlist([location], watched_list=[])
+    actual = get_playlist([location], [], settings.get_settings())
     expected = [
         PlaylistEntry(str(A_DIR_PATH / 'priority 1.mkv'), location, priority_group),
         PlaylistEntry(str(A_DIR_PATH / 'priority 2.mkv'), location, priority_group),
@@ -2815,7 +3008,7 @@ def test_get_playlist_with_weighted_and_whitelist(mocker: MockerFixture) -> None
                         default_group,
                         regex='(?P<group>.+) [0-9]+\\.mkv',
                         groups=[foo_group, bar_group])
-    actual = get_playlist([location], watched_list=[])
+    actual = get_playlist([location], [], settings.get_settings())
     expected = [
         PlaylistEntry(str(A_DIR_PATH / 'bar 1.mkv'), location, bar_group),
         PlaylistEntry(str(A_DIR_PATH / 'bar 3.mkv'), location, bar_group),
@@ -2843,7 +3036,7 @@ def test_get_playlist_with_weighted_and_blacklist(mocker: MockerFixture) -> None
                         default_group,
                         regex='(?P<group>.+) [0-9]+\\.mkv',
                         groups=[foo_group, bar_group])
-    actual = get_playlist([location], watched_list=[])
+    actual = get_playlist([location], [], settings.get_settings())
     expected = [
         PlaylistEntry(str(A_DIR_PATH / 'bar 1.mkv'), location, bar_group),
         PlaylistEntry(str(A_DIR_PATH / 'bar 3.mkv'), location, bar_group),
@@ -2871,7 +3064,7 @@ def test_get_playlist_with_weighted_and_search_filter(mocker: MockerFixture) ->
                         default_group,
                         regex='(?P<group>.+) [0-9]+\\.mkv',
                         groups=[foo_group, bar_group])
-    actual = get_playlist([location], watched_list=[], search_filter=".mkv")
+    actual = get_playlist([location], [], settings.get_settings(), search_filter=".mkv")
     expected = [
         PlaylistEntry(str(A_DIR_PATH / 'bar 1.mkv'), location, bar_group),
         PlaylistEntry(str(A_DIR_PATH / 'bar 3.mkv'), location, bar_group),
@@ -2899,7 +3092,7 @@ def test_get_playlist_with_weighted_and_watched(mocker: MockerFixture) -> None:
                         default_group,
                         regex='(?P<group>.+) [0-9]+\\.mkv',
                         groups=[foo_group, bar_group])
-    actual = get_playlist([location], watched_list=[('bar 2.mkv', bar_group.name)])
+    actual = get_playlist([location], [('bar 2.mkv', bar_group.name)], settings.get_settings())
     expected = [
         PlaylistEntry(str(A_DIR_PATH / 'bar 1.mkv'), location, bar_group),
         PlaylistEntry(str(A_DIR_PATH / 'bar 3.mkv'), location, bar_group),
@@ -2929,7 +3122,7 @@ def test_get_playlist_with_weighted_and_timed_and_watched(mocker: MockerFixture)
                         loc_group,
                         groups=[foo_group, bar_group],
                         regex='(?P<group>.+) [0-9]+\\.mkv')
-    actual = get_playlist([location], watched_list=[('foo 1.mkv', foo_group.name)])
+    actual = get_playlist([location], [('foo 1.mkv', foo_group.name)], settings.get_settings())
     expected: list[PlaylistEntry] = [
         PlaylistEntry(str(A_DIR_PATH / 'foo 2.mkv'), location, foo_group),
         PlaylistEntry(str(A_DIR_PATH / 'foo 3.mkv'), location, foo_group),
@@ -2953,7 +3146,7 @@ def test_get_playlist_with_exact_group_name(mocker: MockerFixture) -> None:  # n
                           default_group,
                           regex='(?P<group>.+) [0-9]+\\.mkv',
                           groups=[foo_group])
-    actual = get_playlist([a_location], watched_list=[])
+    actual = get_playlist([a_location], [], settings.get_settings())
     expected = [
         PlaylistEntry(str(A_DIR_PATH / 'fo 2.mkv'), a_location, foo_group),
         PlaylistEntry(str(A_DIR_PATH / 'fo 3.mkv'), a_location, foo_group),
@@ -2973,7 +3166,7 @@ def test_get_playlist_with_non_exact_group_name(mocker: MockerFixture) -> None:
                           default_group,
                           regex='(?P<group>.+) [0-9]+\\.mkv',
                           groups=[foo_group])
-    actual = get_playlist([a_location], watched_list=[])
+    actual = get_playlist([a_location], [], settings.get_settings())
     expected = [
         PlaylistEntry(str(A_DIR_PATH / 'fo 2.mkv'), a_location, foo_group),
         PlaylistEntry(str(A_DIR_PATH / 'fo 3.mkv'), a_location, foo_group),
@@ -2995,7 +3188,7 @@ def test_get_playlist_with_exact_group_name_subset_of_other_exact(mocker: Mocker
                           default_group,
                           regex='(?P<group>.+) [0-9]+\\.mkv',
                           groups=[fo_group, foo_group])
-    actual = get_playlist([a_location], watched_list=[])
+    actual = get_playlist([a_location], [], settings.get_settings())
     expected = [
         PlaylistEntry(str(A_DIR_PATH / 'fo 2.mkv'), a_location, fo_group),
         PlaylistEntry(str(A_DIR_PATH / 'foo 1.mkv'), a_location, foo_group),
@@ -3017,7 +3210,7 @@ def test_get_playlist_with_exact_group_name_subset_of_other_non_exact(mocker: Mo
                           default_group,
                           regex='(?P<group>.+) [0-9]+\\.mkv',
                           groups=[fo_group, foo_group])
-    actual = get_playlist([a_location], watched_list=[])
+    actual = get_playlist([a_location], [], settings.get_settings())
     expected = [
         PlaylistEntry(str(A_DIR_PATH / 'fo 2.mkv'), a_location, fo_group),
         PlaylistEntry(str(A_DIR_PATH / 'foo 1.mkv'), a_location, foo_group),
@@ -3040,7 +3233,7 @@ def test_get_playlist_with_exact_group_name_subset_of_two_exacts(mocker: MockerF
                           default_group,
                           regex='(?P<group>.+) [0-9]+\\.mkv',
                           groups=[fo_group, foo_group, f_group])
-    actual = get_playlist([a_location], watched_list=[])
+    actual = get_playlist([a_location], [], settings.get_settings())
     expected = [
         PlaylistEntry(str(A_DIR_PATH / 'f 4.mkv'), a_location, f_group),
         PlaylistEntry(str(A_DIR_PATH / 'fo 2.mkv'), a_location, fo_group),
@@ -3048,3 +3241,70 @@ def test_get_playlist_with_exact_group_name_subset_of_two_exacts(mocker: MockerF
         PlaylistEntry(str(A_DIR_PATH / 'foo 1.mkv'), a_location, foo_group),
     ]
     assert set(actual) == set(expected)
+
+
+def test_remove_dropped_groups() -> None:
+    ag = Group(A_DIR, A_DIR)
+    al = Location(A_DIR, ag)
+    bg = Group(B_DIR, B_DIR)
+    bl = Location(B_DIR, bg)
+    # like groups from the input, these inherit the location's blacklist
+    foo = Group('foo', B_DIR, blacklist=bg.blacklist)
+    bar = Group('bar', B_DIR, blacklist=bg.blacklist)
+    a1 = PlaylistEntry(str(A_DIR_PATH / 'a 1.mkv'), al, ag)
+    foo1 = PlaylistEntry(str(B_DIR_PATH / 'foo 1.mkv'), bl, foo)
+    bar1 = PlaylistEntry(str(B_DIR_PATH / 'bar 1.mkv'), bl, bar)
+    foo2 = PlaylistEntry(str(B_DIR_PATH / 'FOO 2.mkv'), bl, foo)
+    actual = playlist.remove_dropped_groups([a1, foo1, bar1, foo2], [a1, foo1])
+    assert actual == [bar1]
+
+
+def test_remove_dropped_groups_keeps_groups_with_own_blacklist() -> None:
+    bg = Group(B_DIR, B_DIR, blacklist=['x'])
+    bl = Location(B_DIR, bg)
+    foo = Group('foo', B_DIR, blacklist=bg.blacklist)
+    own = Group('own', B_DIR, blacklist=['y'])
+    foo1 = PlaylistEntry(str(B_DIR_PATH / 'foo 1.mkv'), bl, foo)
+    own_foo = PlaylistEntry(str(B_DIR_PATH / 'own foo 1.mkv'), bl, own)
+    default_foo = PlaylistEntry(str(B_DIR_PATH / 'other foo 1.mkv'), bl, bg)
+    actual = playlist.remove_dropped_groups([foo1, own_foo, default_foo], [foo1])
+    assert actual == [own_foo]
+
+
+def next_up_locations(mocker: MockerFixture) -> list[Location]:
+    mock_listdir(mocker, {
+        A_DIR: [f'foo {i}.mkv' for i in range(1, 6)] + [f'bar {i}.mkv' for i in range(1, 4)]
+        + [f'qux {i}.mkv' for i in range(1, 3)],
+        B_DIR: [f'baz {i}.mkv' for i in range(1, 5)],
+    })
+    mocker.patch('os.path.isfile', return_value=True)
+    get_mock_open(mocker, DEFAULT_SETTINGS_MOCK)
+    a_location = Location(A_DIR,
+                          Group(A_DIR, priority=1),
+                          regex='(?P<group>.+) [0-9]+\\.mkv',
+                          groups=[Group('foo', priority=1),
+                                  Group('bar', priority=1, weight=Weight('bar', 2)),
+                                  Group('qux', priority=1)])
+    b_location = Location(B_DIR, Group(B_DIR, priority=2))
+    return [a_location, b_location]
+
+
+def test_next_up_is_start_of_playlist(mocker: MockerFixture) -> None:
+    locations = next_up_locations(mocker)
+    watched_list = [('foo 0.mkv', 'foo')]
+    expected = get_playlist(locations, watched_list, settings.get_settings())
+    assert len(expected) == 14
+    for n in range(len(expected) + 2):
+        assert next_up(locations, watched_list, n, settings.get_settings()) == expected[:n]
+    assert next_up(locations, watched_list, 3, settings.get_settings(), 'ba') \
+        == get_playlist(locations, watched_list, settings.get_settings(), 'ba')[:3]
+
+
+def test_next_up_stops_at_priority_that_fills_it(mocker: MockerFixture) -> None:
+    locations = next_up_locations(mocker)
+    interleave_groups = mocker.spy(playlist, '_iter_interleave_groups')
+    actual = next_up(locations, [], 2, settings.get_settings())
+    assert [path.dirname(entry.filename) for entry in actual] == [A_DIR, A_DIR]
+    assert interleave_groups.call_count > 0
+    assert all(args[0][0][0].location.name == A_DIR
+               for args, _ in interleave_groups.call_args_list)
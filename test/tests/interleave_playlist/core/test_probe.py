@@ -0,0 +1,102 @@
+#    Interleave Playlist
+#    Copyright (C) 2026 Thomas Sweeney
+#    This file is part of Interleave Playlist.
+#    Interleave Playlist is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#    Interleave Playlist is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+import struct
+from pathlib import Path
+
+import pytest
+from pytest_mock import MockerFixture
+
+from interleave_playlist.core import probe
+
+
+def ebml(element_id: int, data: bytes, unknown_size: bool = False) -> bytes:
+    id_bytes = element_id.to_bytes((element_id.bit_length() + 7) // 8, 'big')
+    size = b'\x01\xff\xff\xff\xff\xff\xff\xff' if unknown_size else \
+        b'\x01' + len(data).to_bytes(7, 'big')
+    return id_bytes + size + data
+
+
+def matroska(info: bytes, before_info: bytes = b'', unknown_segment_size: bool = False) -> bytes:
+    header = ebml(0x1A45DFA3, ebml(0x4282, b'matroska'))
+    seek_head = ebml(0x114D9B74, b'')
+    void = ebml(0xEC, b'\x00' * 16)
+    return header + ebml(0x18538067,
+                         seek_head + void + before_info + ebml(0x1549A966, info),
+                         unknown_segment_size)
+
+
+def box(box_type: bytes, data: bytes) -> bytes:
+    return struct.pack('>I4s', len(data) + 8, box_type) + data
+
+
+def mvhd_v0(timescale: int, duration: int) -> bytes:
+    return box(b'mvhd', b'\x00\x00\x00\x00' + struct.pack('>IIII', 0, 0, timescale, duration))
+
+
+def mvhd_v1(timescale: int, duration: int) -> bytes:
+    return box(b'mvhd', b'\x01\x00\x00\x00' + struct.pack('>QQIQ', 0, 0, timescale, duration))
+
+
+FTYP = box(b'ftyp', b'isom\x00\x00\x02\x00isomiso2mp41')
+MDAT = box(b'mdat', b'\x00' * 64)
+
+
+def write(tmp_path: Path, content: bytes) -> str:
+    filename = tmp_path / 'file'
+    filename.write_bytes(content)
+    return str(filename)
+
+
+@pytest.mark.parametrize(
+    'content,expected',
+    [
+        (matroska(ebml(0x2AD7B1, (1000 * 1000).to_bytes(3, 'big'))
+                  + ebml(0x4489, struct.pack('>d', 1234567.0))), 1234567),
+        (matroska(ebml(0x4489, struct.pack('>f', 1500.0))), 1500),
+        (matroska(ebml(0x2AD7B1, (1000 * 1000 * 1000).to_bytes(4, 'big'))
+                  + ebml(0x4489, struct.pack('>d', 90.5))), 90500),
+        (matroska(ebml(0x4489, struct.pack('>d', 1234.0)), unknown_segment_size=True), 1234),
+        (matroska(ebml(0x4489, struct.pack('>d', 1234.0)), before_info=ebml(0x1F43B675, b'')),
+         None),
+        (matroska(ebml(0x2AD7B1, (1000 * 1000).to_bytes(3, 'big'))), None),
+        (FTYP + box(b'moov', mvhd_v0(1000, 5000)) + MDAT, 5000),
+        (FTYP + MDAT + box(b'moov', box(b'udta', b'') + mvhd_v0(600, 900)), 1500),
+        (FTYP + box(b'moov', mvhd_v1(90000, 90000 * 60 * 60 * 25)) + MDAT, 1000 * 60 * 60 * 25),
+        (FTYP + box(b'moov', mvhd_v0(1000, 0)) + MDAT, None),
+        (FTYP + MDAT, None),
+        (b'definitely not a video file', None),
+        (b'', None),
+    ])
+def test_get_native_duration(tmp_path: Path, content: bytes, expected: int) -> None:
+    assert probe.get_native_duration(write(tmp_path, content)) == expected
+
+
+def test_get_native_duration_with_missing_file(tmp_path: Path) -> None:
+    assert probe.get_native_duration(str(tmp_path / 'missing.mkv')) is None
+
+
+def test_get_duration_does_not_use_media_info_when_not_needed(
+        tmp_path: Path, mocker: MockerFixture) -> None:
+    media_info_mock = mocker.patch.object(probe, '_get_media_info_duration')
+    filename = write(tmp_path, matroska(ebml(0x4489, struct.pack('>d', 1500.0))))
+    assert probe.get_duration(filename) == 1500
+    media_info_mock.assert_not_called()
+
+
+@pytest.mark.parametrize('media_info_duration,expected', [(42, 42), (None, 0)])
+def test_get_duration_falls_back_to_media_info(
+        tmp_path: Path, mocker: MockerFixture,
+        media_info_duration: int, expected: int) -> None:
+    mocker.patch.object(probe, '_get_media_info_duration', return_value=media_info_duration)
+    assert probe.get_duration(write(tmp_path, b'some other container')) == expected
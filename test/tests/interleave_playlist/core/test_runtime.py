@@ -0,0 +1,193 @@
+#    Interleave Playlist
+#    Copyright (C) 2026 Thomas Sweeney
+#    This file is part of Interleave Playlist.
+#    Interleave Playlist is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#    Interleave Playlist is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+import threading
+import time
+
+from interleave_playlist.core import runtime
+
+
+class ProbeMock:
+
+    def __init__(self, durations: dict[str, int]):
+        self.durations = durations
+        self.lock = threading.Lock()
+        self.running: dict[int, int] = {}
+        self.max_running: dict[int, int] = {}
+        self.max_running_total = 0
+
+    def probe(self, filename: str) -> int:
+        device = int(filename.split('/')[1])
+        with self.lock:
+            self.running[device] = self.running.get(device, 0) + 1
+            self.max_running[device] = max(self.max_running.get(device, 0),
+                                           self.running[device])
+            self.max_running_total = max(self.max_running_total, sum(self.running.values()))
+        time.sleep(0.01)
+        with self.lock:
+            self.running[device] -= 1
+        return self.durations[filename]
+
+
+def make_files(devices: int, per_device: int) -> dict[str, int]:
+    return {f'/{d}/{f}.mkv': d * 1000 + f for d in range(devices) for f in range(per_device)}
+
+
+def to_probe_queue(durations: dict[str, int]) -> runtime.ProbeQueue:
+    queue = runtime.ProbeQueue()
+    for filename in durations:
+        queue.put(filename, int(filename.split('/')[1]))
+    return queue
+
+
+def pop_all(queue: runtime.ProbeQueue) -> list[str]:
+    result = []
+    while (popped := queue.pop()) is not None:
+        result.append(popped[0])
+    return result
+
+
+def test_probe_queue_in_put_order() -> None:
+    queue = to_probe_queue(make_files(2, 2))
+    assert len(queue) == 4
+    assert pop_all(queue) == ['/0/0.mkv', '/0/1.mkv', '/1/0.mkv', '/1/1.mkv']
+    assert len(queue) == 0
+
+
+def test_probe_queue_prioritized() -> None:
+    queue = to_probe_queue(make_files(2, 3))
+    queue.prioritize(['/1/2.mkv', '/0/1.mkv'])
+    assert pop_all(queue) == ['/0/1.mkv', '/1/2.mkv',
+                              '/0/0.mkv', '/0/2.mkv', '/1/0.mkv', '/1/1.mkv']
+
+
+def test_probe_queue_most_recently_prioritized_first() -> None:
+    queue = to_probe_queue(make_files(1, 4))
+    queue.prioritize(['/0/2.mkv', '/0/3.mkv'])
+    queue.prioritize(['/0/3.mkv', '/0/1.mkv'])
+    assert pop_all(queue) == ['/0/1.mkv', '/0/3.mkv', '/0/2.mkv', '/0/0.mkv']
+
+
+def test_probe_queue_ignores_files_not_queued() -> None:
+    queue = runtime.ProbeQueue()
+    queue.prioritize(['/0/1.mkv'])
+    queue.put('/0/0.mkv', 0)
+    queue.put('/0/1.mkv', 0)
+    assert pop_all(queue) == ['/0/0.mkv', '/0/1.mkv']
+
+
+def test_probe_queue_forgets_popped_files() -> None:
+    queue = to_probe_queue(make_files(1, 2))
+    assert queue.pop() == ('/0/0.mkv', 0)
+    queue.prioritize(['/0/0.mkv', '/0/1.mkv'])
+    queue.put('/0/0.mkv', 0)
+    queue.put('/0/2.mkv', 0)
+    assert pop_all(queue) == ['/0/1.mkv', '/0/0.mkv', '/0/2.mkv']
+
+
+def test_probe_queue_skips_busy_devices() -> None:
+    queue = to_probe_queue(make_files(2, 2))
+    assert queue.pop({0}) == ('/1/0.mkv', 1)
+    assert queue.pop({0, 1}) is None
+    assert queue.pop() == ('/0/0.mkv', 0)
+
+
+def test_probe_durations_with_no_files() -> None:
+    assert list(runtime.probe_durations(runtime.ProbeQueue(), ProbeMock({}).probe, 4, 2)) == []
+
+
+def test_probe_durations_returns_all_durations() -> None:
+    durations = make_files(3, 5)
+    probe_mock = ProbeMock(durations)
+    actual = dict(runtime.probe_durations(to_probe_queue(durations), probe_mock.probe, 4, 2))
+    assert actual == durations
+
+
+def test_probe_durations_respects_worker_limits() -> None:
+    durations = make_files(3, 8)
+    probe_mock = ProbeMock(durations)
+    list(runtime.probe_durations(to_probe_queue(durations), probe_mock.probe, 4, 2))
+    assert probe_mock.max_running_total <= 4
+    assert all(i <= 2 for i in probe_mock.max_running.values())
+
+
+def test_probe_durations_stops() -> None:
+    durations = make_files(1, 20)
+    probe_mock = ProbeMock(durations)
+    actual: list[tuple[str, int]] = []
+    for result in runtime.probe_durations(to_probe_queue(durations), probe_mock.probe, 2, 2,
+                                          lambda: len(actual) >= 3):
+        actual.append(result)
+    assert 3 <= len(actual) < len(durations)
+
+
+def test_probe_durations_prioritized_while_running() -> None:
+    durations = make_files(1, 20)
+    probe_mock = ProbeMock(durations)
+    queue = to_probe_queue(durations)
+    actual: list[str] = []
+    for filename, _ in runtime.probe_durations(queue, probe_mock.probe, 1, 1):
+        if not actual:
+            queue.prioritize(['/0/19.mkv'])
+        actual.append(filename)
+    assert actual[:3] == ['/0/0.mkv', '/0/19.mkv', '/0/1.mkv']
+
+
+def test_runtime_aggregator_totals() -> None:
+    aggregator = runtime.RuntimeAggregator()
+    aggregator.reset(['a', 'b', 'c'])
+    assert (aggregator.total, aggregator.total_count, aggregator.total_missing) == (0, 3, 3)
+    assert aggregator.get_missing() == ['a', 'b', 'c']
+    aggregator.set_durations({'a': 1, 'b': 10})
+    assert (aggregator.total, aggregator.total_missing) == (11, 1)
+    assert 'a' in aggregator
+    assert 'c' not in aggregator
+    aggregator.set_durations({'c': 100, 'd': 1000})
+    assert (aggregator.total, aggregator.total_missing) == (111, 0)
+    aggregator.add(['d'])
+    aggregator.remove(['a'])
+    assert (aggregator.total, aggregator.total_count, aggregator.total_missing) == (1110, 3, 0)
+    aggregator.set_durations({'b': 20})
+    assert aggregator.total == 1120
+
+
+def test_runtime_aggregator_selection() -> None:
+    aggregator = runtime.RuntimeAggregator()
+    aggregator.reset(['a', 'b', 'c'])
+    aggregator.set_durations({'a': 1, 'b': 10})
+    aggregator.select(['a', 'c'])
+    assert (aggregator.selected, aggregator.selected_count, aggregator.selected_missing) \
+        == (1, 2, 1)
+    aggregator.set_durations({'c': 100})
+    assert (aggregator.selected, aggregator.selected_missing) == (101, 0)
+    aggregator.deselect(['a'])
+    aggregator.select(['b'])
+    assert (aggregator.selected, aggregator.selected_count) == (110, 2)
+    aggregator.clear_selection()
+    assert (aggregator.selected, aggregator.selected_count, aggregator.selected_missing) \
+        == (0, 0, 0)
+    assert aggregator.total == 111
+
+
+def test_runtime_aggregator_duplicates_and_repeated_removals() -> None:
+    aggregator = runtime.RuntimeAggregator()
+    aggregator.set_durations({'a': 5})
+    aggregator.reset(['a', 'a', 'b'])
+    aggregator.select(['a', 'a'])
+    assert (aggregator.total, aggregator.selected, aggregator.selected_count) == (10, 10, 2)
+    aggregator.deselect(['a', 'a', 'a', 'b'])
+    assert (aggregator.selected, aggregator.selected_count) == (0, 0)
+    aggregator.remove(['a', 'a', 'a', 'c'])
+    assert (aggregator.total, aggregator.total_count, aggregator.total_missing) == (0, 1, 1)
+    aggregator.reset([])
+    assert (aggregator.total, aggregator.total_count, aggregator.total_missing) == (0, 0, 0)
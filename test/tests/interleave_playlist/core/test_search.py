@@ -0,0 +1,64 @@
+#    Interleave Playlist
+#    Copyright (C) 2026 Thomas Sweeney
+#    This file is part of Interleave Playlist.
+#    Interleave Playlist is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#    Interleave Playlist is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+import pytest
+
+from interleave_playlist.core.search import TrigramIndex
+
+
+@pytest.fixture
+def index() -> TrigramIndex:
+    index = TrigramIndex()
+    index.update([
+        ('/a/1', 'Foo Bar - 01.mkv'),
+        ('/a/2', 'foo baz - 02.mkv'),
+        ('/b/3', 'Qux - 03.MKV'),
+    ])
+    return index
+
+
+def test_search_substring(index: TrigramIndex) -> None:
+    assert index.search('FOO') == {'/a/1', '/a/2'}
+    assert index.search('bar - 0') == {'/a/1'}
+    assert index.search('mkv') == {'/a/1', '/a/2', '/b/3'}
+    assert index.search('oo ba') == {'/a/1', '/a/2'}
+    assert index.search('nope') == set()
+
+
+def test_search_all_tokens_must_match(index: TrigramIndex) -> None:
+    assert index.search('02 foo') == {'/a/2'}
+    assert index.search('foo qux') == set()
+
+
+def test_search_short_tokens(index: TrigramIndex) -> None:
+    assert index.search('q') == {'/b/3'}
+    assert index.search('03 q') == {'/b/3'}
+    assert index.search('') == {'/a/1', '/a/2', '/b/3'}
+
+
+def test_fuzzy_search_ranked(index: TrigramIndex) -> None:
+    assert [key for key, _ in index.fuzzy_search('foo barr')] == ['/a/1', '/a/2']
+    assert [key for key, _ in index.fuzzy_search('foo barr', limit=1)] == ['/a/1']
+    assert index.fuzzy_search('zzzz') == []
+    assert index.fuzzy_search('ab') == []
+
+
+def test_update_and_remove(index: TrigramIndex) -> None:
+    index.update([('/a/4', 'Foo - 04.mkv'), ('/a/1', 'renamed.mkv')], ['/a/2'])
+    assert len(index) == 3
+    assert index.search('foo') == {'/a/4'}
+    assert index.search('renamed') == {'/a/1'}
+    index.remove('/a/4')
+    index.remove('/not/there')
+    assert index.search('foo') == set()
+    assert index._postings.get('foo') is None
@@ -0,0 +1,68 @@
+#    Interleave Playlist
+#    Copyright (C) 2026 Thomas Sweeney
+#    This file is part of Interleave Playlist.
+#    Interleave Playlist is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#    Interleave Playlist is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+import os
+import subprocess
+import sys
+
+import pytest
+
+from tests.helper import benchmark
+
+_ENTRY_POINT = 'interleave_playlist.interface.PlaylistApplication'
+# modules that are only needed once the app gets going and must never be imported at startup
+_LAZY_MODULES = ['pymediainfo', 'crontab']
+# Measured against importing the Qt widgets, which dominates startup, so a slow or busy machine
+# slows both down. About 2.3x here; another import as heavy as Qt would push it past the budget
+_QT_MODULE = 'PySide6.QtWidgets'
+_IMPORT_BUDGET_QT_RATIO = 3
+# the playlist building the cli and the daemon share has no business loading the GUI or probing
+_HEADLESS_MODULES = ['interleave_playlist.core.playlist', 'interleave_playlist.service',
+                     'interleave_playlist.cli']
+_GUI_MODULES = ['PySide6', 'pymediainfo', 'crontab']
+
+
+def get_import_times(module: str) -> dict[str, int]:
+    env = dict(os.environ, QT_QPA_PLATFORM='offscreen')
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                            env=env, capture_output=True, text=True, check=True)
+    import_times: dict[str, int] = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        import_times[name.strip()] = int(cumulative)
+    return import_times
+
+
+def test_startup_skips_lazy_modules() -> None:
+    import_times = get_import_times(_ENTRY_POINT)
+    assert [m for m in import_times if m.split('.')[0] in _LAZY_MODULES] == []
+
+
+@benchmark
+def test_startup_import_time() -> None:
+    # the first run may have to write bytecode, which isn't what's being measured
+    get_import_times(_ENTRY_POINT)
+    import_times = get_import_times(_ENTRY_POINT)
+    print(f'\n{_ENTRY_POINT}: {import_times[_ENTRY_POINT] / 1e6:.2f}s, '
+          f'{_QT_MODULE}: {import_times[_QT_MODULE] / 1e6:.2f}s')
+    assert import_times[_ENTRY_POINT] < import_times[_QT_MODULE] * _IMPORT_BUDGET_QT_RATIO
+
+
+@pytest.mark.parametrize('module', _HEADLESS_MODULES)
+def test_headless_modules_skip_gui_imports(module: str) -> None:
+    result = subprocess.run(
+        [sys.executable, '-c', f'import sys, {module}; print(*sorted(sys.modules))'],
+        capture_output=True, text=True, check=True)
+    assert [m for m in result.stdout.split() if m.split('.')[0] in _GUI_MODULES] == []
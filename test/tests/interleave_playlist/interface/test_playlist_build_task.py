@@ -0,0 +1,39 @@
+#    Interleave Playlist
+#    Copyright (C) 2026 Thomas Sweeney
+#    This file is part of Interleave Playlist.
+#    Interleave Playlist is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#    Interleave Playlist is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+from typing import Any
+
+from pytest_mock import MockerFixture
+
+from interleave_playlist.interface import PlaylistBuildTask as build_task_module
+from interleave_playlist.interface.PlaylistBuildTask import PlaylistBuildTask
+from interleave_playlist.persistence.watched import WatchedWriteQueue
+
+
+def test_build_reports_progress_before_completing(mocker: MockerFixture) -> None:
+    def build_playlist(*args: Any) -> list[str]:
+        on_progress = args[3]
+        for scanned in range(1, 101):
+            on_progress(scanned, 100)
+        return ['foo.mkv']
+    mocker.patch.object(build_task_module, '_build_playlist', side_effect=build_playlist)
+    events: list[tuple[Any, ...]] = []
+
+    task = PlaylistBuildTask(7, '', False, WatchedWriteQueue(lambda *_: None))
+    task.signals.progress.connect(lambda *e: events.append(('progress', *e)))
+    task.signals.completed.connect(lambda generation, playlist, _: events.append(
+        ('completed', generation, playlist)))
+    task.run()
+    assert events[0] == ('progress', 7, 1, 100)
+    assert events[-2:] == [('progress', 7, 100, 100), ('completed', 7, ['foo.mkv'])]
+    assert len(events) < 100
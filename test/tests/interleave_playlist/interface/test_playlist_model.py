@@ -0,0 +1,179 @@
+#    Interleave Playlist
+#    Copyright (C) 2026 Thomas Sweeney
+#    This file is part of Interleave Playlist.
+#    Interleave Playlist is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#    Interleave Playlist is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+import random
+
+import pytest
+from PySide6.QtCore import Qt, QItemSelectionModel
+from PySide6.QtGui import QBrush, QColor
+
+from interleave_playlist.core import PlaylistEntry
+from interleave_playlist.interface.PlaylistModel import PlaylistModel, FILENAME_ROLE, \
+    _get_changes
+from interleave_playlist.model import Group, Location
+
+WATCHED_COLOR = QBrush(QColor.fromRgb(1, 2, 3))
+
+
+def make_model(*names: str) -> PlaylistModel:
+    group = Group('/a')
+    location = Location('/a', group)
+    model = PlaylistModel(lambda: WATCHED_COLOR)
+    model.set_entries([PlaylistEntry(f'/a/{name}', location, group) for name in names],
+                      'INTERLEAVE', None, False)
+    return model
+
+
+def rows(model: PlaylistModel, role: int = Qt.ItemDataRole.DisplayRole) -> list[object]:
+    return [model.data(model.index(row), role) for row in range(model.rowCount())]
+
+
+def test_data() -> None:
+    model = make_model('foo.mkv', 'bar.mkv')
+    assert model.rowCount() == 2
+    assert rows(model) == ['foo.mkv', 'bar.mkv']
+    assert rows(model, FILENAME_ROLE) == ['/a/foo.mkv', '/a/bar.mkv']
+    assert rows(model, Qt.ItemDataRole.BackgroundRole) == [None, None]
+    assert model.entry(1).filename == '/a/bar.mkv'
+    assert model.rowCount(model.index(0)) == 0
+
+
+def test_set_watched() -> None:
+    model = make_model('0', '1', '2', '3', '4')
+    changed: list[tuple[int, int]] = []
+    model.dataChanged.connect(lambda first, last, _: changed.append((first.row(), last.row())))
+    model.set_watched([4, 0, 1, 3], True)
+    assert changed == [(0, 1), (3, 4)]
+    assert rows(model, Qt.ItemDataRole.BackgroundRole) \
+        == [WATCHED_COLOR, WATCHED_COLOR, None, WATCHED_COLOR, WATCHED_COLOR]
+    model.set_watched([1, 3], False)
+    assert rows(model, Qt.ItemDataRole.BackgroundRole) \
+        == [WATCHED_COLOR, None, None, None, WATCHED_COLOR]
+    model.set_entries(model.entries, 'INTERLEAVE', None, False)
+    assert rows(model, Qt.ItemDataRole.BackgroundRole) == [None] * 5
+
+
+def test_remove_rows() -> None:
+    model = make_model('0', '1', '2', '3', '4', '5')
+    removed: list[tuple[int, int]] = []
+    model.rowsRemoved.connect(lambda _, first, last: removed.append((first, last)))
+    model.remove_rows([5, 1, 2, 4])
+    assert removed == [(4, 5), (1, 2)]
+    assert rows(model) == ['0', '3']
+
+
+def by_name(entry: PlaylistEntry) -> str:
+    return entry.filename
+
+
+def test_sort_and_reverse() -> None:
+    model = make_model('b', 'c', 'a')
+    model.sort_by('NAME', by_name)
+    assert rows(model) == ['a', 'b', 'c']
+    model.set_reversed(True)
+    assert rows(model) == ['c', 'b', 'a']
+    model.sort_by('INTERLEAVE', None)
+    assert rows(model) == ['a', 'c', 'b']
+    model.set_reversed(False)
+    assert rows(model) == ['b', 'c', 'a']
+
+
+def test_sort_keys_computed_once_per_entries() -> None:
+    model = make_model('b', 'c', 'a')
+    calls: list[str] = []
+
+    def key(entry: PlaylistEntry) -> str:
+        calls.append(entry.filename)
+        return entry.filename
+    model.sort_by('NAME', key)
+    model.sort_by('INTERLEAVE', None)
+    model.sort_by('NAME', key)
+    assert len(calls) == 3
+    model.set_entries(model.entries, 'NAME', key, False)
+    assert len(calls) == 6
+
+
+def test_sort_preserves_selection() -> None:
+    model = make_model('b', 'c', 'a', 'd')
+    selection = QItemSelectionModel(model)
+    selection.select(model.index(0), QItemSelectionModel.SelectionFlag.Select)
+    selection.select(model.index(2), QItemSelectionModel.SelectionFlag.Select)
+    model.sort_by('NAME', by_name)
+    model.set_reversed(True)
+    selected = sorted(model.data(index) for index in selection.selectedRows())
+    assert selected == ['a', 'b']
+
+
+def test_remove_rows_sorted_and_reversed() -> None:
+    model = make_model('b', 'e', 'c', 'a', 'd')
+    model.sort_by('NAME', by_name)
+    model.set_reversed(True)
+    assert rows(model) == ['e', 'd', 'c', 'b', 'a']
+    model.remove_rows([1, 2, 4])
+    assert rows(model) == ['e', 'b']
+    model.set_reversed(False)
+    assert rows(model) == ['b', 'e']
+    model.sort_by('INTERLEAVE', None)
+    assert rows(model) == ['b', 'e']
+
+
+def test_update_entries_only_moves_changed_rows() -> None:
+    model = make_model('b', 'd', 'c', 'e')
+    model.sort_by('NAME', by_name)
+    model.set_reversed(True)
+    model.set_watched([0, 2], True)
+    selection = QItemSelectionModel(model)
+    selection.select(model.index(1), QItemSelectionModel.SelectionFlag.Select)
+    changes: list[tuple[str, int, int]] = []
+    model.rowsRemoved.connect(lambda _, first, last: changes.append(('removed', first, last)))
+    model.rowsInserted.connect(lambda _, first, last: changes.append(('inserted', first, last)))
+    model.modelReset.connect(lambda: changes.append(('reset', 0, 0)))
+    new_entries = make_model('f', 'a', 'b', 'd', 'e').entries
+    model.update_entries(new_entries, 'NAME', by_name, True)
+    assert rows(model) == ['f', 'e', 'd', 'b', 'a']
+    assert changes == [('inserted', 4, 4), ('removed', 2, 2), ('inserted', 0, 0)]
+    assert [model.data(index) for index in selection.selectedRows()] == ['d']
+    assert rows(model, Qt.ItemDataRole.BackgroundRole) \
+        == [None, WATCHED_COLOR, None, None, None]
+    assert model.entry(0) is new_entries[0]
+    model.set_reversed(False)
+    assert rows(model) == ['a', 'b', 'd', 'e', 'f']
+    model.sort_by('INTERLEAVE', None)
+    assert rows(model) == ['f', 'a', 'b', 'd', 'e']
+
+
+@pytest.mark.parametrize('seed', range(50))
+def test_get_changes_keeps_longest_common_run(seed: int) -> None:
+    rng = random.Random(seed)
+    old = rng.sample('abcdefghijkl', rng.randint(0, 12))
+    new = rng.sample('abcdefghijkl', rng.randint(0, 12))
+    changes = _get_changes(old, new)
+    result = list(old)
+    for first, last, new_first, new_last in reversed(changes):
+        result[first:last] = new[new_first:new_last]
+    assert result == new
+    kept = len(old) - sum(last - first for first, last, _, _ in changes)
+    # the longest common subsequence, the slow way
+    lengths = [[0] * (len(new) + 1) for _ in range(len(old) + 1)]
+    for i, a in enumerate(old):
+        for j, b in enumerate(new):
+            lengths[i + 1][j + 1] = (lengths[i][j] + 1 if a == b
+                                     else max(lengths[i][j + 1], lengths[i + 1][j]))
+    assert kept == lengths[-1][-1]
+
+
+def test_get_changes_large() -> None:
+    old = [str(i) for i in range(100_000)]
+    new = old[:50_000] + ['new'] + old[50_001:]
+    assert _get_changes(old, new) == [(50_000, 50_001, 50_000, 50_001)]
+    assert _get_changes(old, old) == []
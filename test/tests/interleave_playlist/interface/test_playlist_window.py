@@ -0,0 +1,160 @@
+#    Interleave Playlist
+#    Copyright (C) 2026 Thomas Sweeney
+#    This file is part of Interleave Playlist.
+#    Interleave Playlist is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#    Interleave Playlist is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+import gc
+import os
+import time
+from collections.abc import Callable, Iterator
+from pathlib import Path
+
+import pytest
+from PySide6.QtCore import QCoreApplication
+from PySide6.QtTest import QTest
+from PySide6.QtWidgets import QApplication
+from pytest_mock import MockerFixture
+
+from interleave_playlist.interface import PlaylistWindow as window_module
+from interleave_playlist.interface.PlaylistWindow import PlaylistWindow
+from interleave_playlist.persistence import settings
+
+
+@pytest.fixture(scope='module')
+def app() -> QCoreApplication:
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    return QApplication.instance() or QApplication([])
+
+
+@pytest.fixture
+def window(app: QCoreApplication, mocker: MockerFixture, tmp_path: Path) \
+        -> Iterator[PlaylistWindow]:
+    for show in ['a', 'b']:
+        (tmp_path / show).mkdir()
+        for episode in [1, 2, 3]:
+            (tmp_path / show / f'{show} {episode}.mkv').touch()
+    (tmp_path / 'input.yml').write_text(
+        'locations:\n' + ''.join(f'  - name: "{tmp_path / show}"\n' for show in ['a', 'b']))
+    mocker.patch('interleave_playlist.persistence.state.get_last_input_file',
+                 return_value=tmp_path / 'input.yml')
+    mocker.patch('interleave_playlist.persistence.settings.get_settings',
+                 return_value=settings.Settings(12, 'mpv', False, 100, True,
+                                                'INTERLEAVE', False, 8, 4))
+    mocker.patch('interleave_playlist.persistence.snapshot.get_snapshot', return_value=None)
+    mocker.patch('interleave_playlist.persistence.snapshot.set_snapshot')
+    mocker.patch.object(PlaylistWindow, '_run_calculate_total_runtime_thread')
+    window = PlaylistWindow()
+    wait_for(lambda: not window._build_tasks)
+    yield window
+    window.close()
+    # the window is only freed by the cycle collector. Left to run by itself it can go off in the
+    # middle of the next window's signal delivery, and Qt crashes tearing this one down there
+    del window
+    gc.collect()
+
+
+def wait_for(condition: Callable[[], bool], timeout_s: float = 5) -> None:
+    deadline = time.monotonic() + timeout_s
+    while not condition():
+        assert time.monotonic() < deadline, 'timed out'
+        QCoreApplication.processEvents()
+        time.sleep(0.001)
+
+
+def test_search_burst_builds_once(window: PlaylistWindow, mocker: MockerFixture) -> None:
+    assert len(window.playlist) == 6
+    build_task = mocker.spy(window_module, 'PlaylistBuildTask')
+    QTest.keyClicks(window.search_bar, 'a 1')
+    assert window.search_timer.isActive()
+    build_task.assert_not_called()
+    wait_for(lambda: not window.search_timer.isActive() and not window._build_tasks)
+    build_task.assert_called_once()
+    assert build_task.call_args.args[1:3] == ('a 1', True)
+    assert [Path(entry.filename).name for entry in window.playlist] == ['a 1.mkv']
+
+
+def test_superseded_build_is_dropped(window: PlaylistWindow, mocker: MockerFixture) -> None:
+    show_error = mocker.patch.object(window_module, 'show_playlist_build_error')
+    playlist = window.playlist
+    stale = window._build_generation
+    window._refresh()
+    window.playlist_build_completed(stale, playlist[:1], 0)
+    window.playlist_build_failed(stale, FileNotFoundError())
+    assert window.playlist is playlist
+    show_error.assert_not_called()
+    wait_for(lambda: not window._build_tasks)
+    assert window._build_generation == stale + 1
+    assert len(window.playlist) == 6
+
+
+def test_superseded_build_in_flight_is_cancelled(window: PlaylistWindow,
+                                                 mocker: MockerFixture) -> None:
+    apply_playlist = mocker.spy(window, '_apply_playlist')
+    window._refresh()
+    first = window._build_tasks[-1]
+    window._refresh()
+    assert first.cancellation_token.cancelled
+    wait_for(lambda: not window._build_tasks)
+    apply_playlist.assert_called_once()
+    assert len(window.playlist) == 6
+
+
+@pytest.mark.parametrize('elapsed_ms,expected_delay_ms', [
+    (0, window_module._MIN_SEARCH_DELAY_MS),
+    (50, 100),
+    (200, 400),
+    (10_000, window_module._MAX_SEARCH_DELAY_MS),
+])
+def test_search_delay_follows_build_time(window: PlaylistWindow, elapsed_ms: int,
+                                         expected_delay_ms: int) -> None:
+    window._build_use_cache = True
+    for _ in range(50):
+        window.playlist_build_completed(window._build_generation, window.playlist, elapsed_ms)
+    window.search_bar_text_edited('a')
+    assert abs(window.search_timer.interval() - expected_delay_ms) <= 2
+    window.search_timer.stop()
+
+
+def test_search_delay_grows_with_slower_builds(window: PlaylistWindow) -> None:
+    window._build_use_cache = True
+    window._search_ms = 0
+    delays = []
+    for elapsed_ms in [10, 40, 80, 160]:
+        window.playlist_build_completed(window._build_generation, window.playlist, elapsed_ms)
+        window.search_bar_text_edited('a')
+        delays.append(window.search_timer.interval())
+    window.search_timer.stop()
+    # smoothed, so one slow build moves it only part of the way
+    assert delays[0] < delays[1] < delays[2] < delays[3] < 160 * 2
+
+
+def test_enqueue_hidden_unless_mpv(window: PlaylistWindow, mocker: MockerFixture) -> None:
+    assert not window.enqueue_button.isHidden()
+    mocker.patch('interleave_playlist.persistence.settings.get_settings',
+                 return_value=settings.Settings(12, 'vlc', False, 100, True,
+                                                'INTERLEAVE', False, 8, 4))
+    play = mocker.patch.object(window, '_play')
+    window.refresh()
+    assert window.enqueue_button.isHidden()
+    window._enqueue()
+    play.assert_not_called()
+    wait_for(lambda: not window._build_tasks)
+
+
+def test_player_error_is_shown(window: PlaylistWindow, mocker: MockerFixture) -> None:
+    player = mocker.patch.object(window_module.mpv, 'MpvPlayer')
+    player.return_value.command = 'mpv'
+    player.return_value.play.side_effect = window_module.mpv.MpvError('mpv exited with 1')
+    message_box = mocker.patch.object(window_module, 'QMessageBox')
+    window.item_list.selectAll()
+    window._play()
+    wait_for(lambda: message_box.return_value.exec.called)
+    message_box.return_value.setInformativeText.assert_called_once_with('mpv exited with 1')
@@ -0,0 +1,186 @@
+#    Interleave Playlist
+#    Copyright (C) 2026 Thomas Sweeney
+#    This file is part of Interleave Playlist.
+#    Interleave Playlist is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#    Interleave Playlist is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+from collections.abc import Callable
+from threading import Event, Thread
+from typing import Any
+
+import pytest
+
+from interleave_playlist.interface.ProgressReporter import ProgressReporter, merge_dicts
+
+_MS = 1000 * 1000
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 0
+
+    def __call__(self) -> int:
+        return self.now
+
+
+class Scheduler:
+    def __init__(self) -> None:
+        self.scheduled: list[tuple[float, Callable[[], None]]] = []
+
+    def __call__(self, delay_s: float, callback: Callable[[], None]) -> None:
+        self.scheduled.append((delay_s, callback))
+
+    def run(self) -> None:
+        scheduled, self.scheduled = self.scheduled, []
+        for _, callback in scheduled:
+            callback()
+
+
+def test_report_coalesces_within_interval() -> None:
+    clock = Clock()
+    emitted: list[int] = []
+    reporter = ProgressReporter(emitted.append, rate_hz=10, clock=clock, schedule=Scheduler())
+    reporter.report(1)
+    for i in range(2, 100):
+        clock.now = i * _MS
+        reporter.report(i)
+    assert emitted == [1]
+    clock.now = 100 * _MS
+    reporter.report(100)
+    assert emitted == [1, 100]
+    reporter.report(101)
+    reporter.flush()
+    assert emitted == [1, 100, 101]
+
+
+def test_trailing_emit_sends_last_pending_value() -> None:
+    clock = Clock()
+    scheduler = Scheduler()
+    emitted: list[int] = []
+    reporter = ProgressReporter(emitted.append, rate_hz=10, clock=clock, schedule=scheduler)
+    reporter.report(1)
+    assert scheduler.scheduled == []
+    clock.now = 40 * _MS
+    reporter.report(2)
+    reporter.report(3)
+    assert emitted == [1]
+    assert [delay for delay, _ in scheduler.scheduled] == [pytest.approx(0.06)]
+    clock.now = 100 * _MS
+    scheduler.run()
+    assert emitted == [1, 3]
+    reporter.report(4)
+    assert emitted == [1, 3]
+    assert len(scheduler.scheduled) == 1
+
+
+def test_trailing_emit_after_tick_does_nothing() -> None:
+    clock = Clock()
+    scheduler = Scheduler()
+    emitted: list[int] = []
+    reporter = ProgressReporter(emitted.append, rate_hz=10, clock=clock, schedule=scheduler)
+    reporter.report(1)
+    reporter.report(2)
+    clock.now = 100 * _MS
+    reporter.report(3)
+    scheduler.run()
+    reporter.flush()
+    assert emitted == [1, 3]
+
+
+def test_close_drops_pending_and_stops_trailing_emit() -> None:
+    clock = Clock()
+    scheduler = Scheduler()
+    emitted: list[int] = []
+    reporter = ProgressReporter(emitted.append, rate_hz=10, clock=clock, schedule=scheduler)
+    reporter.report(1)
+    reporter.report(2)
+    reporter.close()
+    clock.now = 100 * _MS
+    scheduler.run()
+    reporter.report(3)
+    reporter.flush()
+    assert emitted == [1]
+
+
+def test_close_waits_for_trailing_emit() -> None:
+    emitting, release = Event(), Event()
+    emitted: list[int] = []
+
+    def emit(value: int) -> None:
+        if value == 2:
+            emitting.set()
+            release.wait(5)
+        emitted.append(value)
+
+    reporter = ProgressReporter(emit, rate_hz=100)
+    reporter.report(1)
+    reporter.report(2)
+    assert emitting.wait(5)
+    closer = Thread(target=reporter.close)
+    closer.start()
+    closer.join(0.05)
+    assert closer.is_alive()
+    release.set()
+    closer.join(5)
+    assert emitted == [1, 2]
+
+
+def test_default_scheduler_emits_without_flush() -> None:
+    emitted = Event()
+    values: list[int] = []
+
+    def emit(value: int) -> None:
+        values.append(value)
+        emitted.set()
+
+    reporter = ProgressReporter(emit, rate_hz=100)
+    reporter.report(1)
+    emitted.clear()
+    reporter.report(2)
+    assert emitted.wait(5)
+    assert values == [1, 2]
+
+
+def test_flush_without_pending_does_nothing() -> None:
+    emitted: list[int] = []
+    reporter = ProgressReporter(emitted.append)
+    reporter.flush()
+    reporter.report(1)
+    reporter.flush()
+    reporter.flush()
+    assert emitted == [1]
+
+
+def test_merge_accumulates_between_ticks() -> None:
+    clock = Clock()
+    emitted: list[dict[str, int]] = []
+    reporter = ProgressReporter(emitted.append, merge_dicts, clock=clock, schedule=Scheduler())
+    reporter.report({'a': 1})
+    reporter.report({'b': 2})
+    reporter.report({'c': 3, 'b': 4})
+    reporter.flush()
+    assert emitted == [{'a': 1}, {'b': 4, 'c': 3}]
+
+
+def test_merge_does_not_mutate_reported_value() -> None:
+    clock = Clock()
+    first = {'a': 1}
+    reporter: ProgressReporter[dict[str, int]] = ProgressReporter(
+        lambda _: None, merge_dicts, clock=clock, schedule=Scheduler())
+    reporter.report({'z': 0})
+    reporter.report(first)
+    reporter.report({'b': 2})
+    assert first == {'a': 1}
+
+
+@pytest.mark.parametrize('rate_hz', [0, -1])
+def test_invalid_rate(rate_hz: Any) -> None:
+    with pytest.raises(ValueError):
+        ProgressReporter(lambda _: None, rate_hz=rate_hz)
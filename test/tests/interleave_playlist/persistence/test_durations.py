@@ -0,0 +1,102 @@
+#    Interleave Playlist
+#    Copyright (C) 2026 Thomas Sweeney
+#    This file is part of Interleave Playlist.
+#    Interleave Playlist is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#    Interleave Playlist is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+import os
+from pathlib import Path
+
+import pytest
+
+from interleave_playlist.persistence import durations
+
+
+@pytest.fixture(autouse=True)
+def before_each(tmp_path: Path) -> None:
+    durations._DURATIONS_FILE = tmp_path / 'data' / 'durations.sqlite3'
+
+
+def make_file(path: Path, content: bytes = b'foo') -> str:
+    path.write_bytes(content)
+    return str(path)
+
+
+def test_get_file_key_with_missing_file(tmp_path: Path) -> None:
+    assert durations.get_file_key(str(tmp_path / 'foo.mkv')) is None
+
+
+def test_get_file_key_with_directory(tmp_path: Path) -> None:
+    assert durations.get_file_key(str(tmp_path)) is None
+
+
+def test_get_durations_with_nothing_stored(tmp_path: Path) -> None:
+    foo = make_file(tmp_path / 'foo.mkv')
+    foo_key = durations.get_file_key(foo)
+    assert foo_key is not None
+    assert durations.get_durations({foo: foo_key}) == {}
+
+
+def test_set_and_get_durations(tmp_path: Path) -> None:
+    foo = make_file(tmp_path / 'foo.mkv')
+    bar = make_file(tmp_path / 'bar.mkv', b'bar bar')
+    foo_key = durations.get_file_key(foo)
+    bar_key = durations.get_file_key(bar)
+    assert foo_key is not None and bar_key is not None
+    durations.set_durations([(foo, foo_key, 1000), (bar, bar_key, 2000)])
+    assert durations.get_durations({foo: foo_key, bar: bar_key}) == {foo: 1000, bar: 2000}
+
+
+def test_get_durations_after_file_modified(tmp_path: Path) -> None:
+    foo = make_file(tmp_path / 'foo.mkv')
+    foo_key = durations.get_file_key(foo)
+    assert foo_key is not None
+    durations.set_durations([(foo, foo_key, 1000)])
+    make_file(tmp_path / 'foo.mkv', b'something else')
+    os.utime(foo, ns=(foo_key[3] + 10**9, foo_key[3] + 10**9))
+    new_key = durations.get_file_key(foo)
+    assert new_key is not None and new_key != foo_key
+    assert durations.get_durations({foo: new_key}) == {}
+
+
+def test_get_durations_after_file_renamed(tmp_path: Path) -> None:
+    foo = make_file(tmp_path / 'foo.mkv')
+    foo_key = durations.get_file_key(foo)
+    assert foo_key is not None
+    durations.set_durations([(foo, foo_key, 1000)])
+    bar = str(tmp_path / 'bar.mkv')
+    os.rename(foo, bar)
+    bar_key = durations.get_file_key(bar)
+    assert bar_key is not None
+    assert durations.get_durations({bar: bar_key}) == {bar: 1000}
+
+
+def test_set_durations_replaces_stale_entry_for_path(tmp_path: Path) -> None:
+    durations.set_durations([('foo.mkv', (1, 2, 3, 4), 1000)])
+    durations.set_durations([('foo.mkv', (1, 2, 5, 6), 2000)])
+    assert durations.get_durations({'foo.mkv': (1, 2, 3, 4)}) == {}
+    assert durations.get_durations({'foo.mkv': (1, 2, 5, 6)}) == {'foo.mkv': 2000}
+
+
+def test_get_durations_in_one_batch(tmp_path: Path) -> None:
+    file_keys = {str(tmp_path / f'{i}.mkv'): (1, i, i, i) for i in range(5000)}
+    durations.set_durations([(f, k, int(Path(f).stem))
+                             for f, k in file_keys.items() if k[1] % 2])
+    foo = make_file(tmp_path / 'foo.mkv')
+    foo_key = durations.get_file_key(foo)
+    assert foo_key is not None
+    durations.set_durations([(foo, foo_key, 7)])
+    # a hard link has the same key under another name
+    linked = str(tmp_path / 'linked.mkv')
+    os.link(foo, linked)
+    actual = durations.get_durations({**file_keys, foo: foo_key, linked: foo_key})
+    assert actual == {**{f: k[1] for f, k in file_keys.items() if k[1] % 2},
+                      foo: 7, linked: 7}
+    assert durations.get_durations({foo: foo_key}) == {foo: 7}
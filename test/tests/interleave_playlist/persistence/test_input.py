@@ -0,0 +1,163 @@
+#    Interleave Playlist
+#    Copyright (C) 2026 Thomas Sweeney
+#    This file is part of Interleave Playlist.
+#    Interleave Playlist is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#    Interleave Playlist is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+from pathlib import Path
+
+import pytest
+from pytest_mock import MockerFixture
+from ruamel.yaml import CommentedMap
+
+from interleave_playlist.core import PlaylistEntry
+from interleave_playlist.model import Group, Location
+from interleave_playlist.persistence import input_
+
+INPUT_CONTENT = '''# my shows
+whitelist:
+  - '.mkv'
+locations:
+  - name: '{a}'
+    priority: 10 # watch this first
+  - name: "{b}"
+    regex: '^(?P<group>.+) - [0-9]+.mkv$'
+'''
+
+
+@pytest.fixture(autouse=True)
+def before_each() -> None:
+    input_._CACHED_INPUT = {}
+
+
+@pytest.fixture
+def input_file(mocker: MockerFixture, tmp_path: Path) -> Path:
+    (tmp_path / 'A').mkdir()
+    (tmp_path / 'B').mkdir()
+    input_file = tmp_path / 'input.yml'
+    input_file.write_text(INPUT_CONTENT.format(a=tmp_path / 'A', b=tmp_path / 'B'))
+    mocker.patch('interleave_playlist.persistence.state.get_last_input_file',
+                 return_value=input_file)
+    return input_file
+
+
+def test_get_input_read_only_does_not_round_trip(input_file: Path) -> None:
+    assert not isinstance(input_._get_input(input_file), CommentedMap)
+
+
+def test_get_input_round_trip(input_file: Path) -> None:
+    assert isinstance(input_._get_input(input_file, round_trip=True), CommentedMap)
+
+
+def test_get_locations(input_file: Path, tmp_path: Path) -> None:
+    locations = input_.get_locations()
+    assert [loc.name for loc in locations] == [str(tmp_path / 'A'), str(tmp_path / 'B')]
+    assert locations[0].default_group.priority == 10
+    assert locations[0].default_group.whitelist == ['.mkv']
+    assert locations[1].regex == '^(?P<group>.+) - [0-9]+.mkv$'
+
+
+def test_get_locations_with_missing_location(input_file: Path, tmp_path: Path) -> None:
+    (tmp_path / 'B').rmdir()
+    with pytest.raises(input_.LocationNotFound):
+        input_.get_locations()
+
+
+def test_drop_groups_preserves_comments_and_quotes(input_file: Path, tmp_path: Path) -> None:
+    loc_name = str(tmp_path / 'B')
+    loc = Location(loc_name, Group(loc_name, loc_name))
+    input_.drop_groups([PlaylistEntry(str(tmp_path / 'B' / 'foo - 1.mkv'), loc, Group('foo'))])
+    content = input_file.read_text()
+    assert '# my shows' in content
+    assert '# watch this first' in content
+    assert f'"{loc_name}"' in content
+    assert [loc.default_group.blacklist for loc in input_.get_locations()] == [[], ['foo']]
+
+
+def test_drop_groups_many_entries_with_single_write(
+        input_file: Path, tmp_path: Path, mocker: MockerFixture) -> None:
+    a_name = str(tmp_path / 'A')
+    b_name = str(tmp_path / 'B')
+    a_loc = Location(a_name, Group(a_name, a_name))
+    b_loc = Location(b_name, Group(b_name, b_name))
+    replace_spy = mocker.spy(input_.os, 'replace')
+    input_.drop_groups([
+        PlaylistEntry(str(tmp_path / 'A' / 'bar.mkv'), a_loc, a_loc.default_group),
+        PlaylistEntry(str(tmp_path / 'B' / 'foo - 1.mkv'), b_loc, Group('foo')),
+        PlaylistEntry(str(tmp_path / 'B' / 'foo - 2.mkv'), b_loc, Group('foo')),
+        PlaylistEntry(str(tmp_path / 'B' / 'baz - 1.mkv'), b_loc, Group('baz')),
+    ])
+    replace_spy.assert_called_once()
+    assert not (tmp_path / 'input.yml.tmp').exists()
+    locations = input_.get_locations()
+    assert [loc.name for loc in locations] == [b_name]
+    assert locations[0].default_group.blacklist == ['foo', 'baz']
+
+
+def test_drop_groups_updates_cache_without_reparsing(
+        input_file: Path, tmp_path: Path, mocker: MockerFixture) -> None:
+    b_name = str(tmp_path / 'B')
+    b_loc = Location(b_name, Group(b_name, b_name))
+    input_.drop_groups([PlaylistEntry(str(tmp_path / 'B' / 'foo - 1.mkv'), b_loc, Group('foo'))])
+    get_yaml_spy = mocker.spy(input_, '_get_yaml')
+    assert input_.get_locations()[1].default_group.blacklist == ['foo']
+    get_yaml_spy.assert_not_called()
+
+
+def test_drop_groups_leaves_earlier_locations_alone(input_file: Path, tmp_path: Path) -> None:
+    (tmp_path / 'input.yml').write_text(
+        INPUT_CONTENT.format(a=tmp_path / 'A', b=tmp_path / 'B') + "    blacklist:\n      - 'x'\n")
+    input_._get_input(input_file, round_trip=True)
+    before = input_.get_locations()
+    b_loc = before[1]
+    input_.drop_groups([PlaylistEntry(str(tmp_path / 'B' / 'foo - 1.mkv'), b_loc, Group('foo'))])
+    assert b_loc.default_group.blacklist == ['x']
+    assert input_.get_locations()[1].default_group.blacklist == ['x', 'foo']
+
+
+def test_drop_groups_failed_write_leaves_cache_alone(
+        input_file: Path, tmp_path: Path, mocker: MockerFixture) -> None:
+    b_name = str(tmp_path / 'B')
+    b_loc = Location(b_name, Group(b_name, b_name))
+    input_._get_input(input_file, round_trip=True)
+    mocker.patch.object(input_.os, 'replace', side_effect=OSError('disk full'))
+    with pytest.raises(OSError):
+        input_.drop_groups([PlaylistEntry(str(tmp_path / 'B' / 'foo - 1.mkv'), b_loc,
+                                          Group('foo'))])
+    assert input_.get_locations()[1].default_group.blacklist == []
+
+
+def test_get_input_reparses_after_file_changes(input_file: Path) -> None:
+    assert 'blacklist' not in input_._get_input(input_file)
+    with open(input_file, 'a') as f:
+        f.write("blacklist:\n  - 'foo'\n")
+    assert input_._get_input(input_file)['blacklist'] == ['foo']
+
+
+def test_groups_without_blacklist_share_location_blacklist(tmp_path: Path) -> None:
+    (tmp_path / 'A').mkdir()
+    (tmp_path / 'B').mkdir()
+    input_file = tmp_path / 'input.yml'
+    input_file.write_text(f"""locations:
+  - name: '{tmp_path / 'A'}'
+    groups:
+      - name: 'inherits'
+      - name: 'own'
+        blacklist: ['x']
+  - name: '{tmp_path / 'B'}'
+    blacklist: ['y']
+    groups:
+      - name: 'inherits'
+""")
+    a, b = input_.get_locations(input_file)
+    assert a.groups[0].blacklist is a.default_group.blacklist
+    assert a.groups[1].blacklist == ['x']
+    assert b.groups[0].blacklist is b.default_group.blacklist
+    assert b.groups[0].blacklist == ['y']
@@ -0,0 +1,61 @@
+#    Interleave Playlist
+#    Copyright (C) 2026 Thomas Sweeney
+#    This file is part of Interleave Playlist.
+#    Interleave Playlist is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#    Interleave Playlist is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+import time
+from pathlib import Path
+
+from interleave_playlist.persistence import input_
+from tests.helper import benchmark
+
+_LOCATIONS = 2000
+_GROUPS_PER_LOCATION = 5
+
+
+def write_large_input(tmp_path: Path) -> Path:
+    lines = ['# generated', 'whitelist:', "  - '.mkv'", 'locations:']
+    for i in range(_LOCATIONS):
+        directory = tmp_path / f'show {i}'
+        directory.mkdir()
+        lines += [f"  - name: '{directory}'",
+                  f'    priority: {i % 10} # comment {i}',
+                  "    regex: '^(?P<group>.+) - [0-9]+.mkv$'",
+                  '    groups:']
+        for j in range(_GROUPS_PER_LOCATION):
+            lines += [f'      - name: "group {j}"',
+                      '        blacklist:',
+                      f"          - 'episode {j}'"]
+    input_file = tmp_path / 'input.yml'
+    input_file.write_text('\n'.join(lines) + '\n')
+    return input_file
+
+
+def time_load(input_file: Path, round_trip: bool) -> float:
+    input_._CACHED_INPUT = {}
+    start = time.perf_counter()
+    input_._get_input(input_file, round_trip)
+    return time.perf_counter() - start
+
+
+@benchmark
+def test_safe_loader_benchmark(tmp_path: Path) -> None:
+    input_file = write_large_input(tmp_path)
+    round_trip_s = time_load(input_file, round_trip=True)
+    safe_s = time_load(input_file, round_trip=False)
+    input_._CACHED_INPUT = {}
+    start = time.perf_counter()
+    assert len(input_.get_locations(input_file)) == _LOCATIONS
+    get_locations_s = time.perf_counter() - start
+    print(f'\n{_LOCATIONS} locations, {_LOCATIONS * _GROUPS_PER_LOCATION} groups: '
+          f'round-trip {round_trip_s:.2f}s, safe {safe_s:.2f}s, '
+          f'get_locations {get_locations_s:.2f}s')
+    assert safe_s < round_trip_s
@@ -11,6 +11,7 @@
 #    GNU General Public License for more details.
 #    You should have received a copy of the GNU General Public License
 #    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+import dataclasses
 import os
 from contextlib import nullcontext as does_not_raise
 from pathlib import Path
@@ -33,6 +34,8 @@ max-watched-remembered: 100
 exclude-directories: true
 default-sort-name: interleave
 default-sort-reversed: false
+runtime-probe-workers: 8
+runtime-probe-workers-per-device: 4
 '''
 DEFAULT_SETTINGS_MOCK = {settings._SETTINGS_FILE: DEFAULT_SETTINGS_CONTENT}
 MODIFIED_SETTINGS_MOCK = {settings._SETTINGS_FILE: '''font-size: 13
@@ -42,6 +45,8 @@ max-watched-remembered: 10
 exclude-directories: false
 default-sort-name: alphabetical
 default-sort-reversed: true
+runtime-probe-workers: 2
+runtime-probe-workers-per-device: 1
 '''}
 INVALID_SETTINGS_MOCK = {settings._SETTINGS_FILE: '''font-size: thirteen
 play-command: 24
@@ -50,6 +55,8 @@ max-watched-remembered: ten
 exclude-directories: maybe
 default-sort-name: foo
 default-sort-reversed: what
+runtime-probe-workers: 0
+runtime-probe-workers-per-device: many
 '''}
 NEEDS_CONVERSION_SETTINGS_MOCK = {settings._SETTINGS_FILE: '''font-size: '13'
 play-command: true
@@ -58,12 +65,16 @@ max-watched-remembered: '10'
 exclude-directories: 'TrUe'
 default-sort-name: 'interleave'
 default-sort-reversed: 'FaLSe'
+runtime-probe-workers: '16'
+runtime-probe-workers-per-device: '2'
 '''}
 
 
 @pytest.fixture(autouse=True)
 def before_each() -> None:
     settings._CACHED_FILE = {}
+    settings._CACHED_FILE_KEY = None
+    settings._CACHED_SETTINGS = None
     settings._SETTINGS_FILE = ORIGINAL_SETTINGS_FILE
 
 
@@ -202,3 +213,59 @@ def test_create_settings_file_with_directory_already_existing_but_not_file(
     mkdir_mock.assert_not_called()
     with open(settings._SETTINGS_FILE, 'r') as f:
         assert f.read() == DEFAULT_SETTINGS_CONTENT
+
+
+@pytest.mark.parametrize(
+    'open_mock_data,expected',
+    [
+        (EMPTY_SETTINGS_MOCK,
+         settings.Settings(12, 'mpv', False, 100, True, 'INTERLEAVE', False, 8, 4)),
+        (MODIFIED_SETTINGS_MOCK,
+         settings.Settings(13, 'vlc', True, 10, False, 'ALPHABETICAL', True, 2, 1)),
+        (NEEDS_CONVERSION_SETTINGS_MOCK,
+         settings.Settings(13, 'True', False, 10, True, 'INTERLEAVE', False, 16, 2)),
+    ])
+def test_get_settings(mocker: MockerFixture,
+                      open_mock_data: dict[Path, str],
+                      expected: settings.Settings) -> None:
+    get_mock_open(mocker, open_mock_data)
+    assert settings.get_settings() == expected
+
+
+def test_get_settings_is_immutable(mocker: MockerFixture) -> None:
+    get_mock_open(mocker, DEFAULT_SETTINGS_MOCK)
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        settings.get_settings().font_size = 13  # type: ignore
+
+
+def test_get_settings_with_invalid_values(mocker: MockerFixture) -> None:
+    get_mock_open(mocker, INVALID_SETTINGS_MOCK)
+    with pytest.raises(CriticalUserError) as e:
+        settings.get_settings()
+    assert 'font-size: thirteen' in e.value.message
+    assert 'default-sort-name: foo' in e.value.message
+    assert 'runtime-probe-workers: 0' in e.value.message
+    assert 'play-command' not in e.value.message
+
+
+def test_get_settings_reloads_after_file_changes(tmp_path: Path) -> None:
+    settings._SETTINGS_FILE = tmp_path / SETTINGS_FILENAME
+    settings._SETTINGS_FILE.write_text(DEFAULT_SETTINGS_CONTENT)
+    first = settings.get_settings()
+    assert settings.get_settings() is first
+    settings._SETTINGS_FILE.write_text(DEFAULT_SETTINGS_CONTENT.replace('12', '14'))
+    assert settings.get_settings().font_size == 14
+
+
+def test_get_settings_does_not_write_file_when_nothing_missing(mocker: MockerFixture) -> None:
+    open_mock = get_mock_open(mocker, DEFAULT_SETTINGS_MOCK)
+    settings.get_settings()
+    assert all(c.args[1] == 'r' for c in open_mock.call_args_list)
+
+
+def test_get_settings_writes_missing_defaults(tmp_path: Path) -> None:
+    settings._SETTINGS_FILE = tmp_path / SETTINGS_FILENAME
+    settings._SETTINGS_FILE.write_text('font-size: 13\n')
+    assert settings.get_settings().font_size == 13
+    with open(settings._SETTINGS_FILE, 'r') as f:
+        assert f.read() == DEFAULT_SETTINGS_CONTENT.replace('12', '13')
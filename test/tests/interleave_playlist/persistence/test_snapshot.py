@@ -0,0 +1,97 @@
+#    Interleave Playlist
+#    Copyright (C) 2026 Thomas Sweeney
+#    This file is part of Interleave Playlist.
+#    Interleave Playlist is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#    Interleave Playlist is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+from copy import copy
+from pathlib import Path
+
+import pytest
+from pytest_mock import MockerFixture
+
+from interleave_playlist.core import PlaylistEntry
+from interleave_playlist.model import Group, Location
+from interleave_playlist.persistence import snapshot
+
+SHOW_A = Group('show a', '/shows')
+SHOWS = Location('/shows', Group('/shows', '/shows'), groups=[SHOW_A])
+MOVIES = Location('/movies', Group('/movies', '/movies'))
+
+
+@pytest.fixture(autouse=True)
+def before_each(mocker: MockerFixture, tmp_path: Path) -> None:
+    mocker.patch('interleave_playlist.persistence.snapshot._SNAPSHOT_FILE',
+                 tmp_path / 'snapshot.json')
+    mocker.patch('interleave_playlist.persistence.state.get_last_input_file',
+                 return_value=tmp_path / 'input.yml')
+
+
+def make_snapshot() -> snapshot.Snapshot:
+    return snapshot.Snapshot(
+        [PlaylistEntry('/shows/a 1.mkv', SHOWS, SHOW_A),
+         PlaylistEntry('/movies/b.mkv', MOVIES, MOVIES.default_group),
+         PlaylistEntry('/shows/c.mkv', SHOWS, SHOWS.default_group),
+         PlaylistEntry('/shows/a 2.mkv', SHOWS, SHOW_A)],
+        {'/movies/b.mkv'},
+        {'/shows/a 1.mkv': 1000, '/shows/c.mkv': 0})
+
+
+def test_round_trip() -> None:
+    expected = make_snapshot()
+    snapshot.set_snapshot(expected)
+    actual = snapshot.get_snapshot([SHOWS, MOVIES])
+    assert actual == expected
+    assert actual is not None
+    assert [(entry.location, entry.group) for entry in actual.entries] \
+        == [(SHOWS, SHOW_A), (MOVIES, MOVIES.default_group),
+            (SHOWS, SHOWS.default_group), (SHOWS, SHOW_A)]
+
+
+def test_round_trip_with_regex_groups() -> None:
+    location = Location('/anime', Group('/anime', '/anime', priority=2),
+                        regex=r'\[.*\] (?P<group>.*) - \d+')
+    show = copy(location.default_group)
+    show.name = 'show b'
+    snapshot.set_snapshot(snapshot.Snapshot(
+        [PlaylistEntry('/anime/[x] show b - 01.mkv', location, show),
+         PlaylistEntry('/anime/[x] show b - 02.mkv', location, show)]))
+    actual = snapshot.get_snapshot([location])
+    assert actual is not None
+    assert [entry.group.name for entry in actual.entries] == ['show b', 'show b']
+    assert actual.entries[0].group is actual.entries[1].group
+    assert actual.entries[0].group.priority == 2
+    assert location.default_group.name == '/anime'
+
+
+def test_snapshot_with_removed_group() -> None:
+    snapshot.set_snapshot(make_snapshot())
+    assert snapshot.get_snapshot([Location('/shows', Group('/shows', '/shows')), MOVIES]) is None
+
+
+def test_no_snapshot() -> None:
+    assert snapshot.get_snapshot([SHOWS, MOVIES]) is None
+
+
+def test_snapshot_of_other_input_file(mocker: MockerFixture, tmp_path: Path) -> None:
+    snapshot.set_snapshot(make_snapshot())
+    mocker.patch('interleave_playlist.persistence.state.get_last_input_file',
+                 return_value=tmp_path / 'other.yml')
+    assert snapshot.get_snapshot([SHOWS, MOVIES]) is None
+
+
+def test_snapshot_with_removed_location() -> None:
+    snapshot.set_snapshot(make_snapshot())
+    assert snapshot.get_snapshot([SHOWS]) is None
+
+
+def test_corrupt_snapshot(tmp_path: Path) -> None:
+    (tmp_path / 'snapshot.json').write_text('{"version": 1, "entries": [')
+    assert snapshot.get_snapshot([SHOWS, MOVIES]) is None
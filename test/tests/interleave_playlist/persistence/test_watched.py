@@ -100,8 +100,8 @@ def test_add_watched(content: list[tuple[str, str]],
         content_cpy = content.copy()
     else:
         content_cpy = []
-    mocker.patch('interleave_playlist.core.playlist.get_playlist',
-                 return_value=[to_playlist_entry(*c) for c in content_cpy])
+    mocker.patch('interleave_playlist.persistence.watched._get_basenames',
+                 return_value={c[0] for c in content_cpy})
     add_pl = [to_playlist_entry(*pl) for pl in add]
     content_cpy.extend(add)
     watched.add_watched(add_pl)
@@ -134,11 +134,94 @@ def test_removed_watched(content: list[tuple[str, str]],
         content_cpy = content.copy()
     else:
         content_cpy = []
-    mocker.patch('interleave_playlist.core.playlist.get_playlist',
-                 return_value=[to_playlist_entry(*c) for c in content_cpy])
+    mocker.patch('interleave_playlist.persistence.watched._get_basenames',
+                 return_value={c[0] for c in content_cpy})
     add_pl = [to_playlist_entry(*pl) for pl in remove]
     for r in remove:
         if r in content_cpy:
             content_cpy.remove(r)
     watched.remove_watched(add_pl)
     assert watched.get_watched() == content_cpy
+
+
+def test_update_watched_matches_applying_changes_in_order(tmp_path: Path,
+                                                          mocker: MockerFixture) -> None:
+    to_watched_file(_many, tmp_path / Path('foo/input.yml.watched.txt'))
+    mocker.patch('interleave_playlist.persistence.watched._get_basenames',
+                 return_value={c[0] for c in _many})
+    watched.update_watched([
+        (to_playlist_entry('3', 'g'), True),
+        (to_playlist_entry('1', 'g'), False),
+        (to_playlist_entry('1', 'g'), True),
+        (to_playlist_entry('2', 'g'), False),
+    ])
+    assert watched.get_watched() == [('3', 'g'), ('1', 'g')]
+
+
+def test_watched_write_queue_coalesces_submissions(tmp_path: Path,
+                                                   mocker: MockerFixture) -> None:
+    update_watched = mocker.patch('interleave_playlist.persistence.watched.update_watched')
+    on_error = mocker.Mock()
+    queue = watched.WatchedWriteQueue(on_error, delay_s=0.1)
+    a, b = to_playlist_entry('1', 'g'), to_playlist_entry('2', 'g')
+    queue.submit([a], True)
+    queue.submit([b], True)
+    queue.submit([a], False)
+    queue.flush()
+    update_watched.assert_called_once_with([(a, True), (b, True), (a, False)],
+                                           tmp_path / 'foo/input.yml')
+    on_error.assert_not_called()
+
+
+def test_watched_write_queue_writes_to_input_open_when_submitted(tmp_path: Path,
+                                                                 mocker: MockerFixture) -> None:
+    update_watched = mocker.patch('interleave_playlist.persistence.watched.update_watched')
+    get_last_input_file = mocker.patch(
+        'interleave_playlist.persistence.state.get_last_input_file')
+    queue = watched.WatchedWriteQueue(mocker.Mock(), delay_s=0.1)
+    a, b = to_playlist_entry('1', 'g'), to_playlist_entry('2', 'g')
+    get_last_input_file.return_value = tmp_path / 'first.yml'
+    queue.submit([a], True)
+    get_last_input_file.return_value = tmp_path / 'second.yml'
+    queue.submit([b], True)
+    queue.flush()
+    assert update_watched.call_args_list == [
+        mocker.call([(a, True)], tmp_path / 'first.yml'),
+        mocker.call([(b, True)], tmp_path / 'second.yml'),
+    ]
+
+
+def test_clean_watched_list_from_directory_listings(tmp_path: Path,
+                                                    mocker: MockerFixture) -> None:
+    for directory, names in [('a', ['1', '2']), ('extra', ['3'])]:
+        os.mkdir(tmp_path / directory)
+        for name in names:
+            (tmp_path / directory / name).touch()
+    mocker.patch('interleave_playlist.persistence.input_.get_locations', return_value=[
+        Location(str(tmp_path / 'a'), Group(str(tmp_path / 'a')),
+                 additional=[str(tmp_path / 'extra')])])
+    mocker.patch('interleave_playlist.persistence.settings.get_max_watched_remembered',
+                 return_value=1)
+    get_playlist = mocker.patch('interleave_playlist.core.playlist.get_playlist')
+    to_watched_file([('gone 1', 'g'), ('1', 'g'), ('gone 2', 'g'), ('3', 'g')],
+                    tmp_path / Path('foo/input.yml.watched.txt'))
+    watched.update_watched([(to_playlist_entry('2', 'g'), True)])
+    assert watched.get_watched() == [('1', 'g'), ('gone 2', 'g'), ('3', 'g'), ('2', 'g')]
+    get_playlist.assert_not_called()
+
+
+def test_watched_write_queue_reports_failed_changes(mocker: MockerFixture) -> None:
+    error = OSError('disk full')
+    mocker.patch('interleave_playlist.persistence.watched.update_watched', side_effect=error)
+    on_error = mocker.Mock()
+    queue = watched.WatchedWriteQueue(on_error)
+    a = to_playlist_entry('1', 'g')
+    queue.submit([a], True)
+    queue.flush()
+    on_error.assert_called_once_with([(a, True)], error)
+
+
+def test_watched_write_queue_flush_with_nothing_pending(mocker: MockerFixture) -> None:
+    update_watched = mocker.patch('interleave_playlist.persistence.watched.update_watched')
+    watched.WatchedWriteQueue(mocker.Mock()).flush()
+    update_watched.assert_not_called()
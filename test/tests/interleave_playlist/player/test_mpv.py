@@ -0,0 +1,217 @@
+#    Interleave Playlist
+#    Copyright (C) 2026 Thomas Sweeney
+#    This file is part of Interleave Playlist.
+#    Interleave Playlist is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#    Interleave Playlist is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+import json
+import os
+import socket
+import sys
+import threading
+import time
+from collections.abc import Callable, Iterator
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from interleave_playlist.player import mpv
+
+
+# Replies to every command like mpv would, except the ones given other replies. None is no reply
+class FakeMpv:
+    def __init__(self, socket_file: Path) -> None:
+        self.commands: list[list[Any]] = []
+        self.replies: dict[str, Any] = {}
+        self._connections: list[socket.socket] = []
+        self._server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._server.bind(str(socket_file))
+        self._server.listen()
+        threading.Thread(target=self._accept, daemon=True).start()
+
+    def send(self, message: dict[str, Any]) -> None:
+        for connection in self._connections:
+            connection.sendall((json.dumps(message) + '\n').encode('utf-8'))
+
+    def close(self) -> None:
+        self._server.close()
+        connections, self._connections = self._connections, []
+        for connection in connections:
+            connection.shutdown(socket.SHUT_RDWR)
+            connection.close()
+
+    def _accept(self) -> None:
+        while True:
+            try:
+                connection, _ = self._server.accept()
+            except OSError:
+                return
+            self._connections.append(connection)
+            threading.Thread(target=self._serve, args=(connection,), daemon=True).start()
+
+    def _serve(self, connection: socket.socket) -> None:
+        try:
+            for line in connection.makefile('rb'):
+                request = json.loads(line)
+                self.commands.append(request['command'])
+                reply = self.replies.get(request['command'][0],
+                                         {'error': 'success', 'data': None})
+                if reply is not None:
+                    connection.sendall((json.dumps({**reply, 'request_id': request['request_id']})
+                                        + '\n').encode('utf-8'))
+        except OSError:
+            pass
+
+
+@pytest.fixture
+def fake(tmp_path: Path) -> Iterator[FakeMpv]:
+    fake = FakeMpv(tmp_path / 'mpv.sock')
+    yield fake
+    fake.close()
+
+
+def wait_for(condition: Callable[[], bool]) -> None:
+    deadline = time.monotonic() + 5
+    while not condition():
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+
+def test_command(fake: FakeMpv, tmp_path: Path) -> None:
+    fake.replies['get_property'] = {'error': 'success', 'data': '/a.mkv'}
+    fake.replies['bad'] = {'error': 'invalid parameter'}
+    client = mpv.MpvClient(tmp_path / 'mpv.sock')
+    assert client.command('get_property', 'path') == '/a.mkv'
+    with pytest.raises(mpv.MpvError, match='invalid parameter'):
+        client.command('bad')
+    assert fake.commands == [['get_property', 'path'], ['bad']]
+    client.close()
+
+
+def test_play(fake: FakeMpv, tmp_path: Path) -> None:
+    client = mpv.MpvClient(tmp_path / 'mpv.sock')
+    client.play(['/a.mkv', '/b.mkv'])
+    client.play(['/c.mkv'], append=True)
+    assert fake.commands == [['loadfile', '/a.mkv', 'replace'],
+                             ['loadfile', '/b.mkv', 'append'],
+                             ['loadfile', '/c.mkv', 'append-play']]
+    client.close()
+
+
+def test_play_playlist_file(fake: FakeMpv, tmp_path: Path) -> None:
+    client = mpv.MpvClient(tmp_path / 'mpv.sock')
+    client.play_playlist_file(tmp_path / 'a.m3u8')
+    client.play_playlist_file(tmp_path / 'b.m3u8', append=True)
+    assert fake.commands == [['loadlist', str(tmp_path / 'a.m3u8'), 'replace'],
+                             ['loadlist', str(tmp_path / 'b.m3u8'), 'append-play']]
+    client.close()
+
+
+def test_events(fake: FakeMpv, tmp_path: Path) -> None:
+    events: list[dict[str, Any]] = []
+    client = mpv.MpvClient(tmp_path / 'mpv.sock', events.append)
+    client.command('client_name')
+    fake.send({'event': 'pause'})
+    wait_for(lambda: events == [{'event': 'pause'}])
+    client.close()
+
+
+def test_no_reply(fake: FakeMpv, tmp_path: Path) -> None:
+    fake.replies['slow'] = None
+    client = mpv.MpvClient(tmp_path / 'mpv.sock', timeout=0.1)
+    with pytest.raises(mpv.MpvError, match='did not reply'):
+        client.command('slow')
+    client.close()
+
+
+def test_closed(fake: FakeMpv, tmp_path: Path) -> None:
+    fake.replies['quit'] = None
+    client = mpv.MpvClient(tmp_path / 'mpv.sock')
+    client.command('client_name')
+    threading.Timer(0.1, fake.close).start()
+    with pytest.raises(mpv.MpvError, match='closed'):
+        client.command('quit')
+    assert client.closed
+    with pytest.raises(mpv.MpvError, match='closed'):
+        client.command('client_name')
+
+
+def test_player_reuses_running_mpv_and_reports_finished(fake: FakeMpv, tmp_path: Path) -> None:
+    finished: list[str] = []
+    player = mpv.MpvPlayer('mpv', finished.append, tmp_path / 'mpv.sock')
+    player.play(['/a.mkv', '/b.mkv'])
+    player.play(['/c.mkv'], append=True)
+    assert fake.commands == [['observe_property', 1, 'playlist'],
+                             ['loadfile', '/a.mkv', 'replace'],
+                             ['loadfile', '/b.mkv', 'append'],
+                             ['loadfile', '/c.mkv', 'append-play']]
+
+    def playlist(*filenames: str) -> dict[str, Any]:
+        return {'event': 'property-change', 'id': 1, 'name': 'playlist',
+                'data': [{'filename': filename, 'id': i + 1}
+                         for i, filename in enumerate(filenames)]}
+
+    def end_file(entry_id: int, reason: str) -> dict[str, Any]:
+        return {'event': 'end-file', 'reason': reason, 'playlist_entry_id': entry_id}
+    events = [playlist('/a.mkv', '/b.mkv'), playlist('/a.mkv', '/b.mkv', '/c.mkv'),
+              end_file(1, 'eof'), end_file(2, 'stop'), end_file(3, 'eof')]
+    for event in events:
+        fake.send(event)
+    wait_for(lambda: len(finished) == 2)
+    assert finished == ['/a.mkv', '/c.mkv']
+    player.close()
+
+
+@pytest.mark.skipif(os.name != 'posix', reason='mpv IPC is only used with Unix sockets')
+def test_player_starts_mpv(tmp_path: Path) -> None:
+    # answers one connection like mpv, writing down how it was started and what it was sent
+    command = tmp_path / 'mpv'
+    command.write_text(f'''#!{sys.executable}
+import json, socket, sys
+with open({str(tmp_path / 'log')!r}, 'w') as log:
+    log.write(json.dumps(sys.argv[1:]) + '\\n')
+    log.flush()
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(sys.argv[2].split('=', 1)[1])
+    server.listen()
+    connection, _ = server.accept()
+    for line in connection.makefile('rb'):
+        log.write(line.decode())
+        log.flush()
+        request_id = json.loads(line)['request_id']
+        connection.sendall((json.dumps({{'request_id': request_id, 'error': 'success'}})
+                            + '\\n').encode())
+''')
+    command.chmod(0o755)
+    player = mpv.MpvPlayer(str(command), socket_file=tmp_path / 'player.sock')
+    player.play(['/a.mkv'])
+    player.close()
+    wait_for(lambda: len((tmp_path / 'log').read_text().splitlines()) == 3)
+    lines = [json.loads(line) for line in (tmp_path / 'log').read_text().splitlines()]
+    assert lines[0] == ['--idle=once', f'--input-ipc-server={tmp_path / "player.sock"}']
+    assert [line['command'] for line in lines[1:]] == [['observe_property', 1, 'playlist'],
+                                                       ['loadfile', '/a.mkv', 'replace']]
+
+
+def test_player_start_fails(tmp_path: Path) -> None:
+    player = mpv.MpvPlayer('false', socket_file=tmp_path / 'player.sock')
+    with pytest.raises(mpv.MpvError, match='exited'):
+        player.play(['/a.mkv'])
+
+
+@pytest.mark.parametrize('command,expected', [
+    ('mpv', os.name == 'posix'),
+    ('/usr/local/bin/mpv', os.name == 'posix'),
+    ('vlc', False),
+    ('mpv-launcher', False),
+])
+def test_is_mpv(command: str, expected: bool) -> None:
+    assert mpv.is_mpv(command) == expected
@@ -0,0 +1,57 @@
+#    Interleave Playlist
+#    Copyright (C) 2026 Thomas Sweeney
+#    This file is part of Interleave Playlist.
+#    Interleave Playlist is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#    Interleave Playlist is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+import os
+import time
+from pathlib import Path
+
+import pytest
+from pytest_mock import MockerFixture
+
+from interleave_playlist.core import PlaylistEntry
+from interleave_playlist.core.export import to_m3u
+from interleave_playlist.model import Group, Location
+from interleave_playlist.player import playlist_file
+
+GROUP = Group('show', '/a')
+
+
+@pytest.fixture(autouse=True)
+def before_each(mocker: MockerFixture, tmp_path: Path) -> None:
+    mocker.patch('interleave_playlist.player.playlist_file.PLAYLIST_DIR', tmp_path / 'playlists')
+
+
+def test_write_playlist_file(tmp_path: Path) -> None:
+    playlist = [PlaylistEntry(f'/a/ep {i} é.mkv', Location('/a', GROUP), GROUP)
+                for i in range(1000)]
+    first = playlist_file.write_playlist_file(playlist)
+    second = playlist_file.write_playlist_file(playlist[:1])
+    assert first != second
+    assert first.parent == tmp_path / 'playlists' and first.suffix == '.m3u8'
+    assert first.read_text(encoding='utf-8') == to_m3u(playlist)
+    assert second.read_text(encoding='utf-8') == to_m3u(playlist[:1])
+
+
+def test_old_playlist_files_removed(tmp_path: Path) -> None:
+    (tmp_path / 'playlists').mkdir()
+    old = tmp_path / 'playlists' / 'play-old.m3u8'
+    recent = tmp_path / 'playlists' / 'play-recent.m3u8'
+    other = tmp_path / 'playlists' / 'other.txt'
+    for file in [old, recent, other]:
+        file.touch()
+    two_days_ago = time.time() - 2 * 24 * 60 * 60
+    for file in [old, other]:
+        os.utime(file, (two_days_ago, two_days_ago))
+    playlist_file.write_playlist_file([])
+    assert not old.exists()
+    assert recent.exists() and other.exists()
@@ -0,0 +1,142 @@
+#    Interleave Playlist
+#    Copyright (C) 2026 Thomas Sweeney
+#    This file is part of Interleave Playlist.
+#    Interleave Playlist is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#    Interleave Playlist is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+import json
+import subprocess
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+from pytest_mock import MockerFixture
+
+from interleave_playlist import cli, daemon
+from interleave_playlist.persistence import settings
+
+
+@pytest.fixture(autouse=True)
+def before_each(mocker: MockerFixture, tmp_path: Path) -> None:
+    for show in ['b', 'a']:
+        (tmp_path / show).mkdir()
+        for episode in [1, 2, 10]:
+            (tmp_path / show / f'{show} {episode}.mkv').touch()
+    (tmp_path / 'input.yml').write_text(
+        'locations:\n' + ''.join(f'  - name: "{tmp_path / show}"\n' for show in ['b', 'a']))
+    mocker.patch('interleave_playlist.persistence.state.create_state_file')
+    mocker.patch('interleave_playlist.persistence.settings.create_settings_file')
+    mocker.patch('interleave_playlist.persistence.state.get_last_input_file',
+                 return_value=tmp_path / 'input.yml')
+    mocker.patch('interleave_playlist.persistence.settings.get_settings',
+                 return_value=settings.Settings(12, 'mpv', False, 100, True,
+                                                'INTERLEAVE', False, 8, 4))
+    mocker.patch('interleave_playlist.daemon.SOCKET_FILE', tmp_path / 'none.sock')
+
+
+def run(capsys: pytest.CaptureFixture[str], *args: str) -> tuple[int, list[str]]:
+    code = cli.main(list(args))
+    return code, capsys.readouterr().out.splitlines()
+
+
+def names(lines: list[str]) -> list[str]:
+    return [Path(line).name for line in lines]
+
+
+def test_default(capsys: pytest.CaptureFixture[str]) -> None:
+    code, lines = run(capsys)
+    assert code == 0
+    assert names(lines) == ['a 1.mkv', 'b 1.mkv', 'a 2.mkv', 'b 2.mkv', 'a 10.mkv', 'b 10.mkv']
+
+
+def test_filter_sort_reverse_and_limit(capsys: pytest.CaptureFixture[str]) -> None:
+    _, lines = run(capsys, '--filter', 'a', '--sort', 'alphabetical', '--reverse', '--limit', '2')
+    assert names(lines) == ['a 10.mkv', 'a 2.mkv']
+
+
+def test_input_and_watched(capsys: pytest.CaptureFixture[str], mocker: MockerFixture,
+                           tmp_path: Path) -> None:
+    mocker.patch('interleave_playlist.persistence.state.get_last_input_file', return_value=None)
+    (tmp_path / 'input.yml.watched.txt').write_text(f'"a 1.mkv","{tmp_path / "a"}"\n')
+    _, lines = run(capsys, '--input', str(tmp_path / 'input.yml'), '--limit', '1')
+    assert names(lines) == ['b 1.mkv']
+
+
+def test_json(capsys: pytest.CaptureFixture[str], tmp_path: Path) -> None:
+    _, lines = run(capsys, '--format', 'json', '--limit', '1')
+    assert json.loads('\n'.join(lines)) == [{
+        'filename': str(tmp_path / 'a' / 'a 1.mkv'),
+        'location': str(tmp_path / 'a'),
+        'group': str(tmp_path / 'a'),
+    }]
+
+
+def test_m3u_to_file(capsys: pytest.CaptureFixture[str], tmp_path: Path) -> None:
+    code, lines = run(capsys, '--format', 'm3u', '--limit', '1', '--output',
+                      str(tmp_path / 'out.m3u'))
+    assert (code, lines) == (0, [])
+    assert (tmp_path / 'out.m3u').read_text().splitlines() \
+        == ['#EXTM3U', '#EXTINF:-1,a 1.mkv', str(tmp_path / 'a' / 'a 1.mkv')]
+
+
+def test_missing_input(capsys: pytest.CaptureFixture[str], tmp_path: Path) -> None:
+    assert cli.main(['--input', str(tmp_path / 'missing.yml')]) == 1
+    assert 'missing.yml' in capsys.readouterr().err
+
+
+def test_invalid_sort(capsys: pytest.CaptureFixture[str]) -> None:
+    with pytest.raises(SystemExit):
+        cli.main(['--sort', 'random'])
+    assert 'last-modified' in capsys.readouterr().err
+
+
+def test_uses_daemon_when_running(capsys: pytest.CaptureFixture[str], mocker: MockerFixture,
+                                  tmp_path: Path) -> None:
+    server = daemon.PlaylistServer(tmp_path / 'd.sock')
+    thread = threading.Thread(target=server.serve_forever, kwargs={'poll_interval': 0.05})
+    thread.start()
+    try:
+        build_playlist = mocker.spy(cli, 'build_playlist')
+        _, lines = run(capsys, '--socket', str(tmp_path / 'd.sock'), '--limit', '3')
+        assert names(lines) == ['a 1.mkv', 'b 1.mkv', 'a 2.mkv']
+        build_playlist.assert_not_called()
+        _, lines = run(capsys, '--socket', str(tmp_path / 'd.sock'), '--no-daemon', '--limit', '1')
+        assert names(lines) == ['a 1.mkv']
+        build_playlist.assert_called_once()
+        assert cli.main(['--socket', str(tmp_path / 'd.sock'),
+                         '--input', str(tmp_path / 'missing.yml')]) == 1
+        assert 'missing.yml' in capsys.readouterr().err
+    finally:
+        server.shutdown()
+        thread.join()
+        server.server_close()
+
+
+def test_serve_already_running(capsys: pytest.CaptureFixture[str], tmp_path: Path) -> None:
+    with daemon.PlaylistServer(tmp_path / 'd.sock'):
+        assert cli.main(['--socket', str(tmp_path / 'd.sock'), 'serve']) == 1
+    assert 'Already serving' in capsys.readouterr().err
+
+
+@pytest.mark.parametrize('value,address', [
+    ('8317', ('127.0.0.1', 8317)),
+    ('0.0.0.0:80', ('0.0.0.0', 80)),
+])
+def test_http_address(value: str, address: tuple[str, int]) -> None:
+    assert cli._get_parser().parse_args(['serve', '--http', value]).http == address
+
+
+def test_never_imports_qt() -> None:
+    result = subprocess.run(
+        [sys.executable, '-c', 'import sys; import interleave_playlist.cli; '
+                               'print([m for m in sys.modules if m.startswith("PySide6")])'],
+        capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == '[]'
@@ -0,0 +1,156 @@
+#    Interleave Playlist
+#    Copyright (C) 2026 Thomas Sweeney
+#    This file is part of Interleave Playlist.
+#    Interleave Playlist is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#    Interleave Playlist is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+import threading
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+from pytest_mock import MockerFixture
+
+from interleave_playlist import daemon
+from interleave_playlist.core import playlist
+from interleave_playlist.persistence import settings
+
+
+@pytest.fixture(autouse=True)
+def before_each(mocker: MockerFixture, tmp_path: Path) -> None:
+    for show in ['b', 'a']:
+        (tmp_path / show).mkdir()
+        for episode in [1, 2, 10]:
+            (tmp_path / show / f'{show} {episode}.mkv').touch()
+    (tmp_path / 'input.yml').write_text(
+        'locations:\n' + ''.join(f'  - name: "{tmp_path / show}"\n' for show in ['b', 'a']))
+    mocker.patch('interleave_playlist.persistence.state.get_last_input_file',
+                 return_value=tmp_path / 'input.yml')
+    mocker.patch('interleave_playlist.persistence.settings.get_settings',
+                 return_value=settings.Settings(12, 'mpv', False, 100, True,
+                                                'INTERLEAVE', False, 8, 4))
+    mocker.patch('interleave_playlist.persistence.settings.get_max_watched_remembered',
+                 return_value=100)
+
+
+@pytest.fixture
+def server(tmp_path: Path) -> Iterator[daemon.PlaylistServer]:
+    server = daemon.PlaylistServer(tmp_path / 'd.sock', poll_s=0.05)
+    thread = threading.Thread(target=server.serve_forever, kwargs={'poll_interval': 0.05})
+    thread.start()
+    yield server
+    server.shutdown()
+    thread.join()
+    server.server_close()
+
+
+@pytest.fixture
+def client(server: daemon.PlaylistServer) -> Iterator[daemon.Client]:
+    with daemon.Client(server.socket_file, timeout=10) as client:
+        yield client
+
+
+def names(entries: list[dict[str, str]]) -> list[str]:
+    return [Path(entry['filename']).name for entry in entries]
+
+
+def test_get_playlist(client: daemon.Client, tmp_path: Path) -> None:
+    entries = client.call('get_playlist')
+    assert names(entries) == ['a 1.mkv', 'b 1.mkv', 'a 2.mkv', 'b 2.mkv', 'a 10.mkv', 'b 10.mkv']
+    assert entries[0] == {'filename': str(tmp_path / 'a' / 'a 1.mkv'),
+                          'location': str(tmp_path / 'a'),
+                          'group': str(tmp_path / 'a')}
+    assert names(client.call('get_playlist', input=str(tmp_path / 'input.yml'),
+                             sort='alphabetical', reverse=True, limit=2)) \
+        == ['b 10.mkv', 'b 2.mkv']
+
+
+def test_next_up_and_search(client: daemon.Client) -> None:
+    assert names(client.call('next_up', n=3)) == ['a 1.mkv', 'b 1.mkv', 'a 2.mkv']
+    assert names(client.call('search', query='b', limit=2)) == ['b 1.mkv', 'b 2.mkv']
+
+
+def test_directories_only_listed_again_once_changed(client: daemon.Client,
+                                                    mocker: MockerFixture,
+                                                    tmp_path: Path) -> None:
+    client.call('get_playlist')
+    scan = mocker.spy(playlist, '_scan_directory')
+    client.call('get_playlist')
+    scan.assert_not_called()
+    (tmp_path / 'a' / 'a 3.mkv').touch()
+    assert 'a 3.mkv' in names(client.call('get_playlist'))
+    assert scan.call_count == 2
+
+
+def test_mark_watched_notifies_subscribers(server: daemon.PlaylistServer,
+                                           client: daemon.Client,
+                                           tmp_path: Path) -> None:
+    filename = str(tmp_path / 'a' / 'a 1.mkv')
+    with daemon.Client(server.socket_file, timeout=10) as subscriber:
+        assert subscriber.call('subscribe') is True
+        assert client.call('mark_watched', filenames=[filename]) is None
+        assert subscriber.get_notification() == {
+            'jsonrpc': '2.0', 'method': 'watched_changed',
+            'params': {'input': str(tmp_path / 'input.yml'),
+                       'filenames': [filename], 'watched': True}}
+    assert (tmp_path / 'input.yml.watched.txt').read_text() == f'"a 1.mkv","{tmp_path / "a"}"\n'
+    assert names(client.call('next_up', n=1)) == ['b 1.mkv']
+    client.call('mark_watched', filenames=[filename], watched=False)
+    assert names(client.call('next_up', n=1)) == ['a 1.mkv']
+
+
+def test_changes_on_disk_notify_subscribers(client: daemon.Client, tmp_path: Path) -> None:
+    client.call('get_playlist')
+    client.call('subscribe')
+    (tmp_path / 'b' / 'b 3.mkv').touch()
+    assert client.get_notification() == {
+        'jsonrpc': '2.0', 'method': 'playlist_changed',
+        'params': {'input': str(tmp_path / 'input.yml')}}
+
+
+@pytest.mark.parametrize('method,params,code', [
+    ('missing', {}, daemon.METHOD_NOT_FOUND),
+    ('next_up', {'n': 'one'}, daemon.INVALID_PARAMS),
+    ('next_up', {'n': True}, daemon.INVALID_PARAMS),
+    ('get_playlist', {'sort': 'random'}, daemon.INVALID_PARAMS),
+    ('get_playlist', {'unknown': 1}, daemon.INVALID_PARAMS),
+    ('search', {}, daemon.INVALID_PARAMS),
+    ('mark_watched', {'filenames': ['/not/in/playlist.mkv']}, daemon.INVALID_PARAMS),
+    ('get_playlist', {'input': '/missing.yml'}, daemon.SERVER_ERROR),
+])
+def test_errors(client: daemon.Client, method: str, params: dict[str, object],
+                code: int) -> None:
+    with pytest.raises(daemon.RpcError) as e:
+        client.call(method, **params)
+    assert e.value.code == code
+    # the connection is still usable afterwards
+    assert len(client.call('next_up', n=1)) == 1
+
+
+def test_parse_error(server: daemon.PlaylistServer) -> None:
+    assert server.handle_line(b'{', None) == {  # type: ignore[arg-type]
+        'jsonrpc': '2.0', 'id': None, 'error': {'code': daemon.PARSE_ERROR,
+                                                'message': 'Parse error'}}
+    assert server.handle_line(b'{"jsonrpc": "2.0", "method": "missing"}',
+                              None) is None  # type: ignore[arg-type]
+
+
+def test_socket_already_in_use(server: daemon.PlaylistServer) -> None:
+    with pytest.raises(daemon.DaemonRunning):
+        daemon.PlaylistServer(server.socket_file)
+
+
+def test_stale_socket_replaced(tmp_path: Path) -> None:
+    stale = daemon.PlaylistServer(tmp_path / 'd.sock')
+    stale.socket.close()
+    assert not daemon.is_running(tmp_path / 'd.sock')
+    with daemon.PlaylistServer(tmp_path / 'd.sock'):
+        assert daemon.is_running(tmp_path / 'd.sock')
+    assert not (tmp_path / 'd.sock').exists()
@@ -0,0 +1,167 @@
+#    Interleave Playlist
+#    Copyright (C) 2026 Thomas Sweeney
+#    This file is part of Interleave Playlist.
+#    Interleave Playlist is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#    Interleave Playlist is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+import http.client
+import json
+import os
+import threading
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Optional
+
+import pytest
+from pytest_mock import MockerFixture
+
+from interleave_playlist import http_api
+from interleave_playlist.persistence import settings
+from interleave_playlist.service import PlaylistService
+
+
+@pytest.fixture(autouse=True)
+def before_each(mocker: MockerFixture, tmp_path: Path) -> None:
+    for show in ['b', 'a']:
+        (tmp_path / show).mkdir()
+        for episode in [1, 2, 10]:
+            (tmp_path / show / f'{show} {episode}.mkv').touch()
+    (tmp_path / 'input.yml').write_text(
+        'locations:\n' + ''.join(f'  - name: "{tmp_path / show}"\n' for show in ['b', 'a']))
+    mocker.patch('interleave_playlist.persistence.state.get_last_input_file',
+                 return_value=tmp_path / 'input.yml')
+    mocker.patch('interleave_playlist.persistence.settings.get_settings',
+                 return_value=settings.Settings(12, 'mpv', False, 100, True,
+                                                'INTERLEAVE', False, 8, 4))
+    mocker.patch('interleave_playlist.persistence.settings.get_max_watched_remembered',
+                 return_value=100)
+
+
+@pytest.fixture
+def server() -> Iterator[http_api.PlaylistHttpServer]:
+    server = http_api.PlaylistHttpServer(('127.0.0.1', 0))
+    thread = threading.Thread(target=server.serve_forever, kwargs={'poll_interval': 0.05})
+    thread.start()
+    yield server
+    server.shutdown()
+    thread.join()
+    server.server_close()
+
+
+def get(server: http_api.PlaylistHttpServer, url: str,
+        etag: Optional[str] = None) -> tuple[int, dict[str, str], str]:
+    connection = http.client.HTTPConnection('127.0.0.1', server.server_address[1], timeout=10)
+    try:
+        connection.request('GET', url, headers={'If-None-Match': etag} if etag else {})
+        response = connection.getresponse()
+        return response.status, dict(response.getheaders()), response.read().decode('utf-8')
+    finally:
+        connection.close()
+
+
+def names(body: str) -> list[str]:
+    return [Path(entry['filename']).name for entry in json.loads(body)]
+
+
+def test_playlist(server: http_api.PlaylistHttpServer, tmp_path: Path) -> None:
+    status, headers, body = get(server, '/playlist')
+    assert (status, headers['Content-Type']) == (200, 'application/json')
+    assert names(body) == ['a 1.mkv', 'b 1.mkv', 'a 2.mkv', 'b 2.mkv', 'a 10.mkv', 'b 10.mkv']
+    _, _, body = get(server, f'/playlist?input={tmp_path / "input.yml"}'
+                             '&sort=alphabetical&reverse=true&limit=2&filter=b')
+    assert names(body) == ['b 10.mkv', 'b 2.mkv']
+
+
+def test_playlist_m3u(server: http_api.PlaylistHttpServer, tmp_path: Path) -> None:
+    status, headers, body = get(server, '/playlist.m3u?limit=1')
+    assert (status, headers['Content-Type']) == (200, 'audio/x-mpegurl; charset=utf-8')
+    assert body.splitlines() == ['#EXTM3U', '#EXTINF:-1,a 1.mkv', str(tmp_path / 'a' / 'a 1.mkv')]
+
+
+def test_not_modified_without_rebuilding(server: http_api.PlaylistHttpServer,
+                                         mocker: MockerFixture) -> None:
+    _, headers, _ = get(server, '/playlist')
+    etag = headers['ETag']
+    get_playlist = mocker.spy(PlaylistService, 'get_playlist')
+    status, headers, body = get(server, '/playlist', etag)
+    assert (status, headers['ETag'], body) == (304, etag, '')
+    assert get(server, '/playlist', f'"other", W/{etag}')[0] == 304
+    assert get(server, '/playlist', '*')[0] == 304
+    get_playlist.assert_not_called()
+    # other queries are other resources
+    assert get(server, '/playlist?limit=1', etag)[0] == 200
+
+
+def test_etag_changes_with_files_and_watched(server: http_api.PlaylistHttpServer,
+                                             tmp_path: Path) -> None:
+    _, headers, _ = get(server, '/playlist')
+    (tmp_path / 'a' / 'a 3.mkv').touch()
+    status, new_headers, body = get(server, '/playlist', headers['ETag'])
+    assert status == 200 and 'a 3.mkv' in names(body)
+    (tmp_path / 'input.yml.watched.txt').write_text(f'"a 1.mkv","{tmp_path / "a"}"\n')
+    status, _, body = get(server, '/playlist', new_headers['ETag'])
+    assert status == 200 and 'a 1.mkv' not in names(body)
+
+
+def test_etag_changes_with_file_mtimes_when_sorted_by_them(
+        server: http_api.PlaylistHttpServer, tmp_path: Path) -> None:
+    directory = tmp_path / 'a'
+    directory_stat = directory.stat()
+    for i, name in enumerate(['a 1.mkv', 'a 2.mkv']):
+        os.utime(directory / name, ns=(i * 1_000_000_000, i * 1_000_000_000))
+    _, headers, body = get(server, '/playlist?sort=last-modified')
+    _, interleave_headers, _ = get(server, '/playlist')
+    assert names(body).index('a 1.mkv') < names(body).index('a 2.mkv')
+    # rewritten in place, so the directory is left as it was
+    os.utime(directory / 'a 1.mkv', ns=(5_000_000_000, 5_000_000_000))
+    os.utime(directory, ns=(directory_stat.st_atime_ns, directory_stat.st_mtime_ns))
+    status, _, body = get(server, '/playlist?sort=last-modified', headers['ETag'])
+    assert status == 200
+    assert names(body).index('a 2.mkv') < names(body).index('a 1.mkv')
+    assert get(server, '/playlist', interleave_headers['ETag'])[0] == 304
+
+
+def test_timed_groups_change_etag(server: http_api.PlaylistHttpServer,
+                                  mocker: MockerFixture) -> None:
+    _, headers, _ = get(server, '/playlist')
+    mocker.patch('interleave_playlist.service.get_locations_fingerprint',
+                 return_value=('moved on',))
+    assert get(server, '/playlist', headers['ETag'])[0] == 200
+
+
+def test_groups_and_watched(server: http_api.PlaylistHttpServer, tmp_path: Path) -> None:
+    (tmp_path / 'input.yml.watched.txt').write_text(
+        f'"a 1.mkv","{tmp_path / "a"}"\n"old.mkv","gone"\n')
+    _, _, body = get(server, '/groups')
+    assert json.loads(body) == [
+        {'group': str(tmp_path / 'b'), 'location': str(tmp_path / 'b'),
+         'remaining': 3, 'watched': 0, 'next': str(tmp_path / 'b' / 'b 1.mkv')},
+        {'group': str(tmp_path / 'a'), 'location': str(tmp_path / 'a'),
+         'remaining': 2, 'watched': 1, 'next': str(tmp_path / 'a' / 'a 2.mkv')},
+        {'group': 'gone', 'location': None, 'remaining': 0, 'watched': 1, 'next': None},
+    ]
+    _, _, body = get(server, '/watched')
+    assert json.loads(body) == [{'filename': 'a 1.mkv', 'group': str(tmp_path / 'a')},
+                                {'filename': 'old.mkv', 'group': 'gone'}]
+
+
+@pytest.mark.parametrize('url,status', [
+    ('/missing', 404),
+    ('/playlist?limit=x', 400),
+    ('/playlist?reverse=maybe', 400),
+    ('/playlist?sort=random', 400),
+    ('/groups?filter=a', 400),
+    ('/playlist?input=/missing.yml', 500),
+])
+def test_errors(server: http_api.PlaylistHttpServer, url: str, status: int) -> None:
+    actual, headers, body = get(server, url)
+    assert (actual, headers['Content-Type']) == (status, 'application/json')
+    assert 'ETag' not in headers
+    assert json.loads(body)['error']